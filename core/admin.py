@@ -1,5 +1,8 @@
+import os
 from django.contrib import admin
+from django.core.files.base import ContentFile
 from .models import WorshipInfo, SongInfo, PptRequest, PptTemplate
+from .forms import PptTemplateForm
 
 # 각 모델을 Django 관리자 페이지에 등록합니다.
 # 이렇게 등록하면 웹 인터페이스를 통해 데이터 생성, 조회, 수정, 삭제가 가능해집니다.
@@ -25,10 +28,31 @@ class PptRequestAdmin(admin.ModelAdmin):
     search_fields = ('worship_info__sermon_title', 'progress_message')
     raw_id_fields = ('worship_info', 'requested_by')
     date_hierarchy = 'created_at'
+    readonly_fields = ('change_report',)
 
 @admin.register(PptTemplate)
 class PptTemplateAdmin(admin.ModelAdmin):
+    form = PptTemplateForm # 업로드 시 템플릿 구조 검증 및 매니페스트 추출
     list_display = ('name', 'is_active', 'template_file', 'created_by', 'created_at')
     list_filter = ('is_active',)
     search_fields = ('name', 'description')
-    raw_id_fields = ('created_by',)
\ No newline at end of file
+    raw_id_fields = ('created_by',)
+    readonly_fields = ('manifest', 'optimized_file', 'optimization_report')
+
+    def save_model(self, request, obj, form, change):
+        if getattr(form, 'template_manifest', None):
+            obj.manifest = form.template_manifest
+        if getattr(form, 'optimized_template', None):
+            optimized_bytes, report = form.optimized_template
+            if obj.optimized_file:
+                obj.optimized_file.delete(save=False) # 이전 템플릿의 경량화 사본
+            obj.optimized_file.save(os.path.basename(obj.template_file.name), ContentFile(optimized_bytes), save=False)
+            obj.optimization_report = report
+        elif getattr(form, 'optimization_error', None):
+            # 경량화에 실패하면 이전 템플릿의 사본을 지워 새로 올린 원본으로 생성되게 합니다.
+            if obj.optimized_file:
+                obj.optimized_file.delete(save=False)
+            obj.optimization_report = {"error": form.optimization_error}
+        # 파싱된 템플릿 캐시는 Celery 워커마다 있으므로 여기(웹 프로세스)서 비우지 않습니다.
+        # 저장하면 updated_at이 바뀌어 워커가 새 키로 다시 로드합니다. (utils/update_pptx.py 참고)
+        super().save_model(request, obj, form, change)
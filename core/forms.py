@@ -1,9 +1,12 @@
 # core/forms.py
 
 import json
-import re
 from django import forms
-from .models import WorshipInfo, SongInfo
+from django.conf import settings
+from .models import WorshipInfo, SongInfo, PptTemplate
+from utils.template_manifest import extract_template_manifest, TemplateManifestError
+from utils.template_slimming import slim_template
+from utils.scripture_reference import parse_scripture_reference, ScriptureReferenceError
 from django.forms import inlineformset_factory # SongInfo를 WorshipInfo와 함께 관리하기 위함
 from django.forms import inlineformset_factory, BaseInlineFormSet # BaseInlineFormSet 임포트
 
@@ -46,7 +49,7 @@ class WorshipInfoForm(forms.ModelForm):
             'worship_type': forms.Select(attrs={'class': 'form-select'}),
             'speaker': forms.TextInput(attrs={'class': 'form-input', 'value': '노진수 목사'}),
             'sermon_title': forms.TextInput(attrs={'class': 'form-input', 'placeholder': '예: 여호와가 누구이기에'}),
-            'sermon_scripture': forms.TextInput(attrs={'class': 'form-input', 'placeholder': '예: 출애굽기 3:4 - 3:12'}),
+            'sermon_scripture': forms.TextInput(attrs={'class': 'form-input', 'placeholder': '예: 출애굽기 3:4 - 3:12; 시 23'}),
             'prayer_minister': forms.TextInput(attrs={'class': 'form-input', 'placeholder': '예: 임현서 청년'}),
             'offering_minister': forms.TextInput(attrs={'class': 'form-input', 'value': '이현 청년'}),
             'ads_manager': forms.TextInput(attrs={'class': 'form-input', 'value': '노진수 목사'}),
@@ -102,50 +105,13 @@ class WorshipInfoForm(forms.ModelForm):
         if not scripture:
             return scripture # 비어있는 필드는 필수 검증 (blank=False)에 맡김
 
-        # "책이름 장:절 - 장:절" 또는 "책이름 장:절" 형식 검증
-        # 예: "요한복음 3:16-18", "창세기 1:1"
-        # 띄어쓰기 허용, 마지막 - 이후는 생략 가능 (단일 절 또는 장 전체)
-        # 챕터와 절이 반드시 숫자여야 함
-        
-        # 패턴: (책이름)\s*(\d+):(\d+)(?:\s*-\s*(?:(\S+?)\s*)?(\d+):(\d+))?
-        # Group 1: 시작 책 이름 (예: 요한복음)
-        # Group 2: 시작 장 (예: 3)
-        # Group 3: 시작 절 (예: 16)
-        # Group 4: 끝 책 이름 (선택적, 예: 요한복음)
-        # Group 5: 끝 장 (예: 18)
-        # Group 6: 끝 절 (예: 18)
-
-        # 더 간단한 패턴: 책이름 숫자:숫자 (- 숫자:숫자)
-        # `core/tasks.py`의 파싱 로직과 유사하게
-        pattern = re.compile(r'^\s*(.+?)\s*(\d+):(\d+)\s*(?:-\s*(?:(.+?)\s*)?(\d+):(\d+))?\s*$')
-        
-        match = pattern.match(scripture)
-        if not match:
-            raise forms.ValidationError("올바른 성경 본문 범위 형식이 아닙니다. '책이름 장:절 - 장:절' 또는 '책이름 장:절' 형식을 따르세요.")
-        
-        # 추가적인 논리적 유효성 검사 (시작 절/장 > 끝 절/장 등)
+        # "요 3:16; 롬 8:1-5, 28; 시 23"처럼 여러 범위, 장 전체, 장/책을 넘는 범위를 허용합니다.
+        # `core/tasks.py`의 load_bible_contents와 같은 파서(utils/scripture_reference.py)를 씁니다.
         try:
-            start_book = match.group(1).strip()
-            start_ch = int(match.group(2))
-            start_verse = int(match.group(3))
-            
-            end_book = match.group(4) # None일 수 있음
-            end_ch = int(match.group(5)) if match.group(5) else start_ch # 끝 장 없으면 시작 장과 동일
-            end_verse = int(match.group(6)) if match.group(6) else start_verse # 끝 절 없으면 시작 절과 동일
-            
-            # 끝 책 이름이 명시되었다면 시작 책 이름과 같아야 함 (다르면 오류)
-            if end_book and end_book.strip() != start_book:
-                raise forms.ValidationError("시작과 끝 성경책 이름이 다릅니다. 동일한 성경책 내에서만 범위를 지정할 수 있습니다.")
-
-            # 시작 절/장이 끝 절/장보다 큰 경우 오류
-            if start_ch > end_ch:
-                raise forms.ValidationError("시작 장이 끝 장보다 큽니다.")
-            if start_ch == end_ch and start_verse > end_verse:
-                raise forms.ValidationError("시작 절이 끝 절보다 큽니다.")
-
-        except (ValueError, TypeError): # int 변환 실패 등
-            raise forms.ValidationError("장과 절은 숫자로 입력해야 합니다.")
-        
+            parse_scripture_reference(scripture)
+        except ScriptureReferenceError as e:
+            raise forms.ValidationError(f"올바른 성경 본문 범위 형식이 아닙니다. {e}")
+
         return scripture # 유효하면 원본 스크립처 반환
 
 
@@ -212,4 +178,46 @@ SongInfoFormSet = inlineformset_factory(
     can_delete=True, # 기존 객체 삭제 허용
     can_order=True,
     formset=BaseSongInfoFormSet, # 커스텀 BaseFormSet 사용
-)
\ No newline at end of file
+)
+
+
+class PptTemplateForm(forms.ModelForm):
+    """
+    PPT 템플릿 업로드 폼 (관리자 페이지).
+    업로드된 파일에서 템플릿 매니페스트를 추출하며, 구조가 맞지 않는 템플릿은 여기서 거부합니다.
+    통과한 템플릿은 경량화한 사본(optimized_template)도 함께 만들어 둡니다. (utils/template_slimming.py)
+    """
+    class Meta:
+        model = PptTemplate
+        fields = ['name', 'template_file', 'is_active', 'description', 'created_by']
+
+    def clean_template_file(self):
+        template_file = self.cleaned_data.get('template_file')
+        self.template_manifest = None
+        self.optimized_template = None
+        self.optimization_error = None
+        if not template_file or 'template_file' not in self.changed_data:
+            return template_file
+
+        try:
+            self.template_manifest = extract_template_manifest(template_file)
+        except TemplateManifestError as e:
+            raise forms.ValidationError(e.errors)
+        except Exception as e:
+            raise forms.ValidationError(f"PPTX 파일을 읽을 수 없습니다: {e}")
+        finally:
+            template_file.seek(0) # 저장 시 처음부터 다시 읽을 수 있도록 위치 복원
+
+        # 경량화는 선택적인 최적화이므로 실패해도 템플릿은 받아들이고 원본(template_file)으로 생성합니다.
+        try:
+            self.optimized_template = slim_template(
+                template_file,
+                downscale_images=settings.PPT_TEMPLATE_DOWNSCALE_IMAGES,
+                max_image_width_px=settings.PPT_TEMPLATE_MAX_IMAGE_WIDTH_PX,
+            )
+        except Exception as e:
+            print(f"Template slimming failed, using the original file: {e}")
+            self.optimization_error = str(e)
+        finally:
+            template_file.seek(0)
+        return template_file
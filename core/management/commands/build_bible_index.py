@@ -0,0 +1,24 @@
+# core/management/commands/build_bible_index.py
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from utils.bible_index import build_bible_index
+from utils.bible_text_parser import BIBLE_FILE_MAP, BIBLE_TEXT_DIR, BIBLE_INDEX_PATH
+
+
+class Command(BaseCommand):
+    help = "core/data/bible_text의 성경 텍스트로 구절 색인 파일(mmap용)을 만듭니다. 성경 파일을 바꾼 뒤 다시 실행하세요."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--output', default=BIBLE_INDEX_PATH, help=f"색인 파일 경로 (기본값: {BIBLE_INDEX_PATH})")
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        result = build_bible_index(BIBLE_TEXT_DIR, BIBLE_FILE_MAP, options['output'])
+        self.stdout.write(self.style.SUCCESS(
+            f"성경 색인을 만들었습니다: {options['output']} "
+            f"({result['books']}권, {result['chapters']}장, {result['verses']}절, {result['bytes']:,} bytes, "
+            f"{time.perf_counter() - started:.2f}초)"
+        ))
@@ -0,0 +1,20 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0007_songinfo_unique_normal_song_order_per_worship_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ppttemplate",
+            name="manifest",
+            field=models.JSONField(
+                blank=True, default=dict, editable=False, verbose_name="템플릿 구조 정보"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 10:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0008_ppttemplate_manifest"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pptrequest",
+            name="input_fingerprint",
+            field=models.CharField(blank=True, max_length=64, verbose_name="입력 지문"),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0009_pptrequest_input_fingerprint"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ppttemplate",
+            name="optimization_report",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="경량화 결과"),
+        ),
+        migrations.AddField(
+            model_name="ppttemplate",
+            name="optimized_file",
+            field=models.FileField(blank=True, editable=False, upload_to="ppt_templates/optimized/", verbose_name="경량화된 템플릿 파일"),
+        ),
+    ]
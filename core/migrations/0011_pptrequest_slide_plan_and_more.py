@@ -0,0 +1,23 @@
+# Generated by Django 5.2.3 on 2026-10-18 11:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0010_ppttemplate_optimized_file_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pptrequest",
+            name="change_report",
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name="변경된 슬라이드"),
+        ),
+        migrations.AddField(
+            model_name="pptrequest",
+            name="slide_plan",
+            field=models.JSONField(blank=True, default=dict, editable=False, verbose_name="슬라이드 플랜"),
+        ),
+    ]
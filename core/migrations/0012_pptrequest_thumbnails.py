@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:00
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0011_pptrequest_slide_plan_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pptrequest",
+            name="thumbnails",
+            field=models.JSONField(blank=True, default=list, editable=False, verbose_name="슬라이드 미리보기"),
+        ),
+    ]
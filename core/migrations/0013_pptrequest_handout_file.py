@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0012_pptrequest_thumbnails"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pptrequest",
+            name="handout_file",
+            field=models.FileField(blank=True, null=True, upload_to="generated_handouts/", verbose_name="가사/성경 본문 PDF"),
+        ),
+    ]
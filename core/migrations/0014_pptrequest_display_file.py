@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0013_pptrequest_handout_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="pptrequest",
+            name="display_file",
+            field=models.FileField(blank=True, null=True, upload_to="generated_displays/", verbose_name="디스플레이용 HTML"),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0014_pptrequest_display_file"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="songinfo",
+            name="lyrics_pages_source",
+            field=models.CharField(blank=True, editable=False, max_length=64, verbose_name="분할한 가사 지문"),
+        ),
+    ]
@@ -85,6 +85,8 @@ class SongInfo(TimestampedModel):
     
     lyrics = models.TextField(blank=True, verbose_name="전체 찬양 가사")
     lyrics_pages = models.JSONField(default=list, blank=True, verbose_name="페이지별 가사")
+    # lyrics_pages를 만든 가사의 SHA-256. 가사가 바뀌지 않았으면 LLM으로 다시 분할하지 않습니다.
+    lyrics_pages_source = models.CharField(max_length=64, blank=True, editable=False, verbose_name="분할한 가사 지문")
 
     is_ending_song = models.BooleanField(default=False, verbose_name="결단 찬양 여부")
 
@@ -155,7 +157,29 @@ class PptRequest(TimestampedModel):
         null=True,
         verbose_name="생성된 PPT 파일"
     )
+    # 같은 슬라이드 플랜으로 만든 가사/성경 본문 PDF 유인물 (utils/handout_pdf.py)
+    handout_file = models.FileField(
+        upload_to='generated_handouts/',
+        blank=True,
+        null=True,
+        verbose_name="가사/성경 본문 PDF"
+    )
+    # 로비 화면/방송 자막용 텍스트 슬라이드 HTML (JSON 내장, utils/display_bundle.py)
+    display_file = models.FileField(
+        upload_to='generated_displays/',
+        blank=True,
+        null=True,
+        verbose_name="디스플레이용 HTML"
+    )
     celery_task_id = models.CharField(max_length=255, blank=True, null=True, verbose_name="Celery 작업 ID")
+    # 생성된 파일의 입력 지문 (utils/deck_fingerprint.py). 같은 입력으로 재요청하면 파일을 재사용합니다.
+    input_fingerprint = models.CharField(max_length=64, blank=True, verbose_name="입력 지문")
+    # 생성된 파일의 슬라이드 플랜과 템플릿 버전 {"template_version": {...}, "plan": [...]}. 수정 재요청 시 바뀐 슬라이드만 다시 만듭니다.
+    slide_plan = models.JSONField(default=dict, blank=True, editable=False, verbose_name="슬라이드 플랜")
+    # 마지막 생성에서 바뀐 슬라이드 목록 (utils.slide_plan.build_change_report)
+    change_report = models.JSONField(default=list, blank=True, editable=False, verbose_name="변경된 슬라이드")
+    # 슬라이드 순서대로의 미리보기 PNG 저장 경로 (utils/slide_thumbnail.py, 생성 완료 후 백그라운드에서 채워짐)
+    thumbnails = models.JSONField(default=list, blank=True, editable=False, verbose_name="슬라이드 미리보기")
     progress_message = models.CharField(max_length=255, blank=True, verbose_name="진행 상황 메시지")
 
     requested_by = models.ForeignKey(
@@ -189,6 +213,16 @@ class PptTemplate(TimestampedModel):
     )
     is_active = models.BooleanField(default=True, verbose_name="활성화 여부")
     description = models.TextField(blank=True, verbose_name="템플릿 설명")
+    # 업로드 시 추출한 역할별 슬라이드/Placeholder 위치 (utils/template_manifest.py)
+    manifest = models.JSONField(default=dict, blank=True, editable=False, verbose_name="템플릿 구조 정보")
+    # 업로드 시 만든 경량화 사본 (중복 미디어/미사용 레이아웃 제거, utils/template_slimming.py). PPT 생성에는 이 파일을 사용합니다.
+    optimized_file = models.FileField(
+        upload_to='ppt_templates/optimized/',
+        blank=True,
+        editable=False,
+        verbose_name="경량화된 템플릿 파일"
+    )
+    optimization_report = models.JSONField(default=dict, blank=True, editable=False, verbose_name="경량화 결과")
 
     created_by = models.ForeignKey(
         User,
@@ -5,24 +5,124 @@ from celery.app.task import Task as TaskType # celery.app.task.Task 타입 힌
 
 from django.conf import settings
 from django.core.files import File
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
 from django.utils import timezone
 from datetime import date
 import os
 import json
-import re
+import hashlib
+import tempfile
+import requests
 
 # LLM 함수 임포트
 from utils.llm import split_lyrics_to_json # 가사 분할은 여전히 LLM 사용
 # 성경 구절 가져오는 함수는 bible_text_parser.py에서 가져옴
-from utils.bible_text_parser import get_bible_contents as get_local_bible_contents
+from utils.bible_text_parser import get_bible_ranges
+from utils.scripture_reference import parse_scripture_reference, ScriptureReferenceError
 
 from utils.crawl import crawl_lyrics
-from utils.update_pptx import load_template, edit_text_field, add_lyrics_slides, add_ads_slides, add_bible_slides, save_presentation
+from utils.update_pptx import render_slide_plan, SHAPE_INDEX_STATS, reset_shape_index_stats, RENDER_ENGINE_OOXML
+from utils.ooxml_renderer import SECTION_CACHE_STATS, reset_section_cache_stats, patch_deck_ooxml
+from utils.slide_plan import build_slide_plan, diff_slide_plans, build_change_report, SlidePlanError
+from utils.text_fit import configure_text_fit, load_glyph_width_cache, save_glyph_width_cache, TEXT_FIT_STATS, reset_text_fit_stats, MissingFontError
+from utils.template_manifest import extract_template_manifest, is_manifest_current, TemplateManifestError
 from utils.get_datetime import get_sunday_text
+from utils.deck_fingerprint import compute_deck_fingerprint, short_fingerprint, is_placeholder_lyrics, has_placeholder_lyrics
+from utils.slide_thumbnail import render_deck_thumbnails
+from utils.handout_pdf import render_handout_pdf, HANDOUT_CACHE_STATS, reset_handout_cache_stats
+from utils.display_bundle import build_display_bundle, render_display_html
 
 # 모델 임포트
 from core.models import PptTemplate, WorshipInfo, SongInfo, PptRequest
 
+# 텍스트 맞춤용 글꼴 위치와 이전 실행에서 잰 글자 너비를 워커 시작 시 한 번 불러옵니다.
+configure_text_fit(getattr(settings, 'PPT_FONT_DIRS', []))
+if getattr(settings, 'PPT_GLYPH_CACHE_PATH', None):
+    load_glyph_width_cache(settings.PPT_GLYPH_CACHE_PATH)
+
+# 지문에 포함되는 예배 정보 필드 (슬라이드 내용이나 파일 이름에 영향을 주는 필드)
+FINGERPRINT_WORSHIP_FIELDS = (
+    'worship_date', 'worship_type', 'speaker', 'sermon_title', 'sermon_scripture',
+    'prayer_minister', 'offering_minister', 'ads_manager', 'benediction_minister',
+)
+
+
+def load_bible_contents(scripture: str) -> list:
+    """
+    설교 본문 범위("요 3:16; 롬 8:1-5, 28; 시 23" 등, utils/scripture_reference.py)를 파싱해
+    모든 범위의 성경 구절을 입력 순서대로 한 번에 가져옵니다.
+    """
+    try:
+        verse_ranges = parse_scripture_reference(scripture)
+    except ScriptureReferenceError:
+        # 폼의 clean_sermon_scripture에서 이미 걸러지지만, 안전을 위해 남겨둠
+        return [{"title": "성경 본문", "contents": "성경 구절 형식이 올바르지 않아 내용을 가져올 수 없습니다."}]
+    return get_bible_ranges(verse_ranges)
+
+
+def get_template_version(template: PptTemplate) -> dict:
+    """템플릿 파일이 바뀌면 달라지는 템플릿 식별 정보 (업로드/수정 시 updated_at이 바뀜)"""
+    return {"id": template.id, "updated_at": template.updated_at.isoformat()}
+
+
+def get_fingerprint_songs(songs: list) -> list:
+    """SongInfo 목록(순서대로)을 입력 지문에 들어가는 찬양 dict 목록으로 바꿉니다."""
+    return [
+        {
+            "order": song.order,
+            "is_ending_song": song.is_ending_song,
+            "title": song.title,
+            "source_url": song.source_url,
+            "lyrics": song.lyrics,
+            "lyrics_pages": song.lyrics_pages,
+        }
+        for song in songs
+    ]
+
+
+def compute_request_fingerprint(template: PptTemplate, worship_info: WorshipInfo, songs: list, bible_contents: list) -> str:
+    """현재 템플릿/예배 정보/찬양(SongInfo 목록, 순서대로)/성경 본문에 대한 입력 지문을 계산합니다."""
+    return compute_deck_fingerprint(
+        template_version=get_template_version(template),
+        worship_fields={field: getattr(worship_info, field) for field in FINGERPRINT_WORSHIP_FIELDS},
+        songs=get_fingerprint_songs(songs),
+        announcements=worship_info.worship_announcements or [],
+        bible_contents=bible_contents,
+    )
+
+
+def lyrics_source_hash(lyrics: str) -> str:
+    return hashlib.sha256((lyrics or "").encode("utf-8")).hexdigest()
+
+
+def are_lyrics_pages_current(song: SongInfo) -> bool:
+    """lyrics_pages가 있고 지금의 가사로 분할한 것이면 True (가사가 바뀌었거나 기록이 없으면 다시 분할)"""
+    return bool(song.lyrics_pages) and song.lyrics_pages_source == lyrics_source_hash(song.lyrics)
+
+
+def publish_generated_ppt(ppt_request: PptRequest, ppt_buffer, file_name: str,
+                          field_name: str = 'generated_ppt_file', directory: str = 'generated_ppts',
+                          extra_update_fields: tuple = ()) -> str:
+    """
+    렌더링이 끝난 PPT 버퍼를 저장소(default_storage)에 저장하고, 저장이 성공한 뒤에만 PptRequest가
+    새 파일을 가리키도록 합니다. 저장 도중 실패하면 모델은 이전 파일을 그대로 가리키므로
+    다운로드 뷰가 반쯤 쓰인 파일을 내려주는 일이 없습니다. 이전 파일은 새 파일이 게시된 뒤 삭제합니다.
+    PDF 유인물 등 다른 생성 파일은 `field_name`/`directory`를 바꿔 같은 방식으로 게시합니다.
+    `extra_update_fields`는 파일과 함께 한 번에 저장할 필드입니다. (덱의 슬라이드 플랜/입력 지문 등)
+    """
+    ppt_buffer.seek(0)
+    saved_name = default_storage.save(os.path.join(directory, file_name), File(ppt_buffer, name=file_name))
+
+    field_file = getattr(ppt_request, field_name)
+    previous_name = field_file.name if field_file else None
+    field_file.name = saved_name
+    ppt_request.save(update_fields=[field_name, *extra_update_fields])
+
+    if previous_name and previous_name != saved_name and default_storage.exists(previous_name):
+        default_storage.delete(previous_name)
+    return saved_name
+
 
 @shared_task(bind=True)
 def generate_ppt_task(self: TaskType, worship_info_id: int):
@@ -30,73 +130,108 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
     예배 PPT를 생성하는 Celery 태스크.
     진행 상황을 PptRequest 모델에 업데이트합니다.
     """
-    
-    ppt_request = None
     try:
         ppt_request = PptRequest.objects.get(celery_task_id=self.request.id)
+    except PptRequest.DoesNotExist:
+        error_message = "오류: PPT 요청 객체를 찾을 수 없습니다. PPT 제작 실패."
+        print(error_message)
+        self.update_state(state='FAILURE', meta={'message': error_message})
+        return {'status': 'failed', 'error': error_message}
+    return run_ppt_generation(self, ppt_request, worship_info_id)
+
+
+def get_active_template():
+    return PptTemplate.objects.filter(is_active=True).order_by('-created_at').first()
 
+
+def run_ppt_generation(progress, ppt_request: PptRequest, worship_info_id: int, shared: dict = None) -> dict:
+    """
+    예배 하나의 PPT를 생성하고 결과 dict를 반환합니다. 실패해도 예외를 밖으로 내보내지 않습니다.
+    `progress`는 update_state(state=..., meta=...)를 제공하는 객체(Celery 태스크 등)입니다.
+    `shared`는 여러 예배를 일괄 생성할 때 공유하는 자원입니다:
+    {"template": PptTemplate, "http_session": requests.Session, "bible_cache": {설교 본문: 구절 목록}}
+    """
+    shared = shared or {}
+    try:
         ppt_request.status = 'processing'
         ppt_request.progress_message = "PPT 제작을 시작합니다..."
         ppt_request.save()
-        self.update_state(state='PROGRESS', meta={'progress': 5, 'message': ppt_request.progress_message})
+        progress.update_state(state='PROGRESS', meta={'progress': 5, 'message': ppt_request.progress_message})
 
         # 1. 필요한 데이터 가져오기
         worship_info = WorshipInfo.objects.get(id=worship_info_id)
-        normal_songs = SongInfo.objects.filter(worship_info=worship_info, is_ending_song=False).order_by('order')
+        normal_songs = list(SongInfo.objects.filter(worship_info=worship_info, is_ending_song=False).order_by('order'))
         ending_song = SongInfo.objects.filter(worship_info=worship_info, is_ending_song=True).first()
 
-        active_template = PptTemplate.objects.filter(is_active=True).order_by('-created_at').first()
+        active_template = shared['template'] if 'template' in shared else get_active_template()
         if not active_template or not active_template.template_file:
             ppt_request.status = 'failed'
             ppt_request.progress_message = "오류: 활성화된 PPT 템플릿 파일이 존재하지 않습니다. 관리자에게 문의하세요."
             ppt_request.save()
-            self.update_state(state='FAILURE', meta={'progress': 0, 'message': ppt_request.progress_message})
+            progress.update_state(state='FAILURE', meta={'progress': 0, 'message': ppt_request.progress_message})
             return {'status': 'failed', 'error': ppt_request.progress_message}
         
-        template_file_path = active_template.template_file.path
-        
-        prs = load_template(template_file_path)
-        cumulative_added_slide_count = 0
+        # 업로드 시 만든 경량화 사본이 있으면 그것으로 생성합니다. (원본은 그대로 보관)
+        template_file_path = (active_template.optimized_file or active_template.template_file).path
+
+        # 매니페스트가 없는 기존 템플릿(업로드 기능 이전에 등록된 템플릿)은 한 번만 추출해 저장합니다.
+        if not is_manifest_current(active_template.manifest):
+            try:
+                active_template.manifest = extract_template_manifest(template_file_path)
+            except TemplateManifestError as e:
+                ppt_request.status = 'failed'
+                ppt_request.progress_message = f"오류: PPT 템플릿 구조가 올바르지 않습니다. {e.errors[0]}"
+                ppt_request.save()
+                progress.update_state(state='FAILURE', meta={'progress': 0, 'message': ppt_request.progress_message})
+                return {'status': 'failed', 'error': str(e)}
+            # save()는 auto_now로 메모리의 updated_at을 바꿔 템플릿 캐시 키와 지문이 달라지므로 update()로 저장합니다.
+            PptTemplate.objects.filter(pk=active_template.pk).update(manifest=active_template.manifest)
+
+        # 성경봉독 본문 (입력 지문에 포함되므로 먼저 불러옵니다)
+        bible_cache = shared.get('bible_cache')
+        if bible_cache is None:
+            bible_contents = load_bible_contents(worship_info.sermon_scripture)
+        else:
+            if worship_info.sermon_scripture not in bible_cache:
+                bible_cache[worship_info.sermon_scripture] = load_bible_contents(worship_info.sermon_scripture)
+            bible_contents = bible_cache[worship_info.sermon_scripture]
+
+        # 입력이 지난 생성 때와 같고 파일이 남아 있으면 다시 만들지 않고 기존 파일을 반환합니다.
+        all_songs = normal_songs + ([ending_song] if ending_song else [])
+        input_fingerprint = compute_request_fingerprint(active_template, worship_info, all_songs, bible_contents)
+        # 크롤링/분할에 실패한 찬양이 있으면 다시 시도해야 하므로 기존 파일을 재사용하지 않습니다.
+        if (
+            ppt_request.input_fingerprint == input_fingerprint
+            and not has_placeholder_lyrics(get_fingerprint_songs(all_songs))
+            and ppt_request.generated_ppt_file
+            and ppt_request.generated_ppt_file.storage.exists(ppt_request.generated_ppt_file.name)
+        ):
+            ppt_request.status = 'completed'
+            ppt_request.progress_message = "입력 내용이 바뀌지 않아 기존 PPT 파일을 그대로 사용합니다."
+            ppt_request.completed_at = timezone.now()
+            ppt_request.save()
+            progress.update_state(state='SUCCESS', meta={'progress': 100, 'message': ppt_request.progress_message, 'file_url': ppt_request.generated_ppt_file.url})
+            return {'status': 'completed', 'file_url': ppt_request.generated_ppt_file.url, 'fingerprint_hit': True}
 
-        # 2. 표지 수정
+        # 2. 표지 문구
         next_sunday_text = get_sunday_text(worship_info.worship_date)
-        prs = edit_text_field(prs=prs, slide_index=0, is_title=True, new_text=next_sunday_text)
-        ppt_request.progress_message = "표지를 업데이트 중입니다..."
-        ppt_request.save()
-        self.update_state(state='PROGRESS', meta={'progress': 10, 'message': ppt_request.progress_message})
-
-        # 3. 예배 정보 필드 (기도자, 봉헌자, 광고 책임자, 성경봉독 범위, 설교자, 축도자) 수정
-        SLIDE_INDEX_PRAYER = 14
-        SLIDE_INDEX_OFFERING = 15
-        SLIDE_INDEX_ADS_MANAGER = 18 # core/models.py 필드명과 일치
-        SLIDE_INDEX_BIBLE_RANGE = 21
-        SLIDE_INDEX_SERMON_TITLE = 23
-        SLIDE_INDEX_ENDING_SONG_TITLE_TEMPLATE = 27
-        SLIDE_INDEX_BENEDICTION_MINISTER = 37
-
-        prs = edit_text_field(prs=prs, slide_index=SLIDE_INDEX_PRAYER, is_title=True, new_text=worship_info.prayer_minister)
-        prs = edit_text_field(prs=prs, slide_index=SLIDE_INDEX_OFFERING, is_title=True, new_text=worship_info.offering_minister)
-        prs = edit_text_field(prs=prs, slide_index=SLIDE_INDEX_ADS_MANAGER, is_title=True, new_text=worship_info.ads_manager) # models.py 필드명 사용
-        prs = edit_text_field(prs=prs, slide_index=SLIDE_INDEX_BIBLE_RANGE, is_title=True, new_text=worship_info.sermon_scripture)
-        prs = edit_text_field(prs=prs, slide_index=SLIDE_INDEX_SERMON_TITLE, is_title=True, new_text=worship_info.sermon_title)
-        prs = edit_text_field(prs=prs, slide_index=SLIDE_INDEX_BENEDICTION_MINISTER, is_title=True, new_text=worship_info.benediction_minister) # models.py 필드명 사용
-
-        ppt_request.progress_message = "예배 기본 정보를 슬라이드에 반영 중입니다..."
+        ppt_request.progress_message = "예배 기본 정보를 확인 중입니다..."
         ppt_request.save()
-        self.update_state(state='PROGRESS', meta={'progress': 20, 'message': ppt_request.progress_message})
+        progress.update_state(state='PROGRESS', meta={'progress': 10, 'message': ppt_request.progress_message})
         
-        # 4. 찬양 파트 수정 (일반 찬양)
+        # 3. 찬양 가사 준비 (일반 찬양)
         songs_data_for_ppt = []
         for song in normal_songs:
             current_lyrics = song.lyrics
             current_lyrics_pages = song.lyrics_pages
 
-            if not current_lyrics and song.source_url:
+            # 가사가 없거나 지난번 크롤링 실패 메시지가 저장되어 있으면 다시 크롤링합니다.
+            if is_placeholder_lyrics(current_lyrics) and song.source_url:
                 ppt_request.progress_message = f"'{song.title}' 가사를 크롤링 중입니다..."
                 ppt_request.save()
-                self.update_state(state='PROGRESS', meta={'progress': 30, 'message': ppt_request.progress_message})
-                current_lyrics = crawl_lyrics(song.source_url)
-                if current_lyrics:
+                progress.update_state(state='PROGRESS', meta={'progress': 30, 'message': ppt_request.progress_message})
+                current_lyrics = crawl_lyrics(song.source_url, session=shared.get('http_session'))
+                if not is_placeholder_lyrics(current_lyrics): # 실패 메시지는 가사로 저장하지 않음
                     song.lyrics = current_lyrics
                     song.save()
                 else:
@@ -104,17 +239,18 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
                     ppt_request.save()
                     current_lyrics = "가사를 찾을 수 없습니다."
 
-            # 가사 분할 (이제 LLM_split_lyrics_to_json 사용)
-            if song.lyrics and song.lyrics != "가사를 가져올 수 없습니다.":
+            # 가사 분할 (이제 LLM_split_lyrics_to_json 사용). 가사가 바뀌지 않았으면 저장된 페이지를 그대로 씁니다.
+            if not is_placeholder_lyrics(song.lyrics) and not are_lyrics_pages_current(song):
                 ppt_request.progress_message = f"'{song.title}' 가사를 AI로 분할 중입니다..."
                 ppt_request.save()
-                self.update_state(state='PROGRESS', meta={'progress': 40, 'message': ppt_request.progress_message})
+                progress.update_state(state='PROGRESS', meta={'progress': 40, 'message': ppt_request.progress_message})
                 
                 # LLM 연동 활성화: utils.llm.split_lyrics_to_json 호출
                 splitted_res = split_lyrics_to_json([{"title": song.title, "lyrics": song.lyrics}])
                 
                 if splitted_res and splitted_res[0].get("splitted_lyrics"):
                     song.lyrics_pages = splitted_res[0]["splitted_lyrics"]
+                    song.lyrics_pages_source = lyrics_source_hash(song.lyrics)
                     song.save()
                 else:
                     ppt_request.progress_message = f"'{song.title}' 가사 분할 실패. 전체 가사 사용."
@@ -130,107 +266,44 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
                 "splitted_lyrics": song.lyrics_pages
             })
         
-        SLIDE_INDEX_START_SONG = 5
-        SLIDE_INDEX_LYRICS_TEMPLATE = 6
-        
-        for index, song_data in enumerate(songs_data_for_ppt):
-            song_title = song_data["title"]
-            splited_lyrics = song_data["splitted_lyrics"]
-
-            ppt_request.progress_message = f"'{song_title}' 찬양 슬라이드 생성 중 ({index + 1}/{len(songs_data_for_ppt)})..."
-            ppt_request.save()
-            self.update_state(state='PROGRESS', meta={'progress': 50 + index * 5, 'message': ppt_request.progress_message})
-
-            # 찬양 제목 슬라이드 수정 (기준 인덱스 + 현재까지 추가된 슬라이드 수)
-            prs = edit_text_field(
-                prs=prs,
-                slide_index=SLIDE_INDEX_START_SONG + index * 2 + cumulative_added_slide_count,
-                is_title=True,
-                new_text=song_title
-            )
-            # 가사 슬라이드 추가 (기준 인덱스 + 1 + 현재까지 추가된 슬라이드 수)
-            added_res = add_lyrics_slides(
-                prs=prs,
-                duplicate_slide_index=SLIDE_INDEX_LYRICS_TEMPLATE + index * 2 + cumulative_added_slide_count,
-                slide_texts=splited_lyrics
-            )
-            prs = added_res["prs"]
-            cumulative_added_slide_count += added_res["added_slide_count"]
-        
-        ppt_request.progress_message = "모든 찬양 슬라이드 생성을 완료했습니다."
+        ppt_request.progress_message = "모든 찬양 가사 준비를 완료했습니다."
         ppt_request.save()
-        self.update_state(state='PROGRESS', meta={'progress': 70, 'message': ppt_request.progress_message})
-
-        # 5. 광고 페이지 추가
-        ads_from_db = worship_info.worship_announcements
-        if ads_from_db:
-            SLIDE_INDEX_ADS_CONTENTS_TEMPLATE = 20
-            added_ads_count = add_ads_slides(prs, ads_from_db, SLIDE_INDEX_ADS_CONTENTS_TEMPLATE + cumulative_added_slide_count)
-            cumulative_added_slide_count += added_ads_count
-        
-        ppt_request.progress_message = "광고 슬라이드를 추가 중입니다..."
-        ppt_request.save()
-        self.update_state(state='PROGRESS', meta={'progress': 80, 'message': ppt_request.progress_message})
+        progress.update_state(state='PROGRESS', meta={'progress': 50, 'message': ppt_request.progress_message})
 
+        # 4. 광고 목록
+        ads_from_db = worship_info.worship_announcements or []
 
-        # 6. 성경봉독 슬라이드 추가
-        # Sermon Scripture를 파싱하여 get_local_bible_contents에 전달
-        scripture = worship_info.sermon_scripture # 폼에서 이미 유효성 검사되었으므로 파싱 로직 단순화
-        
-        # Regex to parse "책이름 장:절 - 장:절" or "책이름 장:절"
-        pattern = re.compile(r'^\s*(.+?)\s*(\d+):(\d+)\s*(?:-\s*(?:(.+?)\s*)?(\d+):(\d+))?\s*$')
-        match = pattern.match(scripture)
-
-        if match:
-            start_book = match.group(1).strip()
-            start_ch = int(match.group(2))
-            start_verse = int(match.group(3))
-            
-            end_book = match.group(4) # Can be None
-            end_ch = int(match.group(5)) if match.group(5) else start_ch
-            end_verse = int(match.group(6)) if match.group(6) else start_verse
-            
-            bible_contents = get_local_bible_contents(start_book, start_ch, start_verse, end_ch, end_verse)
-        else:
-            # 이 else 블록은 clean_sermon_scripture에서 이미 걸러지지만, 안전을 위해 남겨둠
-            bible_contents = [{"title": "성경 본문", "contents": "성경 구절 형식이 올바르지 않아 내용을 가져올 수 없습니다."}]
-
-        SLIDE_INDEX_BIBLE_CONTENTS_TEMPLATE = 22
-        added_bible_count = add_bible_slides(prs, bible_contents, SLIDE_INDEX_BIBLE_CONTENTS_TEMPLATE + cumulative_added_slide_count)
-        cumulative_added_slide_count += added_bible_count
-        
-        ppt_request.progress_message = "성경 말씀 슬라이드를 추가 중입니다..."
+        # 5. 성경봉독 본문 (위에서 불러온 구절 사용)
+        ppt_request.progress_message = "성경 말씀을 불러왔습니다."
         ppt_request.save()
-        self.update_state(state='PROGRESS', meta={'progress': 85, 'message': ppt_request.progress_message})
-
+        progress.update_state(state='PROGRESS', meta={'progress': 60, 'message': ppt_request.progress_message})
 
-        # 7. 결단 찬양 수정
+        # 6. 결단 찬양 가사 준비
+        ending_song_data = None
         if ending_song:
-            prs = edit_text_field(prs=prs, slide_index=SLIDE_INDEX_ENDING_SONG_TITLE_TEMPLATE + cumulative_added_slide_count, is_title=True, new_text=ending_song.title)
-
             current_lyrics = ending_song.lyrics
-            current_lyrics_pages = ending_song.lyrics_pages
             
-            if not current_lyrics and ending_song.source_url:
+            if is_placeholder_lyrics(current_lyrics) and ending_song.source_url:
                 ppt_request.progress_message = f"'{ending_song.title}' 가사를 크롤링 중입니다..."
                 ppt_request.save()
-                self.update_state(state='PROGRESS', meta={'progress': 90, 'message': ppt_request.progress_message})
-                current_lyrics = crawl_lyrics(ending_song.source_url)
-                if current_lyrics:
+                progress.update_state(state='PROGRESS', meta={'progress': 65, 'message': ppt_request.progress_message})
+                current_lyrics = crawl_lyrics(ending_song.source_url, session=shared.get('http_session'))
+                if not is_placeholder_lyrics(current_lyrics):
                     ending_song.lyrics = current_lyrics
                     ending_song.save()
                 else:
                     current_lyrics = "가사를 찾을 수 없습니다."
 
-            if not current_lyrics_pages and current_lyrics:
+            if not is_placeholder_lyrics(ending_song.lyrics) and not are_lyrics_pages_current(ending_song):
                 ppt_request.progress_message = f"'{ending_song.title}' 가사를 AI로 분할 중입니다..."
                 ppt_request.save()
-                self.update_state(state='PROGRESS', meta={'progress': 92, 'message': ppt_request.progress_message})
+                progress.update_state(state='PROGRESS', meta={'progress': 70, 'message': ppt_request.progress_message})
                 # LLM 연동 활성화: utils.llm.split_lyrics_to_json 호출
                 splitted_res = split_lyrics_to_json([{"title": ending_song.title, "lyrics": ending_song.lyrics}])
                 
                 if splitted_res and splitted_res[0].get("splitted_lyrics"):
                     ending_song.lyrics_pages = splitted_res[0]["splitted_lyrics"]
+                    ending_song.lyrics_pages_source = lyrics_source_hash(ending_song.lyrics)
                     ending_song.save()
                 else:
                     ppt_request.progress_message = f"'{ending_song.title}' 가사 분할 실패. 전체 가사 사용."
@@ -241,39 +314,146 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
                 ending_song.lyrics_pages = ["가사를 가져올 수 없습니다."]
                 ending_song.save()
 
-            added_slide_res = add_lyrics_slides(
-                prs=prs,
-                duplicate_slide_index=SLIDE_INDEX_ENDING_SONG_TITLE_TEMPLATE + 1 + cumulative_added_slide_count,
-                slide_texts=current_lyrics_pages
-            )
-            prs = added_slide_res["prs"]
-            cumulative_added_slide_count += added_slide_res["added_slide_count"]
+            ending_song_data = {
+                "title": ending_song.title,
+                "splitted_lyrics": ending_song.lyrics_pages
+            }
 
-        ppt_request.progress_message = "결단 찬양 슬라이드 생성을 완료했습니다."
+        # 7. 슬라이드 플랜 생성 (렌더링 없이 최종 슬라이드 순서 결정)
+        ppt_request.progress_message = "슬라이드를 생성 중입니다..."
         ppt_request.save()
-        self.update_state(state='PROGRESS', meta={'progress': 95, 'message': ppt_request.progress_message})
-
-
-        # 8. 최종 PPT 저장
-        generated_ppt_dir = os.path.join(settings.MEDIA_ROOT, 'generated_ppts')
-        os.makedirs(generated_ppt_dir, exist_ok=True)
-
+        progress.update_state(state='PROGRESS', meta={'progress': 80, 'message': ppt_request.progress_message})
+
+        slide_plan = build_slide_plan(
+            template_slide_count=active_template.manifest["slide_count"],
+            sunday_text=next_sunday_text,
+            worship_info=worship_info,
+            songs_data=songs_data_for_ppt,
+            ending_song_data=ending_song_data,
+            ads_list=ads_from_db,
+            bible_contents=bible_contents,
+            manifest=active_template.manifest, # 역할별 슬라이드/Placeholder 위치
+        )
+
+        # 8. 최종 PPT 렌더링 및 저장
         worship_type_slug = worship_info.get_worship_type_display().replace(' ', '_').replace('(', '').replace(')', '')
-        file_name = f"{worship_info.worship_date.strftime('%Y%m%d')}_{worship_type_slug}.pptx"
-        full_save_path = os.path.join(generated_ppt_dir, file_name)
-        
-        save_presentation(prs, full_save_path)
+        # 크롤링/가사 분할로 찬양 정보가 채워졌을 수 있으므로 준비가 끝난 상태로 지문을 다시 계산합니다.
+        input_fingerprint = compute_request_fingerprint(active_template, worship_info, all_songs, bible_contents)
+        file_name = f"{worship_info.worship_date.strftime('%Y%m%d')}_{worship_type_slug}_{short_fingerprint(input_fingerprint)}.pptx"
+        # ooxml 엔진은 찬양 섹션 캐시와 병렬 렌더링을, python-pptx 엔진은 워커에 캐시된 템플릿 복제본을 사용
+        # (템플릿 업로드/수정 시 updated_at이 바뀌어 자동 갱신)
+        render_engine = getattr(settings, 'PPT_RENDER_ENGINE', RENDER_ENGINE_OOXML)
+        if render_engine != RENDER_ENGINE_OOXML:
+            print(f"Warning: Section cache and parallel rendering are bypassed by the {render_engine} engine. Set PPT_RENDER_ENGINE=ooxml to use them.")
+        reset_shape_index_stats()
+        reset_section_cache_stats()
+        reset_text_fit_stats()
+        reset_handout_cache_stats()
+
+        # 같은 템플릿으로 만든 이전 파일이 있고 슬라이드 구성이 같으면(가사 오타 수정 등) 바뀐 슬라이드만 다시 만듭니다.
+        template_version = get_template_version(active_template)
+        previous_plan = None
+        if (
+            ppt_request.slide_plan.get("template_version") == template_version
+            and ppt_request.generated_ppt_file
+            and ppt_request.generated_ppt_file.storage.exists(ppt_request.generated_ppt_file.name)
+        ):
+            previous_plan = ppt_request.slide_plan.get("plan")
+        changed_positions = diff_slide_plans(previous_plan, slide_plan)
+
+        # 메모리 버퍼에 렌더링(큰 파일은 임시 파일로 넘어감)한 뒤 저장소로 넘깁니다.
+        with tempfile.SpooledTemporaryFile(max_size=getattr(settings, 'PPT_SPOOL_MAX_BYTES', 32 * 1024 * 1024)) as ppt_buffer:
+            if changed_positions is not None:
+                with ppt_request.generated_ppt_file.open('rb') as previous_deck:
+                    patch_deck_ooxml(
+                        template_file_path, previous_deck, slide_plan, changed_positions, ppt_buffer,
+                        zip_level=getattr(settings, 'PPT_ZIP_LEVEL', None),
+                        zip_workers=getattr(settings, 'PPT_ZIP_WORKERS', 1),
+                    )
+                change_report = build_change_report(previous_plan, slide_plan, changed_positions)
+                print(f"Delta regeneration: {len(changed_positions)} of {len(slide_plan)} slides changed.")
+            else:
+                render_slide_plan(
+                    template_file_path, slide_plan, ppt_buffer, engine=render_engine,
+                    template_id=active_template.id, updated_at=active_template.updated_at,
+                    workers=getattr(settings, 'PPT_RENDER_WORKERS', 1),
+                    zip_level=getattr(settings, 'PPT_ZIP_LEVEL', None),
+                    zip_workers=getattr(settings, 'PPT_ZIP_WORKERS', 1),
+                )
+                change_report = []
+            # 덱과 그 슬라이드 플랜/지문을 함께 저장해야 다음 수정 재요청이 올바른 기준과 비교합니다.
+            # (이후 유인물/디스플레이 단계가 실패해도 파일과 플랜이 어긋나지 않음)
+            # 실패 문구로 만든 덱의 지문은 저장하지 않아 다음 요청에서 가사를 다시 가져옵니다.
+            ppt_request.input_fingerprint = "" if has_placeholder_lyrics(get_fingerprint_songs(all_songs)) else input_fingerprint
+            ppt_request.slide_plan = {"template_version": template_version, "plan": slide_plan}
+            ppt_request.change_report = change_report
+            publish_generated_ppt(
+                ppt_request, ppt_buffer, file_name,
+                extra_update_fields=('input_fingerprint', 'slide_plan', 'change_report'),
+            )
+
+        # 같은 플랜으로 가사/성경 본문 PDF 유인물을 만들어 덱과 함께 게시합니다. (섹션별 캐시로 바뀐 찬양만 다시 그림)
+        handout_stats = None
+        if getattr(settings, 'PPT_HANDOUT_ENABLED', True):
+            try:
+                with tempfile.SpooledTemporaryFile(max_size=getattr(settings, 'PPT_SPOOL_MAX_BYTES', 32 * 1024 * 1024)) as handout_buffer:
+                    handout_pages = render_handout_pdf(
+                        slide_plan, handout_buffer, title=next_sunday_text,
+                        typeface=getattr(settings, 'PPT_HANDOUT_FONT', 'NanumGothic'),
+                        workers=getattr(settings, 'PPT_RENDER_WORKERS', 1),
+                    )
+                    publish_generated_ppt(
+                        ppt_request, handout_buffer, f"{os.path.splitext(file_name)[0]}.pdf",
+                        field_name='handout_file', directory='generated_handouts',
+                    )
+                handout_stats = dict(HANDOUT_CACHE_STATS, pages=handout_pages)
+            except MissingFontError as e:
+                # 한글 글꼴이 없으면 글자가 빈 상자로 찍힌 PDF를 내보내지 않고 유인물만 건너뜁니다.
+                print(f"Warning: Handout PDF skipped. {e}")
+                if ppt_request.handout_file:
+                    ppt_request.handout_file.delete(save=False) # 이전 덱의 유인물
+                    ppt_request.save(update_fields=['handout_file'])
+                handout_stats = {"skipped": str(e)}
+            print(f"Handout PDF: {handout_stats}")
+
+        # 로비 화면/방송 자막용 텍스트 슬라이드 HTML도 같은 플랜으로 만들어 덱 옆에 저장합니다.
+        if getattr(settings, 'PPT_DISPLAY_BUNDLE_ENABLED', True):
+            display_html = render_display_html(build_display_bundle(slide_plan, title=next_sunday_text))
+            publish_generated_ppt(
+                ppt_request, ContentFile(display_html.encode('utf-8')), f"{os.path.splitext(file_name)[0]}.html",
+                field_name='display_file', directory='generated_displays',
+            )
+        shape_index_stats = dict(SHAPE_INDEX_STATS) # 도형 인덱스 재사용(hits) / 생성(misses) 횟수
+        # 찬양 섹션 캐시 재사용(hits) / 새로 렌더링(misses) 횟수 (ooxml 엔진에서만 사용)
+        section_lookups = SECTION_CACHE_STATS["hits"] + SECTION_CACHE_STATS["misses"]
+        section_cache_stats = dict(
+            SECTION_CACHE_STATS,
+            hit_rate=round(SECTION_CACHE_STATS["hits"] / section_lookups, 3) if section_lookups else None,
+        )
+        print(f"Section cache: {section_cache_stats}")
+        text_fit_stats = dict(TEXT_FIT_STATS) # 글꼴 크기를 맞춘 텍스트 수 / 줄인 수 / 새로 잰 글자 수
+        if TEXT_FIT_STATS["measured_glyphs"] and getattr(settings, 'PPT_GLYPH_CACHE_PATH', None):
+            save_glyph_width_cache(settings.PPT_GLYPH_CACHE_PATH)
+
+        ppt_request.progress_message = "모든 슬라이드 생성을 완료했습니다."
+        ppt_request.save()
+        progress.update_state(state='PROGRESS', meta={'progress': 95, 'message': ppt_request.progress_message})
 
-        # 9. PptRequest 모델 업데이트 (파일 경로 및 상태)
-        ppt_request.generated_ppt_file.name = os.path.join('generated_ppts', file_name)
+        # 9. PptRequest 모델 업데이트 (상태, 파일과 슬라이드 플랜은 위에서 게시됨)
+        ppt_request.thumbnails = [] # 새 파일의 미리보기는 generate_thumbnails_task가 채웁니다.
         
         ppt_request.status = 'completed'
-        ppt_request.progress_message = "PPT 제작이 완료되었습니다. 파일을 다운로드할 수 있습니다."
+        if changed_positions is not None:
+            ppt_request.progress_message = f"수정된 슬라이드 {len(changed_positions)}장을 반영했습니다. 파일을 다운로드할 수 있습니다."
+        else:
+            ppt_request.progress_message = "PPT 제작이 완료되었습니다. 파일을 다운로드할 수 있습니다."
         ppt_request.completed_at = timezone.now()
         ppt_request.save()
-        self.update_state(state='SUCCESS', meta={'progress': 100, 'message': ppt_request.progress_message, 'file_url': ppt_request.generated_ppt_file.url})
+        progress.update_state(state='SUCCESS', meta={'progress': 100, 'message': ppt_request.progress_message, 'file_url': ppt_request.generated_ppt_file.url})
+        if getattr(settings, 'PPT_THUMBNAILS_ENABLED', True):
+            generate_thumbnails_task.delay(ppt_request.id)
 
-        return {'status': 'completed', 'file_url': ppt_request.generated_ppt_file.url}
+        return {'status': 'completed', 'file_url': ppt_request.generated_ppt_file.url, 'fingerprint_hit': False, 'delta': changed_positions is not None, 'change_report': change_report, 'shape_index_stats': shape_index_stats, 'section_cache_stats': section_cache_stats, 'text_fit_stats': text_fit_stats, 'handout_stats': handout_stats}
 
     except WorshipInfo.DoesNotExist:
         error_message = "오류: 해당 예배 정보를 찾을 수 없습니다. PPT 제작 실패."
@@ -282,7 +462,7 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
             ppt_request.status = 'failed'
             ppt_request.progress_message = error_message
             ppt_request.save()
-            self.update_state(state='FAILURE', meta={'message': error_message})
+            progress.update_state(state='FAILURE', meta={'message': error_message})
         return {'status': 'failed', 'error': error_message}
     except SongInfo.DoesNotExist:
         error_message = "오류: 해당 찬양 정보를 찾을 수 없습니다. PPT 제작 실패."
@@ -291,12 +471,16 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
             ppt_request.status = 'failed'
             ppt_request.progress_message = error_message
             ppt_request.save()
-            self.update_state(state='FAILURE', meta={'message': error_message})
+            progress.update_state(state='FAILURE', meta={'message': error_message})
         return {'status': 'failed', 'error': error_message}
-    except PptRequest.DoesNotExist:
-        error_message = "오류: PPT 요청 객체를 찾을 수 없습니다. PPT 제작 실패."
+    except SlidePlanError as e:
+        error_message = f"오류: 예배 정보가 PPT 템플릿에 맞지 않습니다. {e}"
         print(error_message)
-        self.update_state(state='FAILURE', meta={'message': error_message})
+        if ppt_request:
+            ppt_request.status = 'failed'
+            ppt_request.progress_message = error_message
+            ppt_request.save()
+            progress.update_state(state='FAILURE', meta={'message': error_message})
         return {'status': 'failed', 'error': error_message}
     except (ValueError, FileNotFoundError) as e:
         error_message = f"성경 파일 또는 구절 파싱 오류: {e}"
@@ -305,7 +489,7 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
             ppt_request.status = 'failed'
             ppt_request.progress_message = error_message
             ppt_request.save()
-            self.update_state(state='FAILURE', meta={'message': error_message})
+            progress.update_state(state='FAILURE', meta={'message': error_message})
         return {'status': 'failed', 'error': error_message}
     except Exception as e:
         error_message = f"PPT 제작 중 예상치 못한 오류 발생: {e}"
@@ -316,5 +500,129 @@ def generate_ppt_task(self: TaskType, worship_info_id: int):
             ppt_request.status = 'failed'
             ppt_request.progress_message = error_message
             ppt_request.save()
-            self.update_state(state='FAILURE', meta={'message': error_message})
-        return {'status': 'failed', 'error': error_message}
\ No newline at end of file
+            progress.update_state(state='FAILURE', meta={'message': error_message})
+        return {'status': 'failed', 'error': error_message}
+
+class _BatchProgress:
+    """일괄 생성 중 예배 하나의 진행 상황을 일괄 태스크의 상태(몇 번째 예배인지 포함)로 전달합니다."""
+
+    def __init__(self, task: TaskType, number: int, total: int, worship_info_id: int, results: list):
+        self.task = task
+        self.number = number
+        self.total = total
+        self.worship_info_id = worship_info_id
+        self.results = results
+
+    def update_state(self, state: str, meta: dict):
+        # 예배 하나의 성공/실패는 일괄 작업 전체의 상태가 아니므로 항상 PROGRESS로 보고합니다.
+        self.task.update_state(state='PROGRESS', meta={
+            'current': self.number,
+            'total': self.total,
+            'worship_info_id': self.worship_info_id,
+            'service_state': state,
+            'progress': meta.get('progress'),
+            'message': meta.get('message'),
+            'results': self.results,
+        })
+
+
+@shared_task(bind=True)
+def generate_ppt_batch_task(self: TaskType, worship_info_ids: list = None, start_date: str = None, end_date: str = None):
+    """
+    여러 예배의 PPT를 한 번의 태스크에서 차례로 생성합니다. (한 달치 예배, 템플릿 변경 후 전체 재생성 등)
+    `worship_info_ids` 또는 날짜 범위(`start_date`~`end_date`, "YYYY-MM-DD", 양 끝 포함)로 대상을 고릅니다.
+    활성 템플릿, 성경 본문, HTTP 세션과 LLM 클라이언트를 모든 예배가 공유하며,
+    한 예배가 실패해도 나머지는 계속 생성하고 예배별 결과를 모아 반환합니다.
+    """
+    worship_infos = WorshipInfo.objects.order_by('worship_date', 'id')
+    if worship_info_ids is not None:
+        worship_infos = worship_infos.filter(id__in=worship_info_ids)
+    if start_date:
+        worship_infos = worship_infos.filter(worship_date__gte=start_date)
+    if end_date:
+        worship_infos = worship_infos.filter(worship_date__lte=end_date)
+    worship_infos = list(worship_infos)
+
+    active_template = get_active_template()
+    if not active_template or not active_template.template_file:
+        error_message = "오류: 활성화된 PPT 템플릿 파일이 존재하지 않습니다. 관리자에게 문의하세요."
+        self.update_state(state='FAILURE', meta={'message': error_message})
+        return {'status': 'failed', 'error': error_message}
+
+    results = []
+    http_session = requests.Session()
+    shared = {"template": active_template, "http_session": http_session, "bible_cache": {}}
+    try:
+        for number, worship_info in enumerate(worship_infos, start=1):
+            # 일괄 태스크 ID는 여러 요청이 공유하므로 PptRequest.celery_task_id는 바꾸지 않습니다.
+            ppt_request, _ = PptRequest.objects.get_or_create(worship_info=worship_info, defaults={'status': 'pending'})
+            progress = _BatchProgress(self, number, len(worship_infos), worship_info.id, results)
+            try:
+                result = run_ppt_generation(progress, ppt_request, worship_info.id, shared)
+            except Exception as e: # run_ppt_generation이 처리하지 못한 오류도 다음 예배로 넘어갑니다.
+                print(f"Batch generation failed for worship_info {worship_info.id}: {e}")
+                result = {'status': 'failed', 'error': str(e)}
+            results.append({
+                'worship_info_id': worship_info.id,
+                'worship_date': worship_info.worship_date.isoformat(),
+                'status': result.get('status'),
+                'file_url': result.get('file_url'),
+                'error': result.get('error'),
+            })
+    finally:
+        http_session.close()
+
+    completed_count = sum(1 for result in results if result['status'] == 'completed')
+    print(f"Batch generation finished: {completed_count}/{len(results)} completed.")
+    return {
+        'status': 'completed',
+        'total': len(results),
+        'completed': completed_count,
+        'failed': len(results) - completed_count,
+        'results': results,
+    }
+
+
+THUMBNAIL_STORAGE_DIR = 'ppt_thumbnails'
+
+
+@shared_task
+def generate_thumbnails_task(ppt_request_id: int):
+    """
+    생성된 PPT의 슬라이드 미리보기 PNG를 만들어 저장소에 저장하고 PptRequest.thumbnails에 순서대로 기록합니다.
+    PNG 파일 이름이 슬라이드 내용 해시이므로 이미 저장된 슬라이드(이전 생성과 같은 슬라이드)는 다시 그리지 않습니다.
+    """
+    ppt_request = PptRequest.objects.get(id=ppt_request_id)
+    if not ppt_request.generated_ppt_file:
+        return {'status': 'skipped', 'thumbnails': 0}
+    deck_name = ppt_request.generated_ppt_file.name
+
+    def thumbnail_name(key):
+        return f"{THUMBNAIL_STORAGE_DIR}/{key}.png"
+
+    try:
+        with ppt_request.generated_ppt_file.open('rb') as deck_file:
+            thumbnails = render_deck_thumbnails(
+                deck_file,
+                is_cached=lambda key: default_storage.exists(thumbnail_name(key)),
+                width_px=getattr(settings, 'PPT_THUMBNAIL_WIDTH_PX', 320),
+                fallback_typeface=getattr(settings, 'PPT_THUMBNAIL_FONT', 'NanumGothic'),
+            )
+    except MissingFontError as e:
+        # 글자가 빈 상자로 찍힌 미리보기를 보여주지 않고 미리보기만 건너뜁니다.
+        print(f"Warning: Thumbnails for PptRequest {ppt_request_id} skipped. {e}")
+        return {'status': 'skipped', 'thumbnails': 0, 'error': str(e)}
+
+    names = []
+    rendered_count = 0
+    for key, png in thumbnails:
+        name = thumbnail_name(key)
+        if png is not None:
+            name = default_storage.save(name, ContentFile(png))
+            rendered_count += 1
+        names.append(name)
+
+    # 그리는 동안 새 파일로 다시 생성되었다면 이전 파일의 미리보기로 덮어쓰지 않습니다.
+    updated = PptRequest.objects.filter(id=ppt_request_id, generated_ppt_file=deck_name).update(thumbnails=names)
+    print(f"Thumbnails for PptRequest {ppt_request_id}: {rendered_count} rendered, {len(names) - rendered_count} cached.")
+    return {'status': 'completed' if updated else 'stale', 'thumbnails': len(names), 'rendered': rendered_count}
@@ -10,4 +10,6 @@ urlpatterns = [
     path('ppt-creation-start/', views.ppt_creation_start_view, name='ppt_creation_start'),
     path('ppt-download/<int:ppt_request_id>/', views.ppt_download_view, name='ppt_download'),
     path('api/ppt-status/<str:task_id>/', views.ppt_task_status_api, name='ppt_task_status_api'),
+    path('api/bible-search/', views.bible_search_api, name='bible_search_api'),
+    path('api/bible-books/', views.bible_book_suggest_api, name='bible_book_suggest_api'),
 ]
@@ -20,6 +20,9 @@ from django.utils.decorators import method_decorator
 
 # Celery 태스크 임포트
 from core.tasks import generate_ppt_task
+from utils.bible_search import search_bible, SEARCH_MODE_PREFIX, SEARCH_MODES, MAX_SEARCH_RESULTS
+from utils.bible_text_parser import BIBLE_SEARCH_INDEX_PATH
+from utils.bible_books import suggest_books, book_abbreviation
 
 from django.http import JsonResponse
 from celery.result import AsyncResult
@@ -107,10 +110,14 @@ def home(request):
         'user_is_member': user_is_member, # 교인 역할 추가
 
         # 버튼 노출 조건
-        'show_ppt_creation_start_button': user_is_media_team and ppt_request and ppt_request.status != 'completed',
+        'show_ppt_creation_start_button': user_is_media_team and ppt_request and ppt_request.status != 'processing', # 완료 후에도 수정 재요청 가능
         'show_worship_info_input_button': (user_is_worship_prep_team or user_is_media_team) and not worship_info,
         'show_song_info_input_button': (user_is_praise_team or user_is_media_team) and worship_info and not SongInfo.objects.filter(worship_info=worship_info).exists(),
         'show_ppt_download_button': ppt_request and ppt_request.generated_ppt_file and ppt_request.status == 'completed',
+        'show_handout_download_button': ppt_request and ppt_request.handout_file and ppt_request.status == 'completed',
+        'show_display_link': ppt_request and ppt_request.display_file and ppt_request.status == 'completed',
+        # 슬라이드 미리보기 (전체 파일을 내려받지 않고 확인)
+        'thumbnail_urls': [default_storage.url(name) for name in ppt_request.thumbnails] if ppt_request and ppt_request.status == 'completed' else [],
     }
 
     return render(request, 'core/home.html', context)
@@ -319,12 +326,13 @@ def ppt_creation_start_view(request):
         worship_info=worship_info,
         defaults={'requested_by': request.user, 'status': 'pending', 'progress_message': 'PPT 제작 대기 중'}
     )
-    # 이미 존재하는데 상태가 'processing' 또는 'completed'이면 중복 요청 방지
-    if not created and ppt_request.status in ['processing', 'completed']:
-        messages.warning(request, "이미 PPT 제작이 진행 중이거나 완료되었습니다.")
+    # 이미 존재하는데 상태가 'processing'이면 중복 요청 방지
+    if not created and ppt_request.status == 'processing':
+        messages.warning(request, "이미 PPT 제작이 진행 중입니다.")
         return redirect('home')
     
     # 이전 요청이 실패했거나, 정보 누락으로 대기 중이었다면 상태를 'pending'으로 업데이트
+    # 'completed'는 그대로 두어 다운로드가 가능하고, POST로 다시 제작하면 이전 슬라이드 플랜과 비교해 바뀐 슬라이드만 다시 만듭니다.
     if not created and ppt_request.status in ['failed', 'no_song_info', 'no_worship_info']:
         ppt_request.status = 'pending'
         ppt_request.progress_message = "PPT 제작을 다시 요청할 수 있습니다."
@@ -369,14 +377,14 @@ def ppt_download_view(request, ppt_request_id):
         messages.error(request, "다운로드할 PPT 파일이 없거나, 아직 제작 완료되지 않았습니다.")
         return redirect('home')
 
-    file_path = ppt_request.generated_ppt_file.path
-    if default_storage.exists(file_path):
+    file_name = ppt_request.generated_ppt_file.name # 저장소 기준 이름 (로컬 경로가 아님)
+    if default_storage.exists(file_name):
         from django.http import FileResponse
         try:
-            response = FileResponse(default_storage.open(file_path, 'rb'), 
+            response = FileResponse(default_storage.open(file_name, 'rb'), 
                                     content_type='application/vnd.openxmlformats-officedocument.presentationml.presentation')
             # 파일명을 UTF-8로 인코딩하여 한글 파일명 지원
-            encoded_filename = os.path.basename(file_path).encode('utf-8').decode('latin-1')
+            encoded_filename = os.path.basename(file_name).encode('utf-8').decode('latin-1')
             response['Content-Disposition'] = f'attachment; filename="{encoded_filename}"'
             return response
         except Exception as e:
@@ -404,6 +412,12 @@ def ppt_task_status_api(request, task_id):
         download_url = None
         if ppt_request.status == 'completed' and ppt_request.generated_ppt_file:
             download_url = ppt_request.generated_ppt_file.url
+        handout_url = None
+        if ppt_request.status == 'completed' and ppt_request.handout_file:
+            handout_url = ppt_request.handout_file.url
+        display_url = None
+        if ppt_request.status == 'completed' and ppt_request.display_file:
+            display_url = ppt_request.display_file.url
 
         # JSON 응답 데이터 구성
         data = {
@@ -411,6 +425,8 @@ def ppt_task_status_api(request, task_id):
             'status_display': ppt_request.get_status_display(),
             'progress_message': ppt_request.progress_message,
             'download_url': download_url,
+            'handout_url': handout_url,
+            'display_url': display_url,
             'task_id': task_id,
         }
         return JsonResponse(data)
@@ -418,4 +434,42 @@ def ppt_task_status_api(request, task_id):
     except PptRequest.DoesNotExist:
         return JsonResponse({'status': 'not_found', 'message': '해당 PPT 제작 요청을 찾을 수 없습니다.'}, status=404)
     except Exception as e:
-        return JsonResponse({'status': 'error', 'message': f'오류 발생: {e}'}, status=500)
\ No newline at end of file
+        return JsonResponse({'status': 'error', 'message': f'오류 발생: {e}'}, status=500)
+
+
+@login_required
+def bible_search_api(request):
+    """
+    성경 본문 검색 API. GET q(검색어), mode(prefix|phrase), limit(최대 결과 수)
+    미리 만든 FTS5 색인(build_bible_search_index)만 조회하며 텍스트 파일은 읽지 않습니다.
+    """
+    query = request.GET.get('q', '').strip()
+    mode = request.GET.get('mode', SEARCH_MODE_PREFIX)
+    if not query:
+        return JsonResponse({'status': 'error', 'message': '검색어(q)를 입력해주세요.'}, status=400)
+    if mode not in SEARCH_MODES:
+        return JsonResponse({'status': 'error', 'message': f"검색 방식(mode)은 {', '.join(SEARCH_MODES)} 중 하나여야 합니다."}, status=400)
+    try:
+        limit = min(int(request.GET.get('limit', 20)), MAX_SEARCH_RESULTS)
+    except ValueError:
+        return JsonResponse({'status': 'error', 'message': '결과 수(limit)는 숫자여야 합니다.'}, status=400)
+
+    results = search_bible(BIBLE_SEARCH_INDEX_PATH, query, mode=mode, limit=limit)
+    if results is None:
+        return JsonResponse({'status': 'error', 'message': '성경 검색 색인이 없습니다. build_bible_search_index를 먼저 실행해주세요.'}, status=503)
+    return JsonResponse({'status': 'ok', 'query': query, 'mode': mode, 'count': len(results), 'results': results})
+
+
+@login_required
+def bible_book_suggest_api(request):
+    """
+    성경책 이름 자동 완성 API. GET q(입력 중인 책 이름/약어/영어 이름)
+    예: q=요한 -> 요한복음, 요한일서, 요한이서, 요한삼서, 요한계시록
+    """
+    query = request.GET.get('q', '').strip()
+    books = suggest_books(query, limit=10) if query else []
+    return JsonResponse({
+        'status': 'ok',
+        'query': query,
+        'books': [{'name': book, 'abbreviation': book_abbreviation(book)} for book in books],
+    })
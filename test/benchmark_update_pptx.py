@@ -0,0 +1,185 @@
+# tests/benchmark_update_pptx.py
+
+# utils.update_pptx 렌더링 성능 벤치마크.
+# 저장소에 없는 실제 템플릿 대신 합성 템플릿(슬라이드 40/400/4000장, 이미지 포함/미포함)을 만들어
+# 템플릿 로드, edit_text_field, add_lyrics_slides, add_ads_slides, add_bible_slides, save_presentation을
+# 각각 측정하고 경과 시간과 최대 메모리(peak RSS)를 JSON으로 기록합니다.
+# 저장은 python-pptx 기본 저장과 압축 수준별 저장(미디어는 STORED, XML만 deflate)을 비교해 크기/시간을 기록합니다.
+#
+# 측정 간 간섭을 막기 위해 각 경우(크기 x 이미지 여부)는 별도 프로세스에서 실행합니다.
+# pytest가 수집하지 않도록 파일 이름이 test_로 시작하지 않습니다.
+#
+# 사용법:
+#   python test/benchmark_update_pptx.py
+#   python test/benchmark_update_pptx.py --sizes 40 400 --output bench.json
+
+import argparse
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image
+from pptx import Presentation
+from pptx.util import Inches
+
+from utils.update_pptx import (
+    load_template, edit_text_field, add_lyrics_slides, add_ads_slides, add_bible_slides,
+    save_presentation, insert_slides_bulk,
+)
+
+DEFAULT_SIZES = (40, 400, 4000)
+DISTINCT_IMAGE_COUNT = 100 # 이미지 포함 템플릿의 서로 다른 이미지 수 (슬라이드마다 순환 배치)
+IMAGE_SIZE = (128, 128) # 압축되지 않는 무작위 픽셀 (장당 약 48KB)
+
+# 기본 템플릿의 역할 슬라이드 위치를 흉내 낸 측정 대상 인덱스
+LYRICS_TEMPLATE_INDEX = 6
+ADS_TEMPLATE_INDEX = 20
+BIBLE_TEMPLATE_INDEX = 22
+EDIT_SLIDE_INDICES = (0, 14, 15, 18, 21, 23, 37)
+ZIP_LEVELS = (1, 6, 9)
+
+LYRICS_PAGES = [f"가사 {i}줄\n두 번째 줄" for i in range(30)]
+ADS = [{"title": f"광고 {i}", "contents": f"광고 내용 {i}"} for i in range(5)]
+BIBLE = [{"title": f"요한복음 1:{i}", "contents": f"구절 {i} 본문"} for i in range(1, 21)]
+
+
+def peak_rss_mb() -> float:
+    # Linux에서 ru_maxrss 단위는 KB, macOS에서는 byte
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+
+def build_synthetic_template(path: str, slide_count: int, with_images: bool):
+    """제목 + 본문 레이아웃의 슬라이드 `slide_count`장 (선택적으로 이미지 포함)으로 템플릿을 만듭니다."""
+    prs = Presentation()
+    first_slide = prs.slides.add_slide(prs.slide_layouts[1])
+    first_slide.shapes.title.text = "slide 0"
+    insert_slides_bulk(prs, 0, [[{"new_text": f"slide {i}", "is_title": True}] for i in range(slide_count)])
+
+    if with_images:
+        images = []
+        for i in range(DISTINCT_IMAGE_COUNT):
+            buffer = io.BytesIO()
+            Image.frombytes("RGB", IMAGE_SIZE, os.urandom(IMAGE_SIZE[0] * IMAGE_SIZE[1] * 3)).save(buffer, "PNG")
+            images.append(buffer.getvalue())
+        for index, slide in enumerate(prs.slides):
+            slide.shapes.add_picture(io.BytesIO(images[index % DISTINCT_IMAGE_COUNT]), Inches(0.2), Inches(0.2), Inches(1))
+
+    prs.save(path)
+
+
+def run_case(template_path: str, output_path: str, zip_workers: int) -> dict:
+    """템플릿 하나에 대해 각 단계를 순서대로 측정합니다. 단계마다 누적 최대 메모리를 함께 기록합니다."""
+    operations = {}
+
+    def measure(name, func):
+        start = time.perf_counter()
+        result = func()
+        operations[name] = {"seconds": round(time.perf_counter() - start, 4), "peak_rss_mb": peak_rss_mb()}
+        return result
+
+    prs = measure("load_template", lambda: load_template(template_path))
+    measure("edit_text_field", lambda: [
+        edit_text_field(prs=prs, slide_index=slide_index, is_title=True, new_text=f"수정 {slide_index}")
+        for slide_index in EDIT_SLIDE_INDICES
+    ])
+    # 뒤쪽 슬라이드부터 추가해야 앞쪽 인덱스가 밀리지 않습니다.
+    measure("add_bible_slides", lambda: add_bible_slides(prs, BIBLE, BIBLE_TEMPLATE_INDEX))
+    measure("add_ads_slides", lambda: add_ads_slides(prs, ADS, ADS_TEMPLATE_INDEX))
+    measure("add_lyrics_slides", lambda: add_lyrics_slides(prs, LYRICS_TEMPLATE_INDEX, LYRICS_PAGES))
+    measure("save_presentation", lambda: save_presentation(prs, output_path))
+
+    # 압축 전략별 저장 크기/시간 비교 (같은 덱을 다시 저장)
+    zip_strategies = {"python-pptx": {"seconds": operations["save_presentation"]["seconds"], "bytes": os.path.getsize(output_path)}}
+    for level in ZIP_LEVELS:
+        strategy_path = f"{output_path}.zip{level}"
+        start = time.perf_counter()
+        save_presentation(prs, strategy_path, zip_level=level, zip_workers=zip_workers)
+        zip_strategies[f"level_{level}"] = {
+            "seconds": round(time.perf_counter() - start, 4),
+            "bytes": os.path.getsize(strategy_path),
+        }
+
+    return {"operations": operations, "output_bytes": os.path.getsize(output_path), "zip_strategies": zip_strategies}
+
+
+def run_case_in_subprocess(slide_count: int, with_images: bool, work_dir: str, zip_workers: int) -> dict:
+    case_name = f"{slide_count}_{'images' if with_images else 'text'}"
+    template_path = os.path.join(work_dir, f"template_{case_name}.pptx")
+    output_path = os.path.join(work_dir, f"output_{case_name}.pptx")
+
+    start = time.perf_counter()
+    build_synthetic_template(template_path, slide_count, with_images)
+    build_seconds = round(time.perf_counter() - start, 2)
+
+    completed = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--zip-workers", str(zip_workers), "--run-case", template_path, output_path],
+        capture_output=True, text=True, check=True,
+    )
+    case_result = json.loads(completed.stdout.strip().splitlines()[-1]) # update_pptx의 print 출력 이후 마지막 줄
+    return {
+        "case": case_name,
+        "slide_count": slide_count,
+        "with_images": with_images,
+        "template_bytes": os.path.getsize(template_path),
+        "template_build_seconds": build_seconds,
+        **case_result,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="utils.update_pptx benchmark with synthetic templates")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="템플릿 슬라이드 수")
+    parser.add_argument("--output", default="benchmark_update_pptx.json", help="결과 JSON 파일 경로")
+    parser.add_argument("--zip-workers", type=int, default=4, help="압축 수준별 저장에 사용할 압축 스레드 수")
+    parser.add_argument("--run-case", nargs=2, metavar=("TEMPLATE", "OUTPUT"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        # 하위 프로세스: 한 경우만 측정하고 결과 JSON을 마지막 줄에 출력
+        print(json.dumps(run_case(*args.run_case, zip_workers=args.zip_workers)))
+        return
+
+    work_dir = tempfile.mkdtemp(prefix="benchmark_update_pptx_")
+    results = []
+    try:
+        for slide_count in args.sizes:
+            for with_images in (False, True):
+                result = run_case_in_subprocess(slide_count, with_images, work_dir, args.zip_workers)
+                results.append(result)
+                summary = ", ".join(f"{name} {op['seconds']}s" for name, op in result["operations"].items())
+                print(f"[{result['case']}] {summary} (peak {result['operations']['save_presentation']['peak_rss_mb']}MB)")
+                zip_summary = ", ".join(
+                    f"{name} {strategy['seconds']}s/{strategy['bytes'] // 1024}KB"
+                    for name, strategy in result["zip_strategies"].items()
+                )
+                print(f"[{result['case']}] save: {zip_summary}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+    }
+    with open(args.output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"Benchmark results saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
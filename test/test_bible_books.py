@@ -0,0 +1,54 @@
+# tests/test_bible_books.py
+
+import os
+import sys
+import unittest
+from unittest.mock import Mock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# bible_text_parser는 settings.BASE_DIR만 사용하므로 Django 설정 없이 모킹합니다. (test_bible_parser_local과 동일)
+if 'utils.bible_text_parser' not in sys.modules:
+    sys.modules['django.conf'] = Mock(settings=Mock(BASE_DIR=project_root))
+
+from utils.bible_books import BOOK_NAME_TABLE, match_book_prefix, resolve_book_name, suggest_books
+from utils.bible_text_parser import BIBLE_FILE_MAP
+from utils.scripture_reference import parse_scripture_reference, ScriptureReferenceError
+
+
+class TestBibleBooks(unittest.TestCase):
+
+    def test_table_matches_bible_files(self):
+        self.assertEqual(list(BOOK_NAME_TABLE), list(BIBLE_FILE_MAP))
+
+    def test_resolves_longest_prefix(self):
+        self.assertEqual(match_book_prefix("요 3:16"), ("요한복음", 1))
+        self.assertEqual(match_book_prefix("요한 복음 3:16"), ("요한복음", 5))
+        self.assertEqual(match_book_prefix("요일 1:9"), ("요한일서", 2))
+        self.assertEqual(match_book_prefix("1 Jn. 1:9"), ("요한일서", 4))
+        self.assertEqual(match_book_prefix("Philemon 1"), ("빌레몬서", 8)) # "Phil"(빌립보서)보다 긴 이름
+        self.assertEqual(match_book_prefix("28"), (None, 0))
+        self.assertEqual(resolve_book_name("사무엘 상"), "사무엘상")
+        self.assertEqual(resolve_book_name("JOHN"), "요한복음")
+        self.assertIsNone(resolve_book_name("요한"))
+
+    def test_suggests_books_under_prefix(self):
+        self.assertEqual(suggest_books("요한"), ["요한복음", "요한일서", "요한이서", "요한삼서", "요한계시록"])
+        self.assertEqual(suggest_books("고린도", limit=1), ["고린도전서"])
+        self.assertEqual(suggest_books("없는책"), [])
+
+    def test_reference_parser_uses_resolver(self):
+        self.assertEqual(
+            [verse_range["book"] for verse_range in parse_scripture_reference("요한 복음 3:16; Jn 3:17; 1 Cor. 13; 계시록 22:20")],
+            ["요한복음", "요한복음", "고린도전서", "요한계시록"],
+        )
+        with self.assertRaises(ScriptureReferenceError) as context:
+            parse_scripture_reference("요한 3:16")
+        self.assertIn("요한일서", str(context.exception)) # 후보 추천
+
+
+if __name__ == "__main__":
+    unittest.main()
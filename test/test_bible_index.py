@@ -0,0 +1,120 @@
+# tests/test_bible_index.py
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch, Mock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# bible_text_parser는 settings.BASE_DIR만 사용하므로 Django 설정 없이 모킹합니다. (test_bible_parser_local과 동일)
+if 'utils.bible_text_parser' not in sys.modules:
+    sys.modules['django.conf'] = Mock(settings=Mock(BASE_DIR=project_root))
+
+from utils import bible_text_parser
+from utils.bible_index import BibleIndex, build_bible_index
+
+SAMPLE_BIBLE_CONTENT = """창1:1 <천지 창조> 태초에 하나님이 천지를 창조하시니라
+창1:2 땅이 혼돈하고 공허하며 흑암이 깊음 위에 있고 하나님의 영은 수면 위에 운행하시니라
+창1:3 하나님이 이르시되 빛이 있으라 하시니 빛이 있었고
+창1:5 하나님이 빛을 낮이라 부르시고 어둠을 밤이라 부르시니라
+창2:1 천지와 만물이 다 이루어지니라
+창2:2 하나님이 그가 하시던 일을 일곱째 날에 마치시니
+"""
+SAMPLE_FILE_MAP = {"창세기": "1-01창세기.txt"}
+
+
+class TestBibleIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.book_path = os.path.join(self.temp_dir, SAMPLE_FILE_MAP["창세기"])
+        with open(self.book_path, "w", encoding="EUC-KR") as f:
+            f.write(SAMPLE_BIBLE_CONTENT)
+        self.index_path = os.path.join(self.temp_dir, "bible_index.bin")
+        result = build_bible_index(self.temp_dir, SAMPLE_FILE_MAP, self.index_path)
+        self.assertEqual((result["books"], result["chapters"], result["verses"]), (1, 2, 6))
+
+    def test_slices_ranges_without_section_titles(self):
+        index = BibleIndex(self.index_path)
+        self.addCleanup(index.close)
+
+        self.assertEqual(index.get_range("창세기", 1, 1, 1, 1), [
+            {"title": "창세기 1:1", "contents": "태초에 하나님이 천지를 창조하시니라"},
+        ])
+        # 장을 넘는 범위, 빠진 절(1:4)은 건너뜀
+        self.assertEqual(
+            [verse["title"] for verse in index.get_range("창세기", 1, 3, 2, 1)],
+            ["창세기 1:3", "창세기 1:5", "창세기 2:1"],
+        )
+        # 장 마지막 절에서 끝나는 범위는 다음 장을 포함하지 않음
+        self.assertEqual(len(index.get_range("창세기", 1, 1, 1, 5)), 4)
+        self.assertEqual(index.chapter_verse_numbers("창세기", 2), [1, 2])
+        self.assertEqual(index.get_range("창세기", 3, 1, 3, 5), [])
+        self.assertEqual(index.get_range("창세기", 1, 5, 1, 3), [])
+
+    def test_get_bible_contents_uses_current_index_only(self):
+        with patch.object(bible_text_parser, "BIBLE_TEXT_DIR", self.temp_dir), \
+                patch.object(bible_text_parser, "BIBLE_INDEX_PATH", self.index_path), \
+                patch.object(bible_text_parser, "load_parsed_book", wraps=bible_text_parser.load_parsed_book) as load_book:
+            verses = bible_text_parser.get_bible_contents("창세기", 2, 1, 2, 2)
+            self.assertEqual([verse["title"] for verse in verses], ["창세기 2:1", "창세기 2:2"])
+            load_book.assert_not_called()
+
+            # 색인을 만든 뒤 책 파일이 바뀌면 텍스트 파일을 파싱해 읽음
+            with open(self.book_path, "a", encoding="EUC-KR") as f:
+                f.write("창2:3 하나님이 그 일곱째 날을 복되게 하사\n")
+            verses = bible_text_parser.get_bible_contents("창세기", 2, 1, 2, 3)
+            self.assertEqual(len(verses), 3)
+            load_book.assert_called_once()
+
+
+class TestParsedBookCache(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        self.book_path = os.path.join(self.temp_dir, SAMPLE_FILE_MAP["창세기"])
+        with open(self.book_path, "w", encoding="EUC-KR") as f:
+            f.write(SAMPLE_BIBLE_CONTENT)
+        bible_text_parser.clear_book_cache()
+        bible_text_parser.reset_book_cache_stats()
+        self.addCleanup(bible_text_parser.clear_book_cache)
+
+    def get(self, *verse_range):
+        with patch.object(bible_text_parser, "BIBLE_TEXT_DIR", self.temp_dir), \
+                patch.object(bible_text_parser, "BIBLE_INDEX_PATH", os.path.join(self.temp_dir, "missing.bin")):
+            return bible_text_parser.get_bible_contents("창세기", *verse_range)
+
+    def test_reuses_parsed_book_until_file_changes(self):
+        self.assertEqual([verse["title"] for verse in self.get(1, 3, 2, 1)], ["창세기 1:3", "창세기 1:5", "창세기 2:1"])
+        self.assertEqual(len(self.get(1, 1, 1, 5)), 4) # 장 마지막 절에서 끝나는 범위
+        self.assertEqual(bible_text_parser.BOOK_CACHE_STATS, {"hits": 1, "misses": 1, "evictions": 0, "invalidations": 0})
+
+        with open(self.book_path, "a", encoding="EUC-KR") as f:
+            f.write("창2:3 하나님이 그 일곱째 날을 복되게 하사\n")
+        self.assertEqual(len(self.get(2, 1, 2, 3)), 3)
+        self.assertEqual(bible_text_parser.BOOK_CACHE_STATS["invalidations"], 1)
+
+    def test_evicts_least_recently_used_books(self):
+        other_path = os.path.join(self.temp_dir, "other.txt")
+        with open(other_path, "w", encoding="EUC-KR") as f:
+            f.write(SAMPLE_BIBLE_CONTENT.replace("창", "출"))
+
+        with patch.object(bible_text_parser, "BOOK_CACHE_MAX_BYTES", 1):
+            bible_text_parser.load_parsed_book("창세기", self.book_path)
+            bible_text_parser.load_parsed_book("출애굽기", other_path)
+            info = bible_text_parser.get_book_cache_info()
+        self.assertEqual((info["books"], info["evictions"]), (1, 1)) # 한도를 넘으면 가장 최근 책만 남음
+        bible_text_parser.load_parsed_book("출애굽기", other_path)
+        self.assertEqual(bible_text_parser.BOOK_CACHE_STATS["hits"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
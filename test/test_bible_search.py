@@ -0,0 +1,58 @@
+# tests/test_bible_search.py
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import Mock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# bible_text_parser는 settings.BASE_DIR만 사용하므로 Django 설정 없이 모킹합니다. (test_bible_parser_local과 동일)
+if 'utils.bible_text_parser' not in sys.modules:
+    sys.modules['django.conf'] = Mock(settings=Mock(BASE_DIR=project_root))
+
+from utils.bible_search import build_bible_search_index, build_match_query, search_bible
+from test_bible_index import SAMPLE_BIBLE_CONTENT, SAMPLE_FILE_MAP
+
+
+class TestBibleSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        with open(os.path.join(self.temp_dir, SAMPLE_FILE_MAP["창세기"]), "w", encoding="EUC-KR") as f:
+            f.write(SAMPLE_BIBLE_CONTENT)
+        self.index_path = os.path.join(self.temp_dir, "bible_search.sqlite3")
+        result = build_bible_search_index(self.temp_dir, SAMPLE_FILE_MAP, self.index_path)
+        self.assertEqual((result["books"], result["verses"]), (1, 6))
+
+    def titles(self, query, mode="prefix"):
+        return [verse["title"] for verse in search_bible(self.index_path, query, mode=mode)]
+
+    def test_prefix_and_phrase_search(self):
+        # 조사가 붙은 단어도 접두어로 찾음 ("하나님" -> "하나님이", "하나님의")
+        self.assertEqual(sorted(self.titles("하나님 빛")), ["창세기 1:3", "창세기 1:5"])
+        self.assertEqual(self.titles("빛이 있으라", mode="phrase"), ["창세기 1:3"])
+        self.assertEqual(self.titles("있으라 빛이", mode="phrase"), [])
+        # 섹션 제목(<천지 창조>)은 색인하지 않음
+        self.assertEqual(self.titles("창조"), ["창세기 1:1"])
+        self.assertEqual(search_bible(self.index_path, "태초")[0], {
+            "book": "창세기", "chapter": 1, "verse": 1, "title": "창세기 1:1",
+            "contents": "태초에 하나님이 천지를 창조하시니라",
+        })
+
+    def test_query_syntax_is_not_passed_through(self):
+        self.assertEqual(build_match_query('빛 "OR* (밤'), '"빛" * AND "OR" * AND "밤" *')
+        self.assertEqual(self.titles('"*()'), [])
+        self.assertIsNone(search_bible(os.path.join(self.temp_dir, "missing.sqlite3"), "빛"))
+        with self.assertRaises(ValueError):
+            search_bible(self.index_path, "빛", mode="regex")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+# tests/test_deck_delta.py
+
+import io
+import json
+import os
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+
+from utils.ooxml_renderer import patch_deck_ooxml
+from utils.slide_plan import build_slide_plan, diff_slide_plans, build_change_report
+from utils.update_pptx import render_slide_plan
+from test_slide_plan import (
+    TEMPLATE_SLIDE_COUNT, MOCK_WORSHIP_INFO, MOCK_SONGS, MOCK_ENDING_SONG, MOCK_ADS, MOCK_BIBLE,
+    make_synthetic_template, slide_texts, build_plan,
+)
+
+
+def build_fixed_plan() -> list:
+    """첫 찬양 두 번째 가사 페이지의 오타만 고친 플랜"""
+    songs = [dict(song) for song in MOCK_SONGS]
+    songs[0]["splitted_lyrics"] = ["1-1", "1-2 (수정)", "1-3"]
+    return build_slide_plan(
+        template_slide_count=TEMPLATE_SLIDE_COUNT,
+        sunday_text="2025년 6월 다섯째주",
+        worship_info=MOCK_WORSHIP_INFO,
+        songs_data=songs,
+        ending_song_data=MOCK_ENDING_SONG,
+        ads_list=MOCK_ADS,
+        bible_contents=MOCK_BIBLE,
+    )
+
+
+class TestDeckDelta(unittest.TestCase):
+
+    def setUp(self):
+        self.template = io.BytesIO()
+        make_synthetic_template().save(self.template)
+        # 이전 플랜은 PptRequest에 JSON으로 저장되었다가 다시 읽힌 것
+        self.previous_plan = json.loads(json.dumps(build_plan()))
+        self.plan = build_fixed_plan()
+
+    def render_bytes(self, plan: list, engine: str) -> bytes:
+        output = io.BytesIO()
+        self.template.seek(0)
+        render_slide_plan(self.template, plan, output, engine=engine)
+        return output.getvalue()
+
+    def patch_bytes(self, previous_deck: bytes, positions: list) -> bytes:
+        output = io.BytesIO()
+        self.template.seek(0)
+        patch_deck_ooxml(self.template, io.BytesIO(previous_deck), self.plan, positions, output)
+        return output.getvalue()
+
+    def test_diff_reports_changed_slides_only(self):
+        positions = diff_slide_plans(self.previous_plan, self.plan)
+        self.assertEqual(len(positions), 1)
+
+        report = build_change_report(self.previous_plan, self.plan, positions)
+        self.assertEqual(report[0]["role"], "lyrics")
+        self.assertEqual(report[0]["before"], ["1-2"])
+        self.assertEqual(report[0]["after"], ["1-2 (수정)"])
+
+        self.assertEqual(diff_slide_plans(self.previous_plan, self.previous_plan), [])
+        # 가사 페이지 수가 바뀌면 슬라이드 구성이 달라지므로 부분 수정할 수 없음
+        self.assertIsNone(diff_slide_plans(self.previous_plan, build_plan()[:-1]))
+        self.assertIsNone(diff_slide_plans([], self.plan))
+
+    def test_patch_matches_full_ooxml_render(self):
+        previous_deck = self.render_bytes(self.previous_plan, "ooxml")
+        patched = self.patch_bytes(previous_deck, diff_slide_plans(self.previous_plan, self.plan))
+        self.assertEqual(patched, self.render_bytes(self.plan, "ooxml"))
+
+    def test_patch_python_pptx_deck(self):
+        previous_deck = self.render_bytes(self.previous_plan, "python-pptx")
+        patched = self.patch_bytes(previous_deck, diff_slide_plans(self.previous_plan, self.plan))
+        expected = Presentation(io.BytesIO(self.render_bytes(self.plan, "python-pptx")))
+        self.assertEqual(slide_texts(Presentation(io.BytesIO(patched))), slide_texts(expected))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+# tests/test_deck_fingerprint.py
+
+import os
+import sys
+import unittest
+from datetime import date
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.deck_fingerprint import compute_deck_fingerprint, short_fingerprint, has_placeholder_lyrics
+
+
+def make_inputs(**overrides) -> dict:
+    inputs = {
+        "template_version": {"id": 1, "updated_at": "2025-06-01T00:00:00+09:00"},
+        "worship_fields": {"worship_date": date(2025, 6, 29), "sermon_title": "하나님의 사랑"},
+        "songs": [
+            {"order": 1, "title": "첫 찬양", "lyrics_pages": ["1-1", "1-2"]},
+            {"order": 2, "title": "둘째 찬양", "lyrics_pages": ["2-1"]},
+        ],
+        "announcements": [{"title": "광고1", "contents": "내용1"}],
+        "bible_contents": [{"title": "요한복음 1:1", "contents": "태초에 말씀이 계시니라"}],
+    }
+    inputs.update(overrides)
+    return inputs
+
+
+class TestDeckFingerprint(unittest.TestCase):
+
+    def test_same_inputs_same_fingerprint(self):
+        first = compute_deck_fingerprint(**make_inputs())
+        second = compute_deck_fingerprint(**make_inputs())
+        self.assertEqual(first, second)
+        self.assertEqual(len(first), 64)
+        self.assertEqual(short_fingerprint(first), first[:12])
+
+    def test_dict_key_order_is_ignored(self):
+        reordered = make_inputs(worship_fields={"sermon_title": "하나님의 사랑", "worship_date": date(2025, 6, 29)})
+        self.assertEqual(compute_deck_fingerprint(**make_inputs()), compute_deck_fingerprint(**reordered))
+
+    def test_content_changes_change_fingerprint(self):
+        base = compute_deck_fingerprint(**make_inputs())
+        songs_swapped = make_inputs()["songs"][::-1]
+        variants = [
+            make_inputs(template_version={"id": 1, "updated_at": "2025-06-02T00:00:00+09:00"}),
+            make_inputs(songs=songs_swapped),
+            make_inputs(announcements=[]),
+            make_inputs(bible_contents=[{"title": "요한복음 1:1", "contents": "태초에"}]),
+        ]
+        for variant in variants:
+            self.assertNotEqual(base, compute_deck_fingerprint(**variant))
+
+    def test_placeholder_lyrics_are_not_cacheable(self):
+        """크롤링/분할 실패 문구로 만든 입력은 지문을 저장하지 않아 다음 요청에서 다시 시도해야 합니다."""
+        song = {"order": 1, "title": "첫 찬양", "lyrics": "주 하나님 지으신 모든 세계", "lyrics_pages": ["1-1", "1-2"]}
+        self.assertFalse(has_placeholder_lyrics([song]))
+        variants = [
+            dict(song, lyrics="", lyrics_pages=["가사를 가져올 수 없습니다."]), # 크롤링 실패
+            dict(song, lyrics="가사 크롤링 중 네트워크 오류 발생: timeout"), # 실패 메시지가 가사로 저장된 경우
+            dict(song, lyrics_pages=["가사 분할 중 오류 발생."]),
+            dict(song, lyrics_pages=[]),
+        ]
+        for variant in variants:
+            self.assertTrue(has_placeholder_lyrics([song, variant]))
+
+
+if __name__ == "__main__":
+    unittest.main()
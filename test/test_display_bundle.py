@@ -0,0 +1,49 @@
+# tests/test_display_bundle.py
+
+import json
+import os
+import re
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.display_bundle import build_display_bundle, render_display_html
+from test_slide_plan import MOCK_SONGS, MOCK_ADS, build_plan
+
+
+class TestDisplayBundle(unittest.TestCase):
+
+    def test_slides_follow_plan_without_static_slides(self):
+        plan = build_plan()
+        slides = build_display_bundle(plan)["slides"]
+
+        self.assertEqual(len(slides), len([entry for entry in plan if entry["edits"]]))
+        self.assertNotIn("static", {slide["role"] for slide in slides})
+        song_slides = [slide for slide in slides if slide["section"] == "song:0"]
+        self.assertEqual(song_slides[0]["title"], MOCK_SONGS[0]["title"])
+        self.assertEqual([slide["body"] for slide in song_slides[1:]], MOCK_SONGS[0]["splitted_lyrics"])
+
+        ads = [slide for slide in slides if slide["role"] == "ads"]
+        self.assertEqual((ads[0]["title"], ads[0]["body"]), (MOCK_ADS[0]["title"], MOCK_ADS[0]["contents"]))
+        self.assertFalse(ads[0]["align_center"])
+
+    def test_html_embeds_bundle_safely(self):
+        plan = [{
+            "source_index": 0, "role": "ads", "section": "ads:0",
+            "edits": [{"new_text": "</script><b>공지</b>", "is_title": True}],
+        }]
+        bundle = build_display_bundle(plan, title="<주일>")
+        document = render_display_html(bundle)
+
+        self.assertIn("<title>&lt;주일&gt;</title>", document)
+        self.assertEqual(document.count("</script>"), 2) # 번들 데이터가 태그를 닫지 않음
+        embedded = re.search(r'id="slides-data">(.*?)</script>', document, re.S).group(1)
+        self.assertEqual(json.loads(embedded), bundle)
+
+
+if __name__ == "__main__":
+    unittest.main()
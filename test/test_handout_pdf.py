@@ -0,0 +1,66 @@
+# tests/test_handout_pdf.py
+
+import io
+import os
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from utils.handout_pdf import (
+    build_handout_sections, render_handout_pdf, clear_handout_cache, reset_handout_cache_stats, HANDOUT_CACHE_STATS,
+)
+from utils.text_fit import configure_text_fit, MissingFontError
+from test_slide_plan import MOCK_SONGS, MOCK_ENDING_SONG, MOCK_BIBLE, build_plan
+from test_text_fit import use_hangul_font
+
+
+class TestHandoutPdf(unittest.TestCase):
+
+    def setUp(self):
+        clear_handout_cache()
+        reset_handout_cache_stats()
+
+    def test_sections_follow_plan_order(self):
+        sections = build_handout_sections(build_plan())
+
+        self.assertEqual([section["heading"] for section in sections], [
+            MOCK_SONGS[0]["title"], MOCK_SONGS[1]["title"], "요한복음 1:1-1:3", MOCK_ENDING_SONG["title"],
+        ])
+        self.assertEqual(sections[0]["paragraphs"], MOCK_SONGS[0]["splitted_lyrics"])
+        self.assertEqual(sections[2]["paragraphs"][0], f"{MOCK_BIBLE[0]['title']} {MOCK_BIBLE[0]['contents']}")
+
+    def test_pdf_pages_are_cached_per_section(self):
+        typeface = use_hangul_font(self)
+        output = io.BytesIO()
+        page_count = render_handout_pdf(build_plan(), output, title="2025년 6월 다섯째주", typeface=typeface)
+
+        self.assertEqual(page_count, 4) # 섹션마다 새 페이지
+        self.assertTrue(output.getvalue().startswith(b"%PDF"))
+        self.assertEqual(output.getvalue().count(b"/Type /Page\n"), 4)
+        self.assertEqual(HANDOUT_CACHE_STATS, {"hits": 0, "misses": 4})
+
+        render_handout_pdf(build_plan(), io.BytesIO(), typeface=typeface)
+        self.assertEqual(HANDOUT_CACHE_STATS, {"hits": 4, "misses": 4})
+
+    def test_long_section_continues_on_next_page(self):
+        typeface = use_hangul_font(self)
+        plan = [{
+            "source_index": 0, "role": "lyrics", "section": "song:0",
+            "edits": [{"new_text": "\n".join(f"가사 {line}" for line in range(80)), "is_title": False}],
+        }]
+        self.assertEqual(render_handout_pdf(plan, io.BytesIO(), typeface=typeface), 2)
+
+    def test_missing_hangul_font_writes_nothing(self):
+        configure_text_fit([])
+        output = io.BytesIO()
+        with self.assertRaises(MissingFontError):
+            render_handout_pdf(build_plan(), output)
+        self.assertEqual(output.getvalue(), b"")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,123 @@
+# tests/test_ooxml_renderer.py
+
+import io
+import multiprocessing
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+
+from utils.ooxml_renderer import SECTION_CACHE_STATS, get_template_slide_count, reset_section_cache_stats, clear_section_cache
+from utils.process_pool import can_use_process_pool
+from utils.update_pptx import render_slide_plan
+from test_slide_plan import TEMPLATE_SLIDE_COUNT, make_synthetic_template, slide_texts, build_plan
+
+
+def slide_snapshot(prs) -> list:
+    """슬라이드별 (레이아웃 이름, 도형별 (이름, 텍스트, 정렬)) 목록"""
+    return [
+        (
+            slide.slide_layout.name,
+            tuple(
+                (shape.name, shape.text_frame.text, tuple(p.alignment for p in shape.text_frame.paragraphs))
+                for shape in slide.shapes if shape.has_text_frame
+            ),
+        )
+        for slide in prs.slides
+    ]
+
+
+def _render_in_daemon(template_path: str, workers: int, results):
+    """Celery prefork 작업 프로세스처럼 데몬 프로세스 안에서 병렬 렌더링합니다."""
+    output = io.BytesIO()
+    render_slide_plan(template_path, build_plan(), output, engine="ooxml", workers=workers)
+    results.put((can_use_process_pool(workers, 2), output.getvalue()))
+
+
+class TestOoxmlRenderer(unittest.TestCase):
+
+    def setUp(self):
+        clear_section_cache()
+        self.template = io.BytesIO()
+        make_synthetic_template().save(self.template)
+
+    def render_bytes(self, engine: str) -> bytes:
+        output = io.BytesIO()
+        self.template.seek(0)
+        render_slide_plan(self.template, build_plan(), output, engine=engine)
+        return output.getvalue()
+
+    def render(self, engine: str):
+        return Presentation(io.BytesIO(self.render_bytes(engine)))
+
+    def test_template_slide_count(self):
+        self.assertEqual(get_template_slide_count(self.template), TEMPLATE_SLIDE_COUNT)
+
+    def test_engines_produce_same_slides(self):
+        expected = self.render("python-pptx")
+        actual = self.render("ooxml")
+
+        self.assertEqual(len(actual.slides), len(build_plan()))
+        self.assertEqual(slide_texts(actual), slide_texts(expected))
+        self.assertEqual(slide_snapshot(actual), slide_snapshot(expected))
+
+    def test_song_sections_are_reused_from_cache(self):
+        """같은 찬양 섹션을 다시 렌더링하면 캐시된 슬라이드 XML을 그대로 사용해야 합니다."""
+        reset_section_cache_stats()
+        first = self.render_bytes("ooxml")
+        # 찬양 2곡(제목+가사) + 결단 찬양(제목+가사) = 6개 섹션
+        self.assertEqual(SECTION_CACHE_STATS, {"hits": 0, "misses": 6})
+
+        reset_section_cache_stats()
+        second = self.render_bytes("ooxml")
+        self.assertEqual(SECTION_CACHE_STATS, {"hits": 6, "misses": 0})
+        self.assertEqual(second, first)
+
+    def test_parallel_rendering_is_byte_identical(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        template_path = os.path.join(temp_dir, "template.pptx")
+        with open(template_path, "wb") as f:
+            f.write(self.template.getvalue())
+
+        outputs = []
+        for workers in (1, 2):
+            clear_section_cache()
+            output = io.BytesIO()
+            render_slide_plan(template_path, build_plan(), output, engine="ooxml", workers=workers)
+            outputs.append(output.getvalue())
+        self.assertEqual(outputs[1], outputs[0])
+
+        # 데몬 프로세스(Celery 작업 프로세스)에서도 직렬로 대체되지 않고 병렬로 렌더링되어야 합니다.
+        results = multiprocessing.Queue()
+        daemon = multiprocessing.Process(target=_render_in_daemon, args=(template_path, 2, results), daemon=True)
+        daemon.start()
+        used_pool, daemon_output = results.get(timeout=120)
+        daemon.join()
+        self.assertTrue(used_pool)
+        self.assertEqual(daemon_output, outputs[0])
+
+    def test_engines_write_to_spooled_buffer(self):
+        """태스크는 경로 대신 SpooledTemporaryFile에 렌더링한 뒤 저장소로 넘깁니다."""
+        for engine in ("python-pptx", "ooxml"):
+            with tempfile.SpooledTemporaryFile(max_size=1024) as ppt_buffer:
+                self.template.seek(0)
+                render_slide_plan(self.template, build_plan(), ppt_buffer, engine=engine)
+                ppt_buffer.seek(0)
+                self.assertEqual(len(Presentation(ppt_buffer).slides), len(build_plan()))
+
+    def test_unknown_engine_raises(self):
+        with self.assertRaises(ValueError):
+            render_slide_plan(self.template, build_plan(), io.BytesIO(), engine="unknown")
+
+
+if __name__ == "__main__":
+    unittest.main()
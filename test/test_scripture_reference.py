@@ -0,0 +1,93 @@
+# tests/test_scripture_reference.py
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest.mock import patch, Mock
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+# bible_text_parser는 settings.BASE_DIR만 사용하므로 Django 설정 없이 모킹합니다. (test_bible_parser_local과 동일)
+if 'utils.bible_text_parser' not in sys.modules:
+    sys.modules['django.conf'] = Mock(settings=Mock(BASE_DIR=project_root))
+
+from utils import bible_text_parser
+from utils.bible_index import build_bible_index
+from utils.scripture_reference import parse_scripture_reference, ScriptureReferenceError
+from test_bible_index import SAMPLE_BIBLE_CONTENT
+
+
+def verse_range(book, begin_ch, begin_verse, end_ch, end_verse):
+    return {"book": book, "begin_ch": begin_ch, "begin_verse": begin_verse, "end_ch": end_ch, "end_verse": end_verse}
+
+
+class TestParseScriptureReference(unittest.TestCase):
+
+    def test_parses_lists_of_ranges(self):
+        self.assertEqual(parse_scripture_reference("요 3:16; 롬 8:1-5, 28; 시 23"), [
+            verse_range("요한복음", 3, 16, 3, 16),
+            verse_range("로마서", 8, 1, 8, 5),
+            verse_range("로마서", 8, 28, 8, 28), # 쉼표 뒤 숫자는 같은 장의 절
+            verse_range("시편", 23, 1, 23, None), # 장 전체
+        ])
+        # 기존 입력 형식
+        self.assertEqual(parse_scripture_reference("출애굽기 3:4 - 4:12"), [verse_range("출애굽기", 3, 4, 4, 12)])
+        self.assertEqual(parse_scripture_reference("요한복음 3:16-18"), [verse_range("요한복음", 3, 16, 3, 18)])
+        # 여러 장 전체, 쉼표 뒤 숫자는 장, 책 이름 생략
+        self.assertEqual(parse_scripture_reference("시 23-24, 100; 121:1"), [
+            verse_range("시편", 23, 1, 24, None),
+            verse_range("시편", 100, 1, 100, None),
+            verse_range("시편", 121, 1, 121, 1),
+        ])
+
+    def test_splits_cross_book_ranges(self):
+        self.assertEqual(parse_scripture_reference("신 34:5 - 삿 1:2"), [
+            verse_range("신명기", 34, 5, None, None),
+            verse_range("여호수아", 1, 1, None, None),
+            verse_range("사사기", 1, 1, 1, 2),
+        ])
+
+    def test_rejects_invalid_references(self):
+        for text in ("", "3:16", "없는책 1:1", "요 3:18-16", "요 4-3", "요 3:16-", "계 1 - 창 1", "요 0:1", "요 a:b"):
+            with self.subTest(text=text), self.assertRaises(ScriptureReferenceError):
+                parse_scripture_reference(text)
+
+
+class TestGetBibleRanges(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.temp_dir)
+        file_map = {"창세기": "1-01창세기.txt", "출애굽기": "1-02출애굽기.txt"}
+        with open(os.path.join(self.temp_dir, file_map["창세기"]), "w", encoding="EUC-KR") as f:
+            f.write(SAMPLE_BIBLE_CONTENT)
+        with open(os.path.join(self.temp_dir, file_map["출애굽기"]), "w", encoding="EUC-KR") as f:
+            f.write("출1:1 야곱과 함께 각각 자기 가족을 데리고 애굽에 이른 이스라엘 아들들의 이름은 이러하니\n")
+        self.index_path = os.path.join(self.temp_dir, "bible_index.bin")
+        build_bible_index(self.temp_dir, file_map, self.index_path)
+        bible_text_parser.clear_book_cache()
+        self.addCleanup(bible_text_parser.clear_book_cache)
+
+    def titles(self, reference, index_path):
+        with patch.object(bible_text_parser, "BIBLE_TEXT_DIR", self.temp_dir), \
+                patch.object(bible_text_parser, "BIBLE_INDEX_PATH", index_path):
+            return [verse["title"] for verse in bible_text_parser.get_bible_ranges(parse_scripture_reference(reference))]
+
+    def test_resolves_ranges_in_order_from_index_and_parsed_books(self):
+        for index_path in (self.index_path, os.path.join(self.temp_dir, "missing.bin")):
+            with self.subTest(index_path=index_path):
+                self.assertEqual(self.titles("창 2; 1:5; 1", index_path), [
+                    "창세기 2:1", "창세기 2:2", "창세기 1:5", "창세기 1:1", "창세기 1:2", "창세기 1:3", # 겹치는 절은 한 번만
+                ])
+                self.assertEqual(self.titles("창 2:2 - 출 1:1", index_path), ["창세기 2:2", "출애굽기 1:1"])
+                with self.assertRaises(ValueError):
+                    self.titles("창 3", index_path)
+
+
+if __name__ == "__main__":
+    unittest.main()
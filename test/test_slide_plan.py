@@ -0,0 +1,145 @@
+# tests/test_slide_plan.py
+
+import io
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+
+from utils.slide_plan import build_slide_plan, song_slot_capacity, SlidePlanError
+from utils.update_pptx import SHAPE_INDEX_STATS, reset_shape_index_stats, apply_slide_plan, insert_slides_bulk, edit_text_field, add_lyrics_slides, add_ads_slides, add_bible_slides
+
+TEMPLATE_SLIDE_COUNT = 38
+
+MOCK_WORSHIP_INFO = SimpleNamespace(
+    prayer_minister="김기도 목사",
+    offering_minister="박봉헌 장로",
+    ads_manager="최광고 집사",
+    sermon_scripture="요한복음 1:1-1:3",
+    sermon_title="하나님의 사랑",
+    benediction_minister="이축도 목사",
+)
+MOCK_SONGS = [
+    {"title": "첫 찬양", "splitted_lyrics": ["1-1", "1-2", "1-3"]},
+    {"title": "둘째 찬양", "splitted_lyrics": ["2-1", "2-2"]},
+]
+MOCK_ENDING_SONG = {"title": "결단 찬양", "splitted_lyrics": ["e-1", "e-2"]}
+MOCK_ADS = [{"title": "광고1", "contents": "내용1"}, {"title": "광고2", "contents": "내용2"}]
+MOCK_BIBLE = [
+    {"title": "요한복음 1:1", "contents": "태초에 말씀이 계시니라"},
+    {"title": "요한복음 1:2", "contents": "그가 태초에 하나님과 함께 계셨고"},
+    {"title": "요한복음 1:3", "contents": "만물이 그로 말미암아 지은 바 되었으니"},
+]
+
+
+def make_synthetic_template(slide_count: int = TEMPLATE_SLIDE_COUNT):
+    """제목 + 본문(Placeholder idx 1) 레이아웃으로 구성된 임시 템플릿을 만듭니다."""
+    prs = Presentation()
+    for i in range(slide_count):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"slide {i}"
+    return prs
+
+
+def slide_texts(prs) -> list:
+    return [
+        tuple(shape.text_frame.text for shape in slide.shapes if shape.has_text_frame)
+        for slide in prs.slides
+    ]
+
+
+def build_plan(template_slide_count: int = TEMPLATE_SLIDE_COUNT) -> list:
+    return build_slide_plan(
+        template_slide_count=template_slide_count,
+        sunday_text="2025년 6월 다섯째주",
+        worship_info=MOCK_WORSHIP_INFO,
+        songs_data=MOCK_SONGS,
+        ending_song_data=MOCK_ENDING_SONG,
+        ads_list=MOCK_ADS,
+        bible_contents=MOCK_BIBLE,
+    )
+
+
+class TestSlidePlan(unittest.TestCase):
+
+    def test_plan_is_ordered_without_rendering(self):
+        plan = build_plan()
+        added = (3 - 1) + (2 - 1) + (2 - 1) + (3 - 1) + (2 - 1)
+        self.assertEqual(len(plan), TEMPLATE_SLIDE_COUNT + added)
+
+        source_indices = [entry["source_index"] for entry in plan]
+        self.assertEqual(source_indices, sorted(source_indices))
+        self.assertEqual(plan[0]["role"], "cover")
+        self.assertEqual([e["edits"][0]["new_text"] for e in plan if e["source_index"] == 6], ["1-1", "1-2", "1-3"])
+        self.assertEqual(plan[1]["role"], "static")
+        self.assertEqual(plan[1]["edits"], [])
+
+    def test_apply_matches_cumulative_insertion(self):
+        """플랜 적용 결과가 기존의 누적 인덱스 방식과 같은 슬라이드 순서/내용이어야 합니다."""
+        expected_prs = make_synthetic_template()
+        edit_text_field(prs=expected_prs, slide_index=0, is_title=True, new_text="2025년 6월 다섯째주")
+        for slide_index, text in [(14, "김기도 목사"), (15, "박봉헌 장로"), (18, "최광고 집사"),
+                                  (21, "요한복음 1:1-1:3"), (23, "하나님의 사랑"), (37, "이축도 목사")]:
+            edit_text_field(prs=expected_prs, slide_index=slide_index, is_title=True, new_text=text)
+        cumulative = 0
+        for index, song in enumerate(MOCK_SONGS):
+            edit_text_field(prs=expected_prs, slide_index=5 + index * 2 + cumulative, is_title=True, new_text=song["title"])
+            cumulative += add_lyrics_slides(expected_prs, 6 + index * 2 + cumulative, song["splitted_lyrics"])["added_slide_count"]
+        cumulative += add_ads_slides(expected_prs, MOCK_ADS, 20 + cumulative)
+        cumulative += add_bible_slides(expected_prs, MOCK_BIBLE, 22 + cumulative)
+        edit_text_field(prs=expected_prs, slide_index=27 + cumulative, is_title=True, new_text=MOCK_ENDING_SONG["title"])
+        add_lyrics_slides(expected_prs, 28 + cumulative, MOCK_ENDING_SONG["splitted_lyrics"])
+
+        actual_prs = apply_slide_plan(make_synthetic_template(), build_plan())
+        self.assertEqual(slide_texts(actual_prs), slide_texts(expected_prs))
+
+    def test_shape_index_is_built_once_per_slide(self):
+        """슬라이드마다 도형 목록은 한 번만 순회하고, 같은 슬라이드의 추가 편집은 인덱스를 재사용해야 합니다."""
+        plan = build_plan()
+        edited_entries = [entry for entry in plan if entry["edits"]]
+        reset_shape_index_stats()
+        apply_slide_plan(make_synthetic_template(), plan)
+
+        self.assertEqual(SHAPE_INDEX_STATS["misses"], len(edited_entries))
+        self.assertEqual(SHAPE_INDEX_STATS["hits"], sum(len(entry["edits"]) - 1 for entry in edited_entries))
+
+    def test_too_many_songs_are_rejected(self):
+        """찬양 자리보다 찬양이 많으면 다른 역할의 슬라이드와 겹쳐 가사 페이지를 버리지 않고 오류를 냅니다."""
+        capacity = song_slot_capacity(None, TEMPLATE_SLIDE_COUNT)
+        self.assertEqual(capacity, 4) # 찬양 다섯 번째 가사 자리(14)는 대표기도 슬라이드
+        songs = [{"title": f"찬양 {i}", "splitted_lyrics": [f"{i}-1", f"{i}-2"]} for i in range(capacity + 1)]
+        with self.assertRaises(SlidePlanError):
+            build_slide_plan(
+                template_slide_count=TEMPLATE_SLIDE_COUNT,
+                sunday_text="2025년 6월 다섯째주",
+                worship_info=MOCK_WORSHIP_INFO,
+                songs_data=songs,
+            )
+
+
+class TestInsertSlidesBulk(unittest.TestCase):
+
+    def test_new_slides_are_spliced_after_template(self):
+        prs = make_synthetic_template(5)
+        payloads = [[{"new_text": f"page {i}", "is_title": True}] for i in range(4)]
+        result = insert_slides_bulk(prs, 2, payloads)
+
+        self.assertEqual(result["added_slide_count"], 3)
+        titles = [slide.shapes.title.text for slide in prs.slides]
+        self.assertEqual(titles, ["slide 0", "slide 1", "page 0", "page 1", "page 2", "page 3", "slide 3", "slide 4"])
+
+        buffer = io.BytesIO()
+        prs.save(buffer)
+        reopened = Presentation(io.BytesIO(buffer.getvalue()))
+        self.assertEqual([slide.shapes.title.text for slide in reopened.slides], titles)
+
+
+if __name__ == "__main__":
+    unittest.main()
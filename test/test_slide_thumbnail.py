@@ -0,0 +1,80 @@
+# tests/test_slide_thumbnail.py
+
+import io
+import os
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image
+from pptx.dml.color import RGBColor
+
+from utils.slide_thumbnail import render_deck_thumbnails
+from utils.text_fit import configure_text_fit, MissingFontError
+from test_slide_plan import make_synthetic_template
+from test_text_fit import use_hangul_font
+
+
+def make_deck(titles: list) -> io.BytesIO:
+    prs = make_synthetic_template(len(titles))
+    for slide, title in zip(prs.slides, titles):
+        slide.shapes.title.text = title
+    fill = prs.slides[0].background.fill
+    fill.solid()
+    fill.fore_color.rgb = RGBColor(0x10, 0x20, 0x30)
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+class TestSlideThumbnail(unittest.TestCase):
+
+    def test_renders_background_and_text(self):
+        typeface = use_hangul_font(self)
+        thumbnails = render_deck_thumbnails(make_deck(["첫 슬라이드", "둘째 슬라이드"]), width_px=160, fallback_typeface=typeface)
+
+        self.assertEqual(len(thumbnails), 2)
+        first = Image.open(io.BytesIO(thumbnails[0][1])).convert("RGB")
+        self.assertEqual(first.size, (160, 120)) # 기본 템플릿 4:3
+        self.assertEqual(first.getpixel((0, 0)), (0x10, 0x20, 0x30))
+        # 제목 글자가 배경 위에 그려짐 (어두운 배경이므로 밝은 글자)
+        self.assertGreater(len(first.getcolors(maxcolors=160 * 120)), 1)
+
+        second = Image.open(io.BytesIO(thumbnails[1][1])).convert("RGB")
+        self.assertEqual(second.getpixel((0, 0)), (255, 255, 255))
+
+    def test_cached_slides_are_not_rendered(self):
+        typeface = use_hangul_font(self)
+        first_keys = [key for key, _ in render_deck_thumbnails(make_deck(["가", "나"]), fallback_typeface=typeface)]
+        self.assertNotEqual(first_keys[0], first_keys[1])
+
+        cached = set(first_keys)
+        thumbnails = render_deck_thumbnails(make_deck(["가", "다"]), is_cached=cached.__contains__, fallback_typeface=typeface)
+        self.assertEqual(thumbnails[0], (first_keys[0], None)) # 바뀌지 않은 슬라이드는 다시 그리지 않음
+        self.assertNotIn(thumbnails[1][0], cached)
+        self.assertIsNotNone(thumbnails[1][1])
+
+    def test_hangul_is_drawn_as_glyphs(self):
+        """글자가 notdef 상자로 그려지면 서로 다른 한글 제목의 미리보기가 똑같아집니다."""
+        typeface = use_hangul_font(self)
+        (_, first), = render_deck_thumbnails(make_deck(["가나다"]), fallback_typeface=typeface)
+        (_, second), = render_deck_thumbnails(make_deck(["라마바"]), fallback_typeface=typeface)
+        self.assertNotEqual(
+            Image.open(io.BytesIO(first)).convert("L").tobytes(),
+            Image.open(io.BytesIO(second)).convert("L").tobytes(),
+        )
+
+    def test_font_without_hangul_is_not_used(self):
+        """한글을 그릴 수 있는 글꼴이 없으면 빈 상자로 그리지 않고 MissingFontError를 냅니다."""
+        configure_text_fit([])
+        with self.assertRaises(MissingFontError):
+            render_deck_thumbnails(make_deck(["첫 슬라이드"]), fallback_typeface="NanumGothic")
+
+
+if __name__ == "__main__":
+    unittest.main()
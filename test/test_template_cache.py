@@ -0,0 +1,60 @@
+# tests/test_template_cache.py
+
+import os
+import sys
+import shutil
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+
+from utils import update_pptx
+from utils.update_pptx import load_template_cached, TEMPLATE_CACHE_MAX_ENTRIES
+
+
+class TestTemplateCache(unittest.TestCase):
+
+    def setUp(self):
+        update_pptx._template_cache.clear()
+        self.temp_dir = tempfile.mkdtemp()
+        self.template_path = os.path.join(self.temp_dir, "template.pptx")
+        prs = Presentation()
+        for i in range(3):
+            slide = prs.slides.add_slide(prs.slide_layouts[1])
+            slide.shapes.title.text = f"원본 {i}"
+        prs.save(self.template_path)
+
+    def tearDown(self):
+        update_pptx._template_cache.clear()
+        shutil.rmtree(self.temp_dir)
+
+    def test_returns_private_copy(self):
+        """캐시에서 받은 사본을 수정해도 다음 작업의 사본에는 영향이 없어야 합니다."""
+        first = load_template_cached(self.template_path, 1, "v1")
+        first.slides[0].shapes.title.text = "수정됨"
+
+        second = load_template_cached(self.template_path, 1, "v1")
+        self.assertEqual(second.slides[0].shapes.title.text, "원본 0")
+        self.assertEqual(len(update_pptx._template_cache), 1)
+
+    def test_new_version_replaces_old_entry(self):
+        """updated_at이 바뀌면 같은 템플릿의 이전 캐시 항목은 제거되어야 합니다."""
+        load_template_cached(self.template_path, 1, "v1")
+        load_template_cached(self.template_path, 1, "v2")
+        self.assertEqual(list(update_pptx._template_cache), [(1, "v2")])
+
+    def test_unused_templates_are_evicted(self):
+        """비활성화/삭제된 템플릿은 최대 항목 수를 넘으면 오래된 순서로 밀려나야 합니다."""
+        for template_id in range(TEMPLATE_CACHE_MAX_ENTRIES + 1):
+            load_template_cached(self.template_path, template_id, "v1")
+        self.assertEqual(len(update_pptx._template_cache), TEMPLATE_CACHE_MAX_ENTRIES)
+        self.assertNotIn((0, "v1"), update_pptx._template_cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
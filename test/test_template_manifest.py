@@ -0,0 +1,70 @@
+# tests/test_template_manifest.py
+
+import io
+import os
+import sys
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+
+from utils.slide_plan import build_slide_plan, SLIDE_INDEX_PRAYER, SLIDE_INDEX_BIBLE_CONTENTS_TEMPLATE
+from utils.template_manifest import extract_template_manifest, is_manifest_current, TemplateManifestError
+from test_slide_plan import TEMPLATE_SLIDE_COUNT, MOCK_WORSHIP_INFO, MOCK_BIBLE, make_synthetic_template
+
+
+def to_file(prs) -> io.BytesIO:
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    buffer.seek(0)
+    return buffer
+
+
+class TestTemplateManifest(unittest.TestCase):
+
+    def test_extracts_roles(self):
+        manifest = extract_template_manifest(to_file(make_synthetic_template()))
+
+        self.assertTrue(is_manifest_current(manifest))
+        self.assertEqual(manifest["slide_count"], TEMPLATE_SLIDE_COUNT)
+        prayer = manifest["roles"]["prayer"]
+        self.assertEqual(prayer["slide_index"], SLIDE_INDEX_PRAYER)
+        self.assertTrue(prayer["has_title"])
+        self.assertEqual(prayer["placeholders"], [0, 1])
+        # 합성 템플릿에는 idx 10이 없으므로 유일한 본문 Placeholder(idx 1)를 사용
+        self.assertEqual(manifest["roles"]["bible_contents"]["ph_index"], 1)
+
+    def test_plan_uses_manifest_targets(self):
+        manifest = extract_template_manifest(to_file(make_synthetic_template()))
+        plan = build_slide_plan(
+            template_slide_count=0, # 매니페스트의 slide_count가 우선
+            sunday_text="2025년 6월 다섯째주",
+            worship_info=MOCK_WORSHIP_INFO,
+            songs_data=[],
+            bible_contents=MOCK_BIBLE,
+            manifest=manifest,
+        )
+        bible_entries = [entry for entry in plan if entry["source_index"] == SLIDE_INDEX_BIBLE_CONTENTS_TEMPLATE]
+        self.assertEqual(len(bible_entries), len(MOCK_BIBLE))
+        self.assertEqual(bible_entries[0]["edits"][1]["ph_index"], 1)
+        self.assertEqual(len(plan), TEMPLATE_SLIDE_COUNT + len(MOCK_BIBLE) - 1) # 성경 페이지만 추가됨
+
+    def test_rejects_mismatched_template(self):
+        prs = make_synthetic_template(20)
+        blank_slide = prs.slides[SLIDE_INDEX_PRAYER]
+        for shape in list(blank_slide.shapes):
+            shape.element.getparent().remove(shape.element)
+
+        with self.assertRaises(TemplateManifestError) as context:
+            extract_template_manifest(to_file(prs))
+        errors = "\n".join(context.exception.errors)
+        self.assertIn("'prayer'", errors)
+        self.assertIn("'benediction'", errors)
+
+
+if __name__ == "__main__":
+    unittest.main()
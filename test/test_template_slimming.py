@@ -0,0 +1,123 @@
+# tests/test_template_slimming.py
+
+import io
+import os
+import sys
+import unittest
+import zipfile
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from PIL import Image
+from pptx import Presentation
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls
+from pptx.util import Inches
+
+from utils.template_slimming import slim_template
+
+
+def png_bytes(size, color) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", size, color).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def media_names(pptx_bytes: bytes) -> list:
+    with zipfile.ZipFile(io.BytesIO(pptx_bytes)) as zip_file:
+        return sorted(name for name in zip_file.namelist() if name.startswith("ppt/media/"))
+
+
+def make_template(image: bytes, duplicate: bool = False) -> io.BytesIO:
+    """레이아웃 1번만 사용하는 슬라이드 3장. duplicate이면 세 번째 슬라이드의 이미지를 별도 파트로 복사합니다."""
+    prs = Presentation()
+    for i in range(3):
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = f"slide {i}"
+        slide.shapes.add_picture(io.BytesIO(image), Inches(1), Inches(1), Inches(1))
+    buffer = io.BytesIO()
+    prs.save(buffer)
+    if not duplicate:
+        buffer.seek(0)
+        return buffer
+
+    # python-pptx는 같은 이미지를 자동으로 합치므로, 저장된 패키지를 직접 고쳐 중복 상태를 재현합니다.
+    duplicated = io.BytesIO()
+    with zipfile.ZipFile(buffer) as source, zipfile.ZipFile(duplicated, "w", zipfile.ZIP_DEFLATED) as target:
+        for name in source.namelist():
+            data = source.read(name)
+            if name == "ppt/slides/_rels/slide3.xml.rels":
+                data = data.replace(b"../media/image1.png", b"../media/image2.png")
+            target.writestr(name, data)
+        target.writestr("ppt/media/image2.png", source.read("ppt/media/image1.png"))
+    duplicated.seek(0)
+    return duplicated
+
+
+class TestTemplateSlimming(unittest.TestCase):
+
+    def test_removes_unused_layouts_and_duplicate_media(self):
+        template = make_template(png_bytes((64, 64), "red"), duplicate=True)
+        self.assertEqual(len(media_names(template.getvalue())), 2)
+
+        optimized, report = slim_template(template)
+
+        self.assertEqual(report["deduplicated_media"], 1)
+        self.assertEqual(report["removed_layouts"], 10) # 기본 템플릿 레이아웃 11개 중 1개만 사용
+        self.assertEqual(len(media_names(optimized)), 1)
+        self.assertLess(report["optimized_bytes"], report["original_bytes"])
+
+        prs = Presentation(io.BytesIO(optimized))
+        self.assertEqual([slide.shapes.title.text for slide in prs.slides], ["slide 0", "slide 1", "slide 2"])
+        self.assertEqual(len(prs.slide_layouts), 1)
+
+    def test_downscale_is_optional(self):
+        large_image = png_bytes((4000, 4000), "blue") # 1인치(슬라이드 폭 10인치의 1/10)에 표시
+
+        _, report = slim_template(make_template(large_image))
+        self.assertEqual(report["downscaled_images"], 0)
+
+        optimized, report = slim_template(make_template(large_image), downscale_images=True, max_image_width_px=1000)
+        self.assertEqual(report["downscaled_images"], 1)
+        with zipfile.ZipFile(io.BytesIO(optimized)) as zip_file:
+            image = Image.open(io.BytesIO(zip_file.read(media_names(optimized)[0])))
+        self.assertEqual(image.size, (100, 100))
+
+
+    def downscale_with_layout_background(self, fill_xml: str) -> tuple:
+        """슬라이드에 1인치로 표시되는 이미지를 사용하는 레이아웃의 배경 그림으로도 쓰는 템플릿을 줄입니다."""
+        prs = Presentation(make_template(png_bytes((4000, 4000), "blue")))
+        layout = prs.slides[0].slide_layout
+        image_part = prs.slides[0].part.related_part(prs.slides[0].shapes[-1]._element.blip_rId)
+        rId = layout.part.relate_to(image_part, RT.IMAGE)
+        background = parse_xml(
+            f'<p:bg {nsdecls("p", "a", "r")}><p:bgPr><a:blipFill><a:blip r:embed="{rId}"/>{fill_xml}</a:blipFill>'
+            '<a:effectLst/></p:bgPr></p:bg>'
+        )
+        layout._element.cSld.insert(0, background)
+        template = io.BytesIO()
+        prs.save(template)
+        template.seek(0)
+
+        optimized, report = slim_template(template, downscale_images=True, max_image_width_px=1000)
+        with zipfile.ZipFile(io.BytesIO(optimized)) as zip_file:
+            image = Image.open(io.BytesIO(zip_file.read(media_names(optimized)[0])))
+        return report["downscaled_images"], image.size
+
+    def test_downscale_uses_largest_extent_across_parts(self):
+        """레이아웃 배경으로 슬라이드 전체에 늘여 쓰이는 이미지는 슬라이드 크기(1000x750px)보다 작아지면 안 됩니다."""
+        downscaled, size = self.downscale_with_layout_background("<a:stretch><a:fillRect/></a:stretch>")
+        self.assertEqual((downscaled, size), (1, (1000, 1000)))
+
+    def test_downscale_skips_unknown_extent(self):
+        """바둑판식(tile) 배경처럼 표시 크기를 알 수 없는 곳에 쓰인 이미지는 줄이지 않습니다."""
+        downscaled, size = self.downscale_with_layout_background('<a:tile tx="0" ty="0" sx="100000" sy="100000"/>')
+        self.assertEqual((downscaled, size), (0, (4000, 4000)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,121 @@
+# tests/test_template_tokens.py
+
+import io
+import os
+import sys
+import unittest
+from types import SimpleNamespace
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+from pptx.oxml import parse_xml
+from pptx.oxml.ns import nsdecls, qn
+from pptx.util import Pt
+
+from utils.slide_plan import build_slide_plan, SLIDE_INDEX_PRAYER
+from utils.template_manifest import extract_template_manifest, TemplateManifestError
+from utils.template_tokens import replace_tokens_in_element
+from utils.update_pptx import render_slide_plan
+from test_slide_plan import MOCK_WORSHIP_INFO, make_synthetic_template, slide_texts
+from test_template_manifest import to_file
+
+TOKEN_SLIDE_INDEX = 2
+
+
+def make_token_template():
+    """기도자를 고정 위치(SLIDE_INDEX_PRAYER) 대신 3번 슬라이드의 토큰으로 받는 템플릿"""
+    prs = make_synthetic_template()
+    prs.slides[TOKEN_SLIDE_INDEX].shapes.title.text = "대표기도 {{PRAYER_MINISTER}}"
+    prs.slides[TOKEN_SLIDE_INDEX].placeholders[1].text = "{{SERMON_TITLE}} ({{SERMON_SCRIPTURE}})"
+    return prs
+
+
+class TestTemplateTokens(unittest.TestCase):
+
+    def test_replaces_text_runs_in_one_pass(self):
+        slide_element = parse_xml(
+            f'<p:sld {nsdecls("a", "p")}><a:t>{{{{PRAYER_MINISTER}}}} &amp; {{{{UNKNOWN}}}}</a:t>'
+            '<a:t xml:space="preserve">{{SPEAKER}}</a:t><p:x name="{{SPEAKER}}"/></p:sld>'
+        )
+        count = replace_tokens_in_element(slide_element, {"PRAYER_MINISTER": "김<기도>", "SPEAKER": "박목사"})
+
+        texts = [element.text for element in slide_element.iter(qn("a:t"))]
+        self.assertEqual(count, 2)
+        self.assertEqual(texts, ["김<기도> & {{UNKNOWN}}", "박목사"]) # 모르는 토큰은 그대로
+        self.assertEqual(slide_element[-1].get("name"), "{{SPEAKER}}") # 텍스트 런 밖은 바꾸지 않음
+
+    def test_empty_field_clears_token(self):
+        """입력하지 않은 필드(None)의 토큰은 {{토큰}} 글자 그대로 남지 않고 지워져야 합니다."""
+        prs = make_token_template()
+        slide = prs.slides[TOKEN_SLIDE_INDEX]
+        self.assertEqual(replace_tokens_in_element(slide._element, {"PRAYER_MINISTER": None}), 1)
+        self.assertEqual(slide.shapes.title.text, "대표기도 ")
+
+    def test_long_token_value_is_fitted(self):
+        """치환한 값이 도형을 넘치면 두 엔진 모두 글꼴 크기를 줄이고, 들어가는 값은 템플릿 서식을 그대로 둡니다."""
+        template = to_file(make_token_template())
+        manifest = extract_template_manifest(template)
+        long_title = "태초에 하나님이 천지를 창조하시니라 땅이 혼돈하고 공허하며 흑암이 깊음 위에 있고 " * 6
+        worship_info = SimpleNamespace(**dict(vars(MOCK_WORSHIP_INFO), sermon_title=long_title))
+        plan = build_slide_plan(
+            template_slide_count=0, sunday_text="2025년 6월 다섯째주", worship_info=worship_info, songs_data=[],
+            manifest=manifest,
+        )
+
+        for engine in ("python-pptx", "ooxml"):
+            output = io.BytesIO()
+            template.seek(0)
+            render_slide_plan(template, plan, output, engine=engine)
+            slide = Presentation(output).slides[TOKEN_SLIDE_INDEX]
+            with self.subTest(engine=engine):
+                self.assertIsNone(slide.shapes.title.text_frame.paragraphs[0].runs[0].font.size)
+                body_run = slide.placeholders[1].text_frame.paragraphs[0].runs[0]
+                self.assertTrue(body_run.text.startswith(long_title))
+                self.assertLess(body_run.font.size, Pt(32)) # 기본 마스터 본문 크기(32pt)에서 줄어듦
+
+    def test_token_slides_replace_fixed_positions(self):
+        template = to_file(make_token_template())
+        manifest = extract_template_manifest(template)
+        self.assertEqual(manifest["roles"]["prayer"], {"token": "PRAYER_MINISTER", "slide_indices": [TOKEN_SLIDE_INDEX]})
+
+        plan = build_slide_plan(
+            template_slide_count=0,
+            sunday_text="2025년 6월 다섯째주",
+            worship_info=MOCK_WORSHIP_INFO,
+            songs_data=[],
+            manifest=manifest,
+        )
+        self.assertEqual(plan[SLIDE_INDEX_PRAYER]["edits"], []) # 고정 위치 편집 없음
+        self.assertEqual(plan[TOKEN_SLIDE_INDEX]["tokens"], {
+            "PRAYER_MINISTER": MOCK_WORSHIP_INFO.prayer_minister,
+            "SERMON_TITLE": MOCK_WORSHIP_INFO.sermon_title,
+            "SERMON_SCRIPTURE": MOCK_WORSHIP_INFO.sermon_scripture,
+        })
+
+        rendered = {}
+        for engine in ("python-pptx", "ooxml"):
+            output = io.BytesIO()
+            template.seek(0)
+            render_slide_plan(template, plan, output, engine=engine)
+            rendered[engine] = slide_texts(Presentation(output))
+        self.assertEqual(rendered["python-pptx"], rendered["ooxml"])
+        self.assertEqual(rendered["ooxml"][TOKEN_SLIDE_INDEX], (
+            f"대표기도 {MOCK_WORSHIP_INFO.prayer_minister}",
+            f"{MOCK_WORSHIP_INFO.sermon_title} ({MOCK_WORSHIP_INFO.sermon_scripture})",
+        ))
+        self.assertEqual(rendered["ooxml"][SLIDE_INDEX_PRAYER][0], f"slide {SLIDE_INDEX_PRAYER}")
+
+    def test_rejects_unknown_token(self):
+        prs = make_synthetic_template()
+        prs.slides[0].shapes.title.text = "{{PRAYER_MINSTER}}"
+        with self.assertRaises(TemplateManifestError) as context:
+            extract_template_manifest(to_file(prs))
+        self.assertIn("PRAYER_MINSTER", context.exception.errors[0])
+
+
+if __name__ == "__main__":
+    unittest.main()
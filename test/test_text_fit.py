@@ -0,0 +1,104 @@
+# tests/test_text_fit.py
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+from pptx.enum.text import MSO_AUTO_SIZE
+from pptx.util import Inches, Pt
+
+from utils import text_fit
+from utils.text_fit import (
+    fit_font_size, load_glyph_width_cache, save_glyph_width_cache, GLYPH_WIDTH_CACHE,
+    configure_text_fit, can_draw_text, load_font, MissingFontError,
+)
+from utils.update_pptx import edit_text_field
+
+# 한글 글꼴을 찾을 디렉토리 (settings.PPT_FONT_DIRS 기본값과 같음)
+FONT_DIRS = ["/usr/share/fonts", os.path.join(project_root, "core", "data", "fonts")]
+HANGUL_TYPEFACE = "NanumGothic"
+
+
+def use_hangul_font(test_case: unittest.TestCase) -> str:
+    """FONT_DIRS에서 한글 글꼴을 찾도록 설정하고 이름을 반환합니다. 글꼴이 없는 환경에서는 테스트를 건너뜁니다."""
+    configure_text_fit(FONT_DIRS)
+    test_case.addCleanup(configure_text_fit, [])
+    try:
+        load_font(HANGUL_TYPEFACE, 10)
+    except MissingFontError as e:
+        test_case.skipTest(str(e))
+    return HANGUL_TYPEFACE
+
+
+LONG_SCRIPTURE = "태초에 하나님이 천지를 창조하시니라 땅이 혼돈하고 공허하며 흑암이 깊음 위에 있고 하나님의 영은 수면 위에 운행하시니라 " * 6
+
+
+class TestTextFit(unittest.TestCase):
+
+    def test_font_size_shrinks_only_when_needed(self):
+        width, height = Inches(8), Inches(3)
+        short_size, short_lines = fit_font_size("짧은 제목", width, height, 44)
+        self.assertEqual((short_size, short_lines), (44, 1))
+
+        long_size, long_lines = fit_font_size(LONG_SCRIPTURE, width, height, 32)
+        self.assertLess(long_size, 32)
+        self.assertGreaterEqual(long_size, text_fit.MIN_FONT_SIZE_PT)
+        self.assertLessEqual(long_lines * long_size * text_fit.LINE_HEIGHT_RATIO, height / 12700)
+        # 한 단계 큰 크기는 들어가지 않아야 함
+        larger = long_size + text_fit.FONT_SIZE_STEP_PT
+        paragraphs, space_width = text_fit._measure_paragraphs(LONG_SCRIPTURE, None, None)
+        larger_lines = text_fit._count_lines(paragraphs, space_width, width / 12700 / larger)
+        self.assertGreater(larger_lines * larger * text_fit.LINE_HEIGHT_RATIO, height / 12700)
+
+    def test_edit_sets_fitted_size_on_placeholder(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        edit_text_field(prs=prs, slide_index=0, ph_index=1, new_text=LONG_SCRIPTURE, align_center=False)
+
+        text_frame = slide.placeholders[1].text_frame
+        self.assertEqual(text_frame.auto_size, MSO_AUTO_SIZE.NONE)
+        self.assertTrue(text_frame.word_wrap)
+        self.assertLess(text_frame.paragraphs[0].runs[0].font.size, Pt(32)) # 기본 마스터 본문 크기(32pt)에서 줄어듦
+
+    def test_width_cache_persists(self):
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir)
+        cache_path = os.path.join(temp_dir, "glyph_widths.json")
+
+        text_fit.glyph_width("갉")
+        save_glyph_width_cache(cache_path)
+        GLYPH_WIDTH_CACHE.clear()
+
+        load_glyph_width_cache(cache_path)
+        self.assertEqual(GLYPH_WIDTH_CACHE[text_fit.APPROXIMATE_FONT_KEY]["갉"], 1.0)
+
+
+class TestLoadFont(unittest.TestCase):
+
+    def test_font_without_hangul_is_detected(self):
+        from PIL import ImageFont
+
+        latin_only = ImageFont.load_default(size=20) # Pillow 내장 글꼴에는 한글이 없음
+        self.assertTrue(can_draw_text(latin_only, "Amen"))
+        self.assertFalse(can_draw_text(latin_only, "아멘"))
+
+    def test_missing_font_is_reported(self):
+        configure_text_fit([])
+        with self.assertRaises(MissingFontError):
+            load_font(HANGUL_TYPEFACE, 20)
+
+    def test_hangul_font_draws_hangul(self):
+        typeface = use_hangul_font(self)
+        self.assertTrue(can_draw_text(load_font(typeface, 20), "태초에 하나님이 천지를 창조하시니라"))
+
+
+if __name__ == "__main__":
+    unittest.main()
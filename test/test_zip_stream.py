@@ -0,0 +1,71 @@
+# tests/test_zip_stream.py
+
+import io
+import os
+import sys
+import unittest
+import zipfile
+
+# 프로젝트 루트 디렉토리를 sys.path에 추가하여 모듈 임포트 가능하게 함
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from pptx import Presentation
+from pptx.util import Inches
+from PIL import Image
+
+from utils.update_pptx import save_presentation
+from utils.zip_stream import ZipStreamWriter, prepare_entries
+
+ENTRIES = [
+    ("ppt/slides/slide1.xml", b"<p:sld>" + b"<a:t>text</a:t>" * 200 + b"</p:sld>"),
+    ("ppt/media/image1.png", os.urandom(4096)),
+    ("ppt/media/image2.JPEG", os.urandom(1024)),
+    ("ppt/fonts/font1.fntdata", b"\x00\x01\x00\x00glyf" * 512), # 포함 글꼴은 압축되지 않은 형식
+]
+
+
+class TestZipStream(unittest.TestCase):
+
+    def write_zip(self, level: int, workers: int) -> bytes:
+        buffer = io.BytesIO()
+        with ZipStreamWriter(buffer) as writer:
+            for prepared_entry in prepare_entries(ENTRIES, level, workers):
+                writer.write_prepared(prepared_entry)
+        return buffer.getvalue()
+
+    def test_media_is_stored_and_xml_is_deflated(self):
+        with zipfile.ZipFile(io.BytesIO(self.write_zip(level=6, workers=1))) as zip_file:
+            self.assertIsNone(zip_file.testzip())
+            compress_types = {info.filename: info.compress_type for info in zip_file.infolist()}
+            for name, data in ENTRIES:
+                self.assertEqual(zip_file.read(name), data)
+        self.assertEqual(compress_types["ppt/slides/slide1.xml"], zipfile.ZIP_DEFLATED)
+        self.assertEqual(compress_types["ppt/media/image1.png"], zipfile.ZIP_STORED)
+        self.assertEqual(compress_types["ppt/media/image2.JPEG"], zipfile.ZIP_STORED)
+        self.assertEqual(compress_types["ppt/fonts/font1.fntdata"], zipfile.ZIP_DEFLATED)
+
+    def test_parallel_compression_is_deterministic(self):
+        self.assertEqual(self.write_zip(level=9, workers=4), self.write_zip(level=9, workers=1))
+
+    def test_save_presentation_with_zip_level(self):
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[1])
+        slide.shapes.title.text = "제목"
+        image = io.BytesIO()
+        Image.new("RGB", (16, 16), "red").save(image, "PNG")
+        slide.shapes.add_picture(image, Inches(1), Inches(1))
+
+        output = io.BytesIO()
+        save_presentation(prs, output, zip_level=1, zip_workers=2)
+        output.seek(0)
+        reopened = Presentation(output)
+        self.assertEqual(reopened.slides[0].shapes.title.text, "제목")
+        with zipfile.ZipFile(output) as zip_file:
+            media = [info for info in zip_file.infolist() if info.filename.startswith("ppt/media/")]
+        self.assertEqual([info.compress_type for info in media], [zipfile.ZIP_STORED])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,161 @@
+# utils/bible_books.py
+
+# 성경책 이름 해석기.
+# 정식 이름, 흔히 쓰는 한국어 약어, 영어 이름/약어 표로 임포트 시 한 번 접두어 트라이(trie)를 만들고,
+# 입력 앞부분에서 가장 긴 책 이름을 입력 길이에 비례하는 시간(O(입력 길이))에 찾습니다.
+# 공백과 마침표는 무시하고 영문은 대소문자를 구분하지 않으므로 "요 3:16", "요한 복음 3:16", "Jn 3:16", "1 Cor. 13"
+# 모두 해석됩니다. 폼 검증과 PPT 생성 작업이 같은 해석기(utils/scripture_reference.py)를 쓰며,
+# 트라이의 각 노드에 그 아래 책 목록을 미리 담아 두어 자동 완성/오류 메시지의 후보 추천에도 씁니다.
+
+# 정식 책 이름 -> (한국어 약어/별칭, 영어 이름/약어). 순서는 BIBLE_FILE_MAP(성경 순서)과 같고,
+# 한국어 첫 번째 약어는 성경 텍스트 파일의 각 줄 앞에 붙는 약어와 같습니다.
+BOOK_NAME_TABLE = {
+    "창세기": (("창",), ("Genesis", "Gen", "Gn")),
+    "출애굽기": (("출",), ("Exodus", "Exod", "Ex")),
+    "레위기": (("레",), ("Leviticus", "Lev", "Lv")),
+    "민수기": (("민",), ("Numbers", "Num", "Nm")),
+    "신명기": (("신",), ("Deuteronomy", "Deut", "Dt")),
+    "여호수아": (("수",), ("Joshua", "Josh", "Jos")),
+    "사사기": (("삿",), ("Judges", "Judg", "Jdg")),
+    "룻기": (("룻",), ("Ruth", "Ru")),
+    "사무엘상": (("삼상",), ("1 Samuel", "1 Sam", "1 Sa")),
+    "사무엘하": (("삼하",), ("2 Samuel", "2 Sam", "2 Sa")),
+    "열왕기상": (("왕상",), ("1 Kings", "1 Kgs", "1 Ki")),
+    "열왕기하": (("왕하",), ("2 Kings", "2 Kgs", "2 Ki")),
+    "역대상": (("대상",), ("1 Chronicles", "1 Chron", "1 Chr")),
+    "역대하": (("대하",), ("2 Chronicles", "2 Chron", "2 Chr")),
+    "에스라": (("스",), ("Ezra", "Ezr")),
+    "느헤미야": (("느",), ("Nehemiah", "Neh")),
+    "에스더": (("에",), ("Esther", "Esth", "Est")),
+    "욥기": (("욥",), ("Job", "Jb")),
+    "시편": (("시",), ("Psalms", "Psalm", "Psa", "Ps")),
+    "잠언": (("잠",), ("Proverbs", "Prov", "Pr")),
+    "전도서": (("전",), ("Ecclesiastes", "Eccl", "Ecc")),
+    "아가": (("아",), ("Song of Songs", "Song of Solomon", "Song")),
+    "이사야": (("사",), ("Isaiah", "Isa", "Is")),
+    "예레미야": (("렘",), ("Jeremiah", "Jer")),
+    "예레미야애가": (("애", "애가"), ("Lamentations", "Lam")),
+    "에스겔": (("겔",), ("Ezekiel", "Ezek", "Eze")),
+    "다니엘": (("단",), ("Daniel", "Dan", "Dn")),
+    "호세아": (("호",), ("Hosea", "Hos")),
+    "요엘": (("욜",), ("Joel", "Jl")),
+    "아모스": (("암",), ("Amos", "Am")),
+    "오바댜": (("옵",), ("Obadiah", "Obad", "Ob")),
+    "요나": (("욘",), ("Jonah", "Jon")),
+    "미가": (("미",), ("Micah", "Mic")),
+    "나훔": (("나",), ("Nahum", "Nah")),
+    "하박국": (("합",), ("Habakkuk", "Hab")),
+    "스바냐": (("습",), ("Zephaniah", "Zeph")),
+    "학개": (("학",), ("Haggai", "Hag")),
+    "스가랴": (("슥",), ("Zechariah", "Zech")),
+    "말라기": (("말",), ("Malachi", "Mal")),
+    "마태복음": (("마", "마태"), ("Matthew", "Matt", "Mt")),
+    "마가복음": (("막", "마가"), ("Mark", "Mk")),
+    "누가복음": (("눅", "누가"), ("Luke", "Lk")),
+    "요한복음": (("요",), ("John", "Jn", "Jhn")),
+    "사도행전": (("행",), ("Acts", "Ac")),
+    "로마서": (("롬",), ("Romans", "Rom", "Rm")),
+    "고린도전서": (("고전",), ("1 Corinthians", "1 Cor", "1 Co")),
+    "고린도후서": (("고후",), ("2 Corinthians", "2 Cor", "2 Co")),
+    "갈라디아서": (("갈",), ("Galatians", "Gal")),
+    "에베소서": (("엡",), ("Ephesians", "Eph")),
+    "빌립보서": (("빌",), ("Philippians", "Phil", "Php")),
+    "골로새서": (("골",), ("Colossians", "Col")),
+    "데살로니가전서": (("살전",), ("1 Thessalonians", "1 Thess", "1 Th")),
+    "데살로니가후서": (("살후",), ("2 Thessalonians", "2 Thess", "2 Th")),
+    "디모데전서": (("딤전",), ("1 Timothy", "1 Tim", "1 Ti")),
+    "디모데후서": (("딤후",), ("2 Timothy", "2 Tim", "2 Ti")),
+    "디도서": (("딛",), ("Titus", "Tit")),
+    "빌레몬서": (("몬",), ("Philemon", "Phlm", "Phm")),
+    "히브리서": (("히",), ("Hebrews", "Heb")),
+    "야고보서": (("약",), ("James", "Jas", "Jm")),
+    "베드로전서": (("벧전",), ("1 Peter", "1 Pet", "1 Pt")),
+    "베드로후서": (("벧후",), ("2 Peter", "2 Pet", "2 Pt")),
+    "요한일서": (("요일",), ("1 John", "1 Jn", "1 Jhn")),
+    "요한이서": (("요이",), ("2 John", "2 Jn", "2 Jhn")),
+    "요한삼서": (("요삼",), ("3 John", "3 Jn", "3 Jhn")),
+    "유다서": (("유",), ("Jude", "Jud")),
+    "요한계시록": (("계", "계시록"), ("Revelation", "Rev", "Rv")),
+}
+
+BOOK_ORDER = {book: number for number, book in enumerate(BOOK_NAME_TABLE)}
+
+# 이름을 비교할 때 건너뛰는 문자 ("요한 복음", "1 Cor.")
+IGNORED_NAME_CHARS = frozenset(" \t\r\n 　.")
+
+
+def _new_node() -> dict:
+    # children: 다음 글자 -> 노드, book: 여기서 끝나는 이름의 정식 책 이름, books: 이 노드 아래의 책 (성경 순서)
+    return {"children": {}, "book": None, "books": []}
+
+
+def _build_book_trie() -> dict:
+    root = _new_node()
+    for book, (korean_names, english_names) in BOOK_NAME_TABLE.items():
+        for name in (book,) + korean_names + english_names:
+            node = root
+            for char in name:
+                if char in IGNORED_NAME_CHARS:
+                    continue
+                node = node["children"].setdefault(char.lower(), _new_node())
+                if book not in node["books"]:
+                    node["books"].append(book)
+            if node["book"] not in (None, book):
+                raise ValueError(f"성경책 이름 '{name}'이(가) '{node['book']}'와(과) '{book}'에 중복됩니다.")
+            node["book"] = book
+    return root
+
+
+_BOOK_TRIE = _build_book_trie()
+
+
+def _walk(text: str):
+    """
+    트라이를 따라 `text`를 앞에서부터 읽습니다.
+    (가장 길게 일치한 책 이름, 그 이름이 끝나는 위치, 끝까지 따라간 노드)를 반환합니다.
+    """
+    node = _BOOK_TRIE
+    matched_book, matched_end = None, 0
+    for position, char in enumerate(text):
+        if char in IGNORED_NAME_CHARS:
+            continue
+        child = node["children"].get(char.lower())
+        if child is None:
+            break
+        node = child
+        if node["book"] is not None:
+            matched_book, matched_end = node["book"], position + 1
+    return matched_book, matched_end, node
+
+
+def match_book_prefix(text: str):
+    """
+    `text` 앞부분에서 가장 긴 책 이름을 찾아 (정식 책 이름, 이름 다음 위치)를 반환합니다. 없으면 (None, 0)
+    예: "롬 8:28" -> ("로마서", 1), "요한 복음 3:16" -> ("요한복음", 5), "1 Jn 1:9" -> ("요한일서", 4)
+    """
+    matched_book, matched_end, _ = _walk(text)
+    return matched_book, matched_end
+
+
+def resolve_book_name(name: str):
+    """책 이름, 약어, 영어 이름을 정식 책 이름으로 바꿉니다. 이름 전체가 일치하지 않으면 None"""
+    matched_book, matched_end = match_book_prefix(name)
+    if matched_book is None or any(char not in IGNORED_NAME_CHARS for char in name[matched_end:]):
+        return None
+    return matched_book
+
+
+def suggest_books(prefix: str, limit: int = 5) -> list:
+    """
+    `prefix`를 따라갈 수 있는 데까지 따라간 뒤 그 아래의 책을 성경 순서로 최대 `limit`개 반환합니다.
+    (자동 완성과 "알 수 없는 성경책" 오류의 후보 추천용. 한 글자도 일치하지 않으면 빈 목록)
+    """
+    _, _, node = _walk(prefix)
+    if node is _BOOK_TRIE:
+        return []
+    return node["books"][:limit]
+
+
+def book_abbreviation(book: str) -> str:
+    """정식 책 이름의 대표 한국어 약어 (예: "요한복음" -> "요")"""
+    return BOOK_NAME_TABLE[book][0][0]
@@ -0,0 +1,211 @@
+# utils/bible_index.py
+
+# 미리 만들어 두는 성경 구절 색인.
+# core/data/bible_text의 EUC-KR 텍스트를 한 번만 파싱해 <섹션 제목>을 제거한 UTF-8 본문 덩어리(blob)와
+# (책, 장, 절) -> 본문 위치 오프셋 표로 된 파일 하나를 만듭니다. (manage.py build_bible_index)
+# 읽는 쪽은 파일을 mmap으로 열어 표에서 위치를 찾고 범위만큼만 잘라 읽으므로, 요청마다 책 전체를 디코딩하거나
+# 정규표현식을 돌리지 않습니다. (시편 119편이나 요한계시록 22장도 범위 크기만큼만 비용이 듭니다)
+#
+# 파일 형식 (정수는 uint32, 색인을 만든 서버의 바이트 순서. 색인은 서버마다 만드는 로컬 산출물입니다):
+#   헤더      magic(8) version book_count chapter_count verse_count meta_length
+#   메타      JSON {"books": [책 이름, ...], "sources": {책 이름: [파일 크기, 수정 시각(ns)]}} (4바이트 정렬)
+#   책 표     책마다 (첫 장 행 번호, 장 수)
+#   장 표     장마다 (장 번호, 첫 절 행 번호, 절 수)
+#   절 번호   절마다 절 번호
+#   오프셋    절마다 본문 시작 위치 + 마지막 끝 위치 (verse_count + 1개, blob 기준 바이트 위치)
+#   blob      모든 절 본문(UTF-8)을 책/장/절 순서대로 이어 붙인 것
+
+import bisect
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+
+INDEX_MAGIC = b"BIBLEIDX"
+INDEX_VERSION = 1
+HEADER_STRUCT = struct.Struct("=8sIIIII")
+
+
+def source_signature(file_path: str) -> list:
+    """색인을 만든 뒤 원본 텍스트 파일이 바뀌었는지 판단하는 [파일 크기, 수정 시각(ns)]"""
+    stat = os.stat(file_path)
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def _uint32_bytes(values: list) -> bytes:
+    table = array("I", values)
+    if table.itemsize != 4:
+        raise RuntimeError("이 플랫폼에서는 uint32 배열을 만들 수 없습니다.")
+    return table.tobytes()
+
+
+def build_bible_index(text_dir: str, file_map: dict, output_path: str) -> dict:
+    """
+    `file_map`(책 이름 -> 텍스트 파일 이름) 순서대로 모든 책을 파싱해 색인 파일을 `output_path`에 씁니다.
+    다른 프로세스가 읽는 중이어도 안전하도록 임시 파일에 쓴 뒤 교체하며, {"books", "chapters", "verses", "bytes"}를 반환합니다.
+    """
+    from utils.bible_text_parser import parse_verse_line # bible_text_parser가 이 모듈을 임포트하므로 순환 방지
+
+    books = []
+    sources = {}
+    book_table = []
+    chapter_table = []
+    verse_numbers = []
+    offsets = [0]
+    blob = bytearray()
+    for book, file_name in file_map.items():
+        file_path = os.path.join(text_dir, file_name)
+        if not os.path.exists(file_path):
+            print(f"Warning: Bible file '{file_path}' not found. '{book}' is not indexed.")
+            continue
+        books.append(book)
+        sources[book] = source_signature(file_path)
+        first_chapter_row = len(chapter_table) // 3
+        current_chapter = None
+        with open(file_path, "r", encoding="EUC-KR") as f:
+            for line in f:
+                parsed_line = parse_verse_line(line, book)
+                if not parsed_line:
+                    continue
+                if parsed_line["chapter"] != current_chapter:
+                    current_chapter = parsed_line["chapter"]
+                    chapter_table.extend([current_chapter, len(verse_numbers), 0])
+                chapter_table[-1] += 1
+                verse_numbers.append(parsed_line["verse"])
+                blob += parsed_line["contents"].encode("utf-8")
+                offsets.append(len(blob))
+        book_table.extend([first_chapter_row, len(chapter_table) // 3 - first_chapter_row])
+
+    meta = json.dumps({"books": books, "sources": sources}, ensure_ascii=False).encode("utf-8")
+    meta += b" " * (-len(meta) % 4)
+    header = HEADER_STRUCT.pack(
+        INDEX_MAGIC, INDEX_VERSION, len(books), len(chapter_table) // 3, len(verse_numbers), len(meta)
+    )
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            for part in (header, meta, _uint32_bytes(book_table), _uint32_bytes(chapter_table),
+                         _uint32_bytes(verse_numbers), _uint32_bytes(offsets), blob):
+                f.write(part)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return {
+        "books": len(books), "chapters": len(chapter_table) // 3, "verses": len(verse_numbers),
+        "bytes": os.path.getsize(output_path),
+    }
+
+
+class BibleIndex:
+    """mmap으로 연 색인 파일. 표는 복사하지 않고 mmap 위의 memoryview로 읽습니다."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, book_count, chapter_count, verse_count, meta_length = HEADER_STRUCT.unpack_from(self._mmap)
+        if magic != INDEX_MAGIC or version != INDEX_VERSION:
+            self._mmap.close()
+            raise ValueError(f"'{path}'은(는) 지원하지 않는 성경 색인 파일입니다. build_bible_index로 다시 만들어주세요.")
+
+        position = HEADER_STRUCT.size
+        meta = json.loads(bytes(self._mmap[position:position + meta_length]))
+        position += meta_length
+        self.books = {book: number for number, book in enumerate(meta["books"])}
+        self.sources = meta["sources"]
+
+        view = memoryview(self._mmap)
+        tables = []
+        for count in (book_count * 2, chapter_count * 3, verse_count, verse_count + 1):
+            tables.append(view[position:position + count * 4].cast("I"))
+            position += count * 4
+        view.release()
+        self._book_table, self._chapter_table, self._verse_numbers, self._offsets = tables
+        self._blob_start = position
+
+    def close(self):
+        for table in (self._book_table, self._chapter_table, self._verse_numbers, self._offsets):
+            table.release()
+        self._mmap.close()
+
+    def is_current(self, book: str, file_path: str) -> bool:
+        """색인을 만든 뒤 책 텍스트 파일이 바뀌지 않았는지 (크기, 수정 시각) 확인합니다."""
+        return (
+            book in self.books and os.path.exists(file_path)
+            and self.sources.get(book) == source_signature(file_path)
+        )
+
+    def _chapter_row(self, book: str, chapter: int):
+        """장 표에서 장의 행 번호를 찾습니다. 없는 장이면 None"""
+        book_number = self.books[book]
+        first_chapter_row = self._book_table[book_number * 2]
+        chapter_count = self._book_table[book_number * 2 + 1]
+        # 장 번호는 1부터 연속이므로 바로 찾고, 맞지 않으면(빠진 장이 있는 파일) 책의 장 표를 훑습니다.
+        row = first_chapter_row + chapter - 1
+        if first_chapter_row <= row < first_chapter_row + chapter_count and self._chapter_table[row * 3] == chapter:
+            return row
+        for row in range(first_chapter_row, first_chapter_row + chapter_count):
+            if self._chapter_table[row * 3] == chapter:
+                return row
+        return None
+
+    def _verse_row(self, chapter_row: int, verse: int, is_end: bool):
+        """범위 시작이면 `verse` 이상인 첫 절, 끝이면 `verse` 이하인 마지막 절의 행 번호. 없으면 None"""
+        first_row = self._chapter_table[chapter_row * 3 + 1]
+        count = self._chapter_table[chapter_row * 3 + 2]
+        numbers = self._verse_numbers[first_row:first_row + count]
+        if is_end:
+            index = bisect.bisect_right(numbers, verse) - 1
+            return first_row + index if index >= 0 else None
+        index = bisect.bisect_left(numbers, verse)
+        return first_row + index if index < count else None
+
+    def chapter_numbers(self, book: str) -> list:
+        """책에 들어 있는 장 번호 목록"""
+        book_number = self.books[book]
+        first_chapter_row = self._book_table[book_number * 2]
+        chapter_count = self._book_table[book_number * 2 + 1]
+        return [self._chapter_table[row * 3] for row in range(first_chapter_row, first_chapter_row + chapter_count)]
+
+    def chapter_verse_numbers(self, book: str, chapter: int) -> list:
+        """장에 들어 있는 절 번호 목록 (없는 장이면 빈 목록)"""
+        chapter_row = self._chapter_row(book, chapter)
+        if chapter_row is None:
+            return []
+        first_row = self._chapter_table[chapter_row * 3 + 1]
+        return list(self._verse_numbers[first_row:first_row + self._chapter_table[chapter_row * 3 + 2]])
+
+    def get_range(self, book: str, begin_ch: int, begin_verse: int, end_ch: int, end_verse: int) -> list:
+        """
+        범위의 구절을 [{"title": "창세기 1:1", "contents": ...}, ...]로 반환합니다. (get_bible_contents와 같은 형식)
+        범위 안에 구절이 없으면 빈 목록입니다.
+        """
+        begin_chapter_row = self._chapter_row(book, begin_ch)
+        end_chapter_row = self._chapter_row(book, end_ch)
+        if begin_chapter_row is None or end_chapter_row is None:
+            return []
+        start_row = self._verse_row(begin_chapter_row, begin_verse, is_end=False)
+        end_row = self._verse_row(end_chapter_row, end_verse, is_end=True)
+        if start_row is None or end_row is None or start_row > end_row:
+            return []
+
+        verses = []
+        chapter_row = begin_chapter_row
+        for row in range(start_row, end_row + 1):
+            # 장의 마지막 절을 지나면 다음 장으로 넘어갑니다.
+            while row >= self._chapter_table[chapter_row * 3 + 1] + self._chapter_table[chapter_row * 3 + 2]:
+                chapter_row += 1
+            start = self._blob_start + self._offsets[row]
+            end = self._blob_start + self._offsets[row + 1]
+            verses.append({
+                "title": f"{book} {self._chapter_table[chapter_row * 3]}:{self._verse_numbers[row]}",
+                "contents": self._mmap[start:end].decode("utf-8"),
+            })
+        return verses
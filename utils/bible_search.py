@@ -0,0 +1,136 @@
+# utils/bible_search.py
+
+# 성경 본문 전문 검색 (SQLite FTS5).
+# 모든 구절을 로컬 SQLite 파일 하나에 미리 색인해 두고(manage.py build_bible_search_index),
+# 요청 시에는 텍스트 파일을 읽지 않고 FTS5 색인만 조회합니다.
+# 한국어 본문은 조사가 붙어 띄어 쓰므로("말씀이", "말씀을") 단어 접두어 검색을 기본으로 하고,
+# 여러 단어가 붙어서 나오는 구절을 찾는 구(phrase) 검색도 지원합니다. 결과는 bm25 순위 순서입니다.
+
+import os
+import re
+import sqlite3
+import tempfile
+import threading
+
+SEARCH_MODE_PREFIX = "prefix" # 모든 단어가 (접두어로) 들어 있는 구절
+SEARCH_MODE_PHRASE = "phrase" # 단어들이 이 순서대로 붙어 나오는 구절 (마지막 단어는 접두어)
+SEARCH_MODES = (SEARCH_MODE_PREFIX, SEARCH_MODE_PHRASE)
+MAX_SEARCH_RESULTS = 50
+
+# FTS5 질의 문법 문자(따옴표, *, 괄호 등)는 검색어에서 제거하고 단어만 사용합니다.
+SEARCH_TERM_PATTERN = re.compile(r"\w+")
+
+_connections = threading.local() # 스레드별 {경로: (색인 파일 수정 시각, 읽기 전용 연결)}
+
+
+def build_bible_search_index(text_dir: str, file_map: dict, output_path: str) -> dict:
+    """
+    `file_map`(책 이름 -> 텍스트 파일 이름)의 모든 구절로 FTS5 색인을 만들어 `output_path`에 씁니다.
+    검색 중인 프로세스가 있어도 안전하도록 임시 파일에 만든 뒤 교체하며, {"books", "verses", "bytes"}를 반환합니다.
+    """
+    from utils.bible_text_parser import load_parsed_book # bible_text_parser가 Django 설정을 읽으므로 지연 임포트
+
+    output_dir = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(output_dir, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=output_dir, suffix=".tmp")
+    os.close(fd)
+    book_count = 0
+    verse_count = 0
+    try:
+        connection = sqlite3.connect(temp_path)
+        try:
+            connection.executescript("""
+                CREATE TABLE verses (
+                    id INTEGER PRIMARY KEY, book TEXT NOT NULL, book_order INTEGER NOT NULL,
+                    chapter INTEGER NOT NULL, verse INTEGER NOT NULL, contents TEXT NOT NULL
+                );
+                CREATE VIRTUAL TABLE verses_fts USING fts5(
+                    contents, content='verses', content_rowid='id', tokenize='unicode61', prefix='1 2 3'
+                );
+            """)
+            for book_order, (book, file_name) in enumerate(file_map.items()):
+                file_path = os.path.join(text_dir, file_name)
+                if not os.path.exists(file_path):
+                    print(f"Warning: Bible file '{file_path}' not found. '{book}' is not searchable.")
+                    continue
+                chapters = load_parsed_book(book, file_path)
+                rows = [
+                    (book, book_order, chapter, verse, contents)
+                    for chapter in sorted(chapters)
+                    for verse, contents in zip(*chapters[chapter])
+                ]
+                connection.executemany(
+                    "INSERT INTO verses (book, book_order, chapter, verse, contents) VALUES (?, ?, ?, ?, ?)", rows
+                )
+                book_count += 1
+                verse_count += len(rows)
+            connection.execute("INSERT INTO verses_fts (verses_fts) VALUES ('rebuild')")
+            connection.execute("INSERT INTO verses_fts (verses_fts) VALUES ('optimize')")
+            connection.commit()
+            connection.execute("VACUUM")
+        finally:
+            connection.close()
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return {"books": book_count, "verses": verse_count, "bytes": os.path.getsize(output_path)}
+
+
+def build_match_query(query: str, mode: str = SEARCH_MODE_PREFIX) -> str:
+    """검색어를 FTS5 MATCH 식으로 바꿉니다. 검색할 단어가 없으면 빈 문자열입니다."""
+    terms = SEARCH_TERM_PATTERN.findall(query)
+    if not terms:
+        return ""
+    if mode == SEARCH_MODE_PHRASE:
+        return '"' + " ".join(terms) + '" *'
+    return " AND ".join(f'"{term}" *' for term in terms)
+
+
+def _get_connection(index_path: str):
+    """스레드마다 읽기 전용 연결을 재사용하고, 색인 파일이 다시 만들어졌으면 새로 엽니다. 색인이 없으면 None"""
+    try:
+        index_mtime = os.stat(index_path).st_mtime_ns
+    except OSError:
+        return None
+    cache = getattr(_connections, "by_path", None)
+    if cache is None:
+        cache = _connections.by_path = {}
+    cached = cache.get(index_path)
+    if cached is None or cached[0] != index_mtime:
+        if cached is not None:
+            cached[1].close()
+        connection = sqlite3.connect(f"file:{index_path}?mode=ro", uri=True)
+        cache[index_path] = cached = (index_mtime, connection)
+    return cached[1]
+
+
+def search_bible(index_path: str, query: str, mode: str = SEARCH_MODE_PREFIX, limit: int = 20):
+    """
+    성경 본문을 검색해 순위 순서로 [{"book", "chapter", "verse", "title", "contents"}, ...]를 반환합니다.
+    색인 파일이 없으면 None을 반환합니다. (build_bible_search_index로 먼저 만들어야 함)
+    """
+    if mode not in SEARCH_MODES:
+        raise ValueError(f"알 수 없는 검색 방식입니다: {mode} (사용 가능: {', '.join(SEARCH_MODES)})")
+    connection = _get_connection(index_path)
+    if connection is None:
+        return None
+    match_query = build_match_query(query, mode)
+    if not match_query:
+        return []
+
+    rows = connection.execute(
+        """
+        SELECT verses.book, verses.chapter, verses.verse, verses.contents
+        FROM verses_fts JOIN verses ON verses.id = verses_fts.rowid
+        WHERE verses_fts MATCH ?
+        ORDER BY bm25(verses_fts), verses.book_order, verses.chapter, verses.verse
+        LIMIT ?
+        """,
+        (match_query, max(1, min(limit, MAX_SEARCH_RESULTS))),
+    ).fetchall()
+    return [
+        {"book": book, "chapter": chapter, "verse": verse, "title": f"{book} {chapter}:{verse}", "contents": contents}
+        for book, chapter, verse, contents in rows
+    ]
@@ -1,12 +1,34 @@
 # utils/bible_text_parser.py
 
+import bisect
 import os
 import re
+import sys
+import threading
+from collections import OrderedDict
 from django.conf import settings # Django settings에 접근하여 BASE_DIR 가져오기
 
+from utils.bible_index import BibleIndex, source_signature
+
 # 성경 TXT 파일들이 저장된 디렉토리 경로
 # settings.BASE_DIR은 Django 프로젝트의 루트 디렉토리를 가리킵니다.
 BIBLE_TEXT_DIR = os.path.join(settings.BASE_DIR, 'core', 'data', 'bible_text')
+# 미리 만든 구절 색인 파일 (python manage.py build_bible_index, utils/bible_index.py)
+# 색인이 없거나 책 파일이 색인 이후 바뀌었으면 텍스트 파일을 직접 읽습니다.
+BIBLE_INDEX_PATH = os.path.join(settings.BASE_DIR, 'cache', 'bible_index.bin')
+# 본문 전문 검색용 SQLite FTS5 색인 (python manage.py build_bible_search_index, utils/bible_search.py)
+BIBLE_SEARCH_INDEX_PATH = os.path.join(settings.BASE_DIR, 'cache', 'bible_search.sqlite3')
+
+_bible_index = None # (색인 파일 수정 시각, BibleIndex)
+_bible_index_lock = threading.Lock()
+
+# 색인을 쓸 수 없을 때 파싱한 책을 작업 프로세스 안에 보관하는 LRU 캐시.
+# 크기는 책 본문 문자열의 메모리 사용량(추정) 합계로 제한하고, 책 파일의 크기/수정 시각이 바뀌면 다시 파싱합니다.
+BOOK_CACHE_MAX_BYTES = 32 * 1024 * 1024
+BOOK_CACHE_STATS = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+_book_cache = OrderedDict() # 책 이름 -> (파일 서명, {장: ([절 번호, ...], [본문, ...])}, 추정 바이트)
+_book_cache_bytes = 0
+_book_cache_lock = threading.Lock()
 
 # 성경책 전체 이름과 파일 이름 매핑
 BIBLE_FILE_MAP = {
@@ -107,10 +129,154 @@ def parse_verse_line(line: str, full_book_name: str):
         }
     return None
 
+def get_bible_index():
+    """
+    구절 색인을 mmap으로 열어 프로세스 안에서 공유합니다. 색인 파일이 없으면 None이며,
+    다시 만들어졌으면(수정 시각 변경) 새로 엽니다.
+    """
+    global _bible_index
+    try:
+        index_mtime = os.stat(BIBLE_INDEX_PATH).st_mtime_ns
+    except OSError:
+        return None
+    with _bible_index_lock:
+        if _bible_index is None or _bible_index[0] != index_mtime:
+            try:
+                _bible_index = (index_mtime, BibleIndex(BIBLE_INDEX_PATH))
+            except (OSError, ValueError) as e:
+                print(f"Warning: Failed to open Bible index '{BIBLE_INDEX_PATH}': {e}")
+                return None
+        return _bible_index[1]
+
+
+def reset_book_cache_stats():
+    for key in BOOK_CACHE_STATS:
+        BOOK_CACHE_STATS[key] = 0
+
+
+def clear_book_cache():
+    global _book_cache_bytes
+    with _book_cache_lock:
+        _book_cache.clear()
+        _book_cache_bytes = 0
+
+
+def get_book_cache_info() -> dict:
+    """캐시 통계와 현재 보관 중인 책 수/추정 바이트"""
+    with _book_cache_lock:
+        return dict(BOOK_CACHE_STATS, books=len(_book_cache), bytes=_book_cache_bytes, max_bytes=BOOK_CACHE_MAX_BYTES)
+
+
+def _parse_book_file(file_path: str, bible_book: str) -> tuple:
+    """책 파일 전체를 {장: ([절 번호, ...], [본문, ...])}로 파싱하고 (장 사전, 추정 바이트)를 반환합니다."""
+    chapters = {}
+    size = sys.getsizeof(chapters)
+    with open(file_path, 'r', encoding='EUC-KR') as f:
+        for line in f:
+            parsed_line = parse_verse_line(line, bible_book)
+            if not parsed_line:
+                continue
+            verse_numbers, contents = chapters.setdefault(parsed_line['chapter'], ([], []))
+            verse_numbers.append(parsed_line['verse'])
+            contents.append(parsed_line['contents'])
+            size += sys.getsizeof(parsed_line['contents']) + 16 # 본문 문자열 + 목록 슬롯 2개
+    return chapters, size
+
+
+def load_parsed_book(bible_book: str, file_path: str) -> dict:
+    """
+    파싱된 책 {장: ([절 번호, ...], [본문, ...])}을 캐시에서 가져오거나 파일을 파싱해 캐시에 넣습니다.
+    캐시가 BOOK_CACHE_MAX_BYTES를 넘으면 가장 오래 쓰지 않은 책부터 내보냅니다.
+    """
+    global _book_cache_bytes
+    signature = source_signature(file_path)
+    with _book_cache_lock:
+        cached = _book_cache.get(bible_book)
+        if cached is not None and cached[0] == signature:
+            _book_cache.move_to_end(bible_book)
+            BOOK_CACHE_STATS["hits"] += 1
+            return cached[1]
+        if cached is not None:
+            BOOK_CACHE_STATS["invalidations"] += 1 # 파일이 바뀌어 다시 파싱
+            _book_cache_bytes -= _book_cache.pop(bible_book)[2]
+        BOOK_CACHE_STATS["misses"] += 1
+
+    chapters, size = _parse_book_file(file_path, bible_book)
+    with _book_cache_lock:
+        if bible_book in _book_cache: # 다른 스레드가 먼저 넣었으면 교체
+            _book_cache_bytes -= _book_cache.pop(bible_book)[2]
+        _book_cache[bible_book] = (signature, chapters, size)
+        _book_cache_bytes += size
+        while _book_cache_bytes > BOOK_CACHE_MAX_BYTES and len(_book_cache) > 1:
+            _book_cache_bytes -= _book_cache.popitem(last=False)[1][2]
+            BOOK_CACHE_STATS["evictions"] += 1
+    return chapters
+
+
+def _slice_parsed_book(chapters: dict, bible_book: str, begin_ch: int, begin_verse: int, end_ch: int, end_verse: int) -> list:
+    """파싱된 책에서 범위의 구절을 잘라냅니다. (구절 색인의 BibleIndex.get_range와 같은 규칙)"""
+    if begin_ch not in chapters or end_ch not in chapters or begin_ch > end_ch:
+        return []
+    start = bisect.bisect_left(chapters[begin_ch][0], begin_verse)
+    end = bisect.bisect_right(chapters[end_ch][0], end_verse)
+    if start >= len(chapters[begin_ch][0]) or end == 0:
+        return []
+
+    verses = []
+    for chapter in sorted(ch for ch in chapters if begin_ch <= ch <= end_ch):
+        verse_numbers, contents = chapters[chapter]
+        first = start if chapter == begin_ch else 0
+        last = end if chapter == end_ch else len(verse_numbers)
+        verses.extend(
+            {"title": f"{bible_book} {chapter}:{verse_numbers[i]}", "contents": contents[i]}
+            for i in range(first, last)
+        )
+    return verses
+
 def get_bible_contents(bible_book: str, begin_ch: int, begin_verse: int, end_ch: int, end_verse: int) -> list:
     """
     로컬 TXT 파일에서 지정된 범위의 성경 구절 내용을 가져옵니다.
+    구절 색인(BIBLE_INDEX_PATH)이 있고 책 파일이 색인 이후 바뀌지 않았으면 색인에서 범위만 잘라 읽고,
+    아니면 파싱된 책 캐시(load_parsed_book)에서 잘라 읽습니다.
     """
+    return get_bible_ranges([{
+        "book": bible_book, "begin_ch": begin_ch, "begin_verse": begin_verse, "end_ch": end_ch, "end_verse": end_verse,
+    }])
+
+
+def get_bible_ranges(verse_ranges: list) -> list:
+    """
+    여러 범위({"book", "begin_ch", "begin_verse", "end_ch", "end_verse"}, utils/scripture_reference.py)의 구절을
+    범위 순서대로 한 목록으로 가져옵니다. 색인은 한 번만 열고 책마다 색인/파싱된 책을 한 번만 고르며,
+    앞 범위와 겹치는 구절은 한 번만 넣습니다.
+    end_verse가 None이면 장 끝까지, end_ch가 None이면 책의 마지막 장까지입니다.
+    """
+    bible_index = get_bible_index()
+    sources = {} # 책 이름 -> (장 번호 목록, 범위를 잘라 읽는 함수)
+    verses = []
+    seen_titles = set()
+    for verse_range in verse_ranges:
+        bible_book = verse_range["book"]
+        if bible_book not in sources:
+            sources[bible_book] = _open_book_source(bible_book, bible_index)
+        chapter_numbers, read_range = sources[bible_book]
+
+        begin_ch, begin_verse = verse_range["begin_ch"], verse_range["begin_verse"]
+        end_ch = verse_range["end_ch"] if verse_range["end_ch"] is not None else (chapter_numbers[-1] if chapter_numbers else 0)
+        end_verse = verse_range["end_verse"] if verse_range["end_verse"] is not None else sys.maxsize
+        range_verses = read_range(begin_ch, begin_verse, end_ch, end_verse)
+        if not range_verses:
+            end_text = f"{end_ch}:{end_verse}" if verse_range["end_verse"] is not None else f"{end_ch}장 끝"
+            raise ValueError(f"성경 구절 '{bible_book} {begin_ch}:{begin_verse}-{end_text}'을 파일에서 찾을 수 없거나 범위가 잘못되었습니다.")
+        for verse in range_verses:
+            if verse["title"] not in seen_titles:
+                seen_titles.add(verse["title"])
+                verses.append(verse)
+    return verses
+
+
+def _open_book_source(bible_book: str, bible_index) -> tuple:
+    """책의 (장 번호 목록, 범위를 잘라 읽는 함수). 색인이 최신이면 색인, 아니면 파싱된 책 캐시를 씁니다."""
     bible_file_name = BIBLE_FILE_MAP.get(bible_book)
     if not bible_file_name:
         raise ValueError(f"성경책 '{bible_book}'에 대한 파일 정보를 찾을 수 없습니다. 'utils/bible_text_parser.py'의 BIBLE_FILE_MAP을 확인하고 채워주세요.")
@@ -119,38 +285,7 @@ def get_bible_contents(bible_book: str, begin_ch: int, begin_verse: int, end_ch:
     if not os.path.exists(file_path):
         raise FileNotFoundError(f"성경 파일 '{file_path}'에 대한 성경 파일을 찾을 수 없습니다. 'core/data/bible_text/' 폴더에 파일이 있고 이름이 정확한지 확인해주세요.")
 
-    verses = []
-    is_in_range = False # 구절 범위 시작 플래그
-
-    with open(file_path, 'r', encoding='EUC-KR') as f:
-        for line in f:
-            parsed_line = parse_verse_line(line, bible_book)
-            if not parsed_line:
-                continue
-
-            current_ch = parsed_line['chapter']
-            current_verse = parsed_line['verse']
-            
-            # 범위 시작 조건
-            if current_ch == begin_ch and current_verse == begin_verse:
-                is_in_range = True
-            
-            # 범위 끝 조건
-            if is_in_range:
-                if current_ch == end_ch and current_verse > end_verse:
-                    is_in_range = False # 범위 초과, 종료
-            
-            if is_in_range:
-                verses.append({
-                    "title": parsed_line['title'], # 예: "창1:1"
-                    "contents": parsed_line['contents']
-                })
-            
-            # 범위 끝을 넘어서면 더 이상 읽을 필요 없음 (최적화)
-            if current_ch > end_ch and is_in_range:
-                break # 다음 장으로 넘어갔고 이미 범위를 벗어났으면 중단
-
-    if not verses:
-        raise ValueError(f"성경 구절 '{bible_book} {begin_ch}:{begin_verse}-{end_ch}:{end_verse}'을 파일에서 찾을 수 없거나 범위가 잘못되었습니다.")
-    
-    return verses
\ No newline at end of file
+    if bible_index is not None and bible_index.is_current(bible_book, file_path):
+        return bible_index.chapter_numbers(bible_book), lambda *verse_range: bible_index.get_range(bible_book, *verse_range)
+    chapters = load_parsed_book(bible_book, file_path)
+    return sorted(chapters), lambda *verse_range: _slice_parsed_book(chapters, bible_book, *verse_range)
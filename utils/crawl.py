@@ -4,10 +4,11 @@ import requests
 from bs4 import BeautifulSoup
 import re # 정규표현식 모듈 임포트
 
-def crawl_lyrics(url: str) -> str:
+def crawl_lyrics(url: str, session: requests.Session = None) -> str:
     """
     주어진 URL에서 찬양 가사를 크롤링합니다.
     현재는 Bugs (벅스) 사이트에서 가사를 크롤링하도록 구현되어 있습니다.
+    `session`을 넘기면 연결(keep-alive)을 재사용합니다. (여러 예배를 일괄 생성할 때)
     """
     # URL이 벅스 사이트인지 확인
     if not url.startswith("https://music.bugs.co.kr/"):
@@ -16,7 +17,7 @@ def crawl_lyrics(url: str) -> str:
         headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         }
-        response = requests.get(url, headers=headers, timeout=10)
+        response = (session or requests).get(url, headers=headers, timeout=10)
         response.raise_for_status() # HTTP 오류 발생 시 예외 발생
 
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -0,0 +1,65 @@
+# utils/deck_fingerprint.py
+
+# 생성된 PPT의 입력 지문(fingerprint).
+# 템플릿 버전, 예배 정보, 찬양 가사 페이지, 광고, 성경 본문을 정규화한 뒤 SHA-256으로 해시합니다.
+# 같은 입력으로 다시 생성을 요청하면 지문이 같으므로 이미 만들어진 파일을 그대로 재사용할 수 있습니다.
+
+import hashlib
+import json
+
+# 슬라이드 생성 로직이 바뀌어 같은 입력이라도 결과가 달라질 때 올려서 기존 지문을 무효화합니다.
+FINGERPRINT_VERSION = 1
+
+# 파일 이름 등에 사용하는 짧은 지문 길이
+SHORT_FINGERPRINT_LENGTH = 12
+
+# 가사 크롤링/분할에 실패했을 때 가사 대신 들어가는 문구 (core/tasks.py, utils/llm.py, utils/crawl.py)
+PLACEHOLDER_LYRICS = ("가사를 가져올 수 없습니다.", "가사를 찾을 수 없습니다.", "가사 분할 중 오류 발생.")
+CRAWL_ERROR_PREFIX = "가사 크롤링 중" # utils.crawl.crawl_lyrics가 실패 시 반환하는 메시지
+
+
+def compute_deck_fingerprint(
+    template_version: dict,
+    worship_fields: dict,
+    songs: list,
+    announcements: list,
+    bible_contents: list,
+) -> str:
+    """
+    PPT 입력 전체에 대한 SHA-256 지문(16진수 64자)을 반환합니다.
+    모든 인자는 JSON으로 직렬화 가능한 값이어야 하며 (날짜 등은 문자열로 변환됨),
+    `songs`는 순서가 의미 있으므로 호출하는 쪽에서 찬양 순서대로 정렬해 전달해야 합니다.
+    """
+    payload = {
+        "version": FINGERPRINT_VERSION,
+        "template": template_version,
+        "worship": worship_fields,
+        "songs": songs,
+        "announcements": announcements,
+        "bible": bible_contents,
+    }
+    encoded = json.dumps(payload, ensure_ascii=False, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def short_fingerprint(fingerprint: str) -> str:
+    return fingerprint[:SHORT_FINGERPRINT_LENGTH]
+
+
+def is_placeholder_lyrics(text: str) -> bool:
+    """가사가 비어 있거나 크롤링/분할 실패 시 들어가는 문구이면 True"""
+    text = (text or "").strip()
+    return not text or text in PLACEHOLDER_LYRICS or text.startswith(CRAWL_ERROR_PREFIX)
+
+
+def has_placeholder_lyrics(songs: list) -> bool:
+    """
+    지문 입력의 찬양 목록({"lyrics": ..., "lyrics_pages": [...]} 형태)에 실패 문구로 채워진 찬양이 있으면 True.
+    이런 입력의 지문은 저장하지 않아야 다음 요청에서 크롤링/분할을 다시 시도합니다.
+    """
+    return any(
+        is_placeholder_lyrics(song.get("lyrics"))
+        or not song.get("lyrics_pages")
+        or any(is_placeholder_lyrics(page) for page in song["lyrics_pages"])
+        for song in songs
+    )
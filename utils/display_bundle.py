@@ -0,0 +1,102 @@
+# utils/display_bundle.py
+
+# 로비 화면/방송 자막용 텍스트 슬라이드 묶음.
+# 50MB짜리 PPTX 대신 슬라이드 플랜(utils.slide_plan)의 텍스트(찬양 제목, 가사 페이지, 성경 본문, 광고 등)만
+# 슬라이드 순서대로 JSON에 담고, 이를 키보드로 넘겨 볼 수 있는 HTML 한 파일에 내장합니다.
+# 외부 파일(CSS/JS/글꼴)을 참조하지 않으므로 저사양 디스플레이 기기에서도 파일 하나만 열면 바로 표시됩니다.
+
+import html
+import json
+from string import Template
+
+# 번들 JSON 형식이 바뀌면 올립니다. (디스플레이 기기 쪽 스크립트가 확인할 수 있도록 JSON에 포함)
+DISPLAY_BUNDLE_VERSION = 1
+
+DISPLAY_HTML_TEMPLATE = Template("""<!DOCTYPE html>
+<html lang="ko">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>$title</title>
+<style>
+    html, body { margin: 0; height: 100%; background: #000; color: #fff; font-family: sans-serif; }
+    #slide { box-sizing: border-box; height: 100%; padding: 5vh 6vw; display: flex; flex-direction: column;
+             justify-content: center; align-items: center; text-align: center; }
+    #slide.left { align-items: flex-start; text-align: left; }
+    #slide-title { font-size: 6vh; font-weight: bold; margin: 0 0 3vh; white-space: pre-line; }
+    #slide-body { font-size: 5vh; line-height: 1.5; margin: 0; white-space: pre-line; }
+    #slide-counter { position: fixed; right: 2vw; bottom: 2vh; font-size: 2vh; color: #888; }
+</style>
+</head>
+<body>
+<div id="slide"><p id="slide-title"></p><p id="slide-body"></p></div>
+<div id="slide-counter"></div>
+<script type="application/json" id="slides-data">$bundle_json</script>
+<script>
+(function () {
+    var bundle = JSON.parse(document.getElementById("slides-data").textContent);
+    var slides = bundle.slides;
+    var index = 0;
+    var match = /^#(\\d+)$$/.exec(window.location.hash);
+    if (match) { index = Math.min(Math.max(parseInt(match[1], 10) - 1, 0), Math.max(slides.length - 1, 0)); }
+
+    function show(newIndex) {
+        if (!slides.length) { return; }
+        index = Math.min(Math.max(newIndex, 0), slides.length - 1);
+        var slide = slides[index];
+        document.getElementById("slide").className = slide.align_center ? "" : "left";
+        document.getElementById("slide-title").textContent = slide.title;
+        document.getElementById("slide-body").textContent = slide.body;
+        document.getElementById("slide-counter").textContent = (index + 1) + " / " + slides.length;
+        history.replaceState(null, "", "#" + (index + 1));
+    }
+
+    document.addEventListener("keydown", function (event) {
+        if (["ArrowRight", "ArrowDown", "PageDown", " ", "Enter"].indexOf(event.key) >= 0) { show(index + 1); }
+        else if (["ArrowLeft", "ArrowUp", "PageUp", "Backspace"].indexOf(event.key) >= 0) { show(index - 1); }
+        else if (event.key === "Home") { show(0); }
+        else if (event.key === "End") { show(slides.length - 1); }
+        else { return; }
+        event.preventDefault();
+    });
+    document.addEventListener("click", function () { show(index + 1); });
+    show(index);
+})();
+</script>
+</body>
+</html>
+""")
+
+
+def build_display_slides(plan: list) -> list:
+    """
+    플랜에서 텍스트가 있는 슬라이드만 순서대로 [{"role", "section", "title", "body", "align_center"}, ...]로 만듭니다.
+    제목 Placeholder 수정은 title, 나머지 수정은 body가 됩니다. 텍스트 수정이 없는 고정 슬라이드(static)는 제외합니다.
+    """
+    slides = []
+    for entry in plan:
+        titles = [edit["new_text"] for edit in entry["edits"] if edit.get("is_title") and edit.get("new_text")]
+        bodies = [edit["new_text"] for edit in entry["edits"] if not edit.get("is_title") and edit.get("new_text")]
+        if not titles and not bodies:
+            continue
+        slides.append({
+            "role": entry["role"],
+            "section": entry["section"],
+            "title": "\n".join(titles),
+            "body": "\n".join(bodies).replace("\v", "\n"),
+            "align_center": all(edit.get("align_center", True) for edit in entry["edits"]),
+        })
+    return slides
+
+
+def build_display_bundle(plan: list, title: str = "") -> dict:
+    """디스플레이 기기가 그대로 읽을 수 있는 JSON 번들 {"version", "title", "slides"}"""
+    return {"version": DISPLAY_BUNDLE_VERSION, "title": title, "slides": build_display_slides(plan)}
+
+
+def render_display_html(bundle: dict) -> str:
+    """번들 JSON을 내장한 키보드 탐색 HTML 문서 한 개를 반환합니다. (방향키/Space/PageUp/PageDown/Home/End, 클릭)"""
+    bundle_json = json.dumps(bundle, ensure_ascii=False, separators=(",", ":"))
+    # <script> 안에 넣으므로 "</script>" 등으로 태그가 닫히지 않게 합니다. ("<"는 JSON 문자열 안에만 나옴)
+    bundle_json = bundle_json.replace("<", "\\u003c")
+    return DISPLAY_HTML_TEMPLATE.substitute(title=html.escape(bundle.get("title") or ""), bundle_json=bundle_json)
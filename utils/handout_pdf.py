@@ -0,0 +1,195 @@
+# utils/handout_pdf.py
+
+# 가사/성경 본문 PDF 유인물.
+# PPTX를 변환하지 않고 슬라이드 플랜(utils.slide_plan)의 텍스트 데이터로 바로 A4 페이지를 그립니다.
+# 찬양(제목 + 가사 페이지)과 성경봉독(본문 범위 + 구절)이 각각 한 섹션이 되고, 섹션마다 새 페이지에서 시작합니다.
+# 섹션 페이지는 내용 해시를 키로 캐시하므로 같은 찬양이 다른 주에 나와도 다시 그리지 않으며,
+# `workers`가 2 이상이면 새로 그릴 섹션을 작업 프로세스에 나누어 맡깁니다. 결과는 플랜 순서대로 합칩니다.
+
+import hashlib
+import io
+import json
+import threading
+from collections import OrderedDict
+
+from utils.process_pool import can_use_process_pool, map_in_process_pool
+from utils.text_fit import configure_text_fit, get_font_dirs, load_font, wrap_line, LINE_HEIGHT_RATIO
+
+# 그리는 방식이 바뀌면 올려서 기존 섹션 캐시를 무효화합니다.
+HANDOUT_VERSION = 1
+HANDOUT_DPI = 150
+# A4 (210 x 297mm) @ 150dpi
+PAGE_WIDTH_PX = 1240
+PAGE_HEIGHT_PX = 1754
+MARGIN_PX = 118 # 2cm
+HEADING_SIZE_PX = 40
+BODY_SIZE_PX = 28
+JPEG_QUALITY = 90
+DEFAULT_HANDOUT_FONT = "NanumGothic"
+
+SONG_TITLE_ROLES = {"song_title", "ending_song_title"}
+DEFAULT_BIBLE_HEADING = "성경봉독"
+
+# 렌더링된 섹션 페이지(PNG 바이트 목록) 캐시. 키는 섹션 내용/글꼴/페이지 설정의 해시입니다.
+HANDOUT_CACHE_MAX_ENTRIES = 128
+HANDOUT_CACHE_STATS = {"hits": 0, "misses": 0}
+_handout_cache = OrderedDict()
+_handout_cache_lock = threading.Lock()
+
+
+def reset_handout_cache_stats():
+    HANDOUT_CACHE_STATS["hits"] = 0
+    HANDOUT_CACHE_STATS["misses"] = 0
+
+
+def clear_handout_cache():
+    with _handout_cache_lock:
+        _handout_cache.clear()
+
+
+def _edit_texts(entry: dict) -> list:
+    return [edit["new_text"] for edit in entry["edits"] if edit.get("new_text")]
+
+
+def build_handout_sections(plan: list) -> list:
+    """
+    플랜에서 유인물에 들어갈 섹션 [{"heading": ..., "paragraphs": [...]}, ...]을 플랜 순서대로 뽑습니다.
+    찬양은 제목 슬라이드가 제목, 가사 페이지가 문단이 되고, 성경봉독은 본문 범위 슬라이드가 제목,
+    구절 페이지("구절 제목 본문")가 문단이 됩니다.
+    """
+    sections = []
+    song_sections = {} # 플랜 section 값 -> 유인물 섹션 (제목과 가사 슬라이드가 같은 section 값을 가짐)
+    bible_heading = DEFAULT_BIBLE_HEADING
+    for entry in plan:
+        role = entry["role"]
+        texts = _edit_texts(entry)
+        if role == "bible_range":
+            bible_heading = " ".join(texts) or DEFAULT_BIBLE_HEADING
+        elif role in SONG_TITLE_ROLES or role == "lyrics":
+            section = song_sections.get(entry["section"])
+            if section is None:
+                section = song_sections[entry["section"]] = {"heading": "", "paragraphs": []}
+                sections.append(section)
+            if role in SONG_TITLE_ROLES:
+                section["heading"] = " ".join(texts)
+            else:
+                section["paragraphs"].append("\n".join(texts))
+        elif role == "bible":
+            if not sections or sections[-1].get("kind") != "bible":
+                sections.append({"heading": bible_heading, "paragraphs": [], "kind": "bible"})
+            sections[-1]["paragraphs"].append(" ".join(texts))
+    return [{"heading": section["heading"], "paragraphs": section["paragraphs"]} for section in sections]
+
+
+def _section_cache_key(section: dict, typeface: str) -> str:
+    return hashlib.sha256(json.dumps(
+        [HANDOUT_VERSION, HANDOUT_DPI, typeface, section["heading"], section["paragraphs"]],
+        ensure_ascii=False,
+    ).encode("utf-8")).hexdigest()
+
+
+def _layout_lines(draw, section: dict, heading_font, body_font) -> list:
+    """섹션을 [(줄 텍스트, 글꼴, 글자 크기(px), 앞 여백(px)), ...]으로 줄바꿈합니다."""
+    max_width = PAGE_WIDTH_PX - 2 * MARGIN_PX
+    lines = []
+    for line in wrap_line(draw, section["heading"], heading_font, max_width) if section["heading"] else []:
+        lines.append((line, heading_font, HEADING_SIZE_PX, 0))
+    space_before = HEADING_SIZE_PX if lines else 0
+    for paragraph in section["paragraphs"]:
+        for text_line in paragraph.replace("\v", "\n").split("\n"):
+            for line in wrap_line(draw, text_line.strip(), body_font, max_width):
+                lines.append((line, body_font, BODY_SIZE_PX, space_before))
+                space_before = 0
+        space_before = BODY_SIZE_PX # 문단(가사 페이지/구절) 사이 한 줄 여백
+    return lines
+
+
+def render_handout_section(section: dict, typeface: str = DEFAULT_HANDOUT_FONT) -> list:
+    """섹션 하나를 새 페이지부터 그려 페이지별 PNG 바이트 목록으로 반환합니다. 넘치는 줄은 다음 페이지로 넘깁니다."""
+    from PIL import Image, ImageDraw
+
+    heading_font = load_font(typeface, HEADING_SIZE_PX)
+    body_font = load_font(typeface, BODY_SIZE_PX)
+    pages = []
+    page = draw = None
+    y = 0
+    for line, font, size_px, space_before in _layout_lines(
+        ImageDraw.Draw(Image.new("L", (1, 1))), section, heading_font, body_font
+    ):
+        line_height = size_px * LINE_HEIGHT_RATIO
+        if page is not None and y + space_before + line_height > PAGE_HEIGHT_PX - MARGIN_PX:
+            page = None
+        if page is None:
+            page = Image.new("L", (PAGE_WIDTH_PX, PAGE_HEIGHT_PX), 255)
+            draw = ImageDraw.Draw(page)
+            pages.append(page)
+            y = MARGIN_PX
+        else:
+            y += space_before
+        draw.text((MARGIN_PX, y), line, fill=0, font=font)
+        y += line_height
+
+    encoded_pages = []
+    for page in pages:
+        buffer = io.BytesIO()
+        page.save(buffer, "PNG")
+        encoded_pages.append(buffer.getvalue())
+    return encoded_pages
+
+
+def _init_handout_worker(font_dirs: list):
+    configure_text_fit(font_dirs)
+
+
+def _render_section_in_worker(job: tuple) -> list:
+    return render_handout_section(*job)
+
+
+def render_handout_pdf(plan: list, output, title: str = None, typeface: str = DEFAULT_HANDOUT_FONT,
+                       workers: int = 1) -> int:
+    """
+    슬라이드 플랜의 가사/성경 본문을 PDF로 만들어 `output`(경로 또는 쓰기 가능한 바이너리 스트림)에 쓰고 페이지 수를 반환합니다.
+    `title`은 PDF 문서 정보의 제목(예: 표지의 주일 날짜)으로 들어갑니다.
+    `typeface` 글꼴이 없거나 한글을 그릴 수 없으면 아무것도 쓰지 않고 MissingFontError를 발생시킵니다.
+    """
+    from PIL import Image
+
+    sections = build_handout_sections(plan)
+    section_pages = [None] * len(sections)
+    render_jobs = [] # [(섹션 번호, 캐시 키)]
+    for number, section in enumerate(sections):
+        cache_key = _section_cache_key(section, typeface)
+        with _handout_cache_lock:
+            section_pages[number] = _handout_cache.get(cache_key)
+            if section_pages[number] is not None:
+                _handout_cache.move_to_end(cache_key)
+        HANDOUT_CACHE_STATS["hits" if section_pages[number] is not None else "misses"] += 1
+        if section_pages[number] is None:
+            render_jobs.append((number, cache_key))
+
+    jobs = [(sections[number], typeface) for number, _ in render_jobs]
+    if jobs:
+        load_font(typeface, BODY_SIZE_PX) # 작업 프로세스로 넘기기 전에 글꼴을 확인합니다.
+    if can_use_process_pool(workers, len(jobs), label="handout rendering"):
+        rendered = map_in_process_pool(
+            _render_section_in_worker, jobs, workers,
+            initializer=_init_handout_worker, initargs=(get_font_dirs(),),
+        )
+    else:
+        rendered = [render_handout_section(*job) for job in jobs]
+
+    for (number, cache_key), pages in zip(render_jobs, rendered):
+        section_pages[number] = pages
+        with _handout_cache_lock:
+            _handout_cache[cache_key] = pages
+            while len(_handout_cache) > HANDOUT_CACHE_MAX_ENTRIES:
+                _handout_cache.popitem(last=False)
+
+    images = [Image.open(io.BytesIO(png)) for pages in section_pages for png in pages]
+    if not images:
+        images = [Image.new("L", (PAGE_WIDTH_PX, PAGE_HEIGHT_PX), 255)] # 가사/성경이 없는 플랜도 빈 PDF를 만듭니다.
+    images[0].save(
+        output, "PDF", save_all=True, append_images=images[1:],
+        resolution=HANDOUT_DPI, quality=JPEG_QUALITY, title=title or "",
+    )
+    return len(images)
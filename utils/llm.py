@@ -16,18 +16,27 @@ class SplittedLyricsResponse(BaseModel):
     splitted_lyrics: List[str] = Field(description="가사가 PPT 페이지별로 분할된 리스트")
 
 
-def _call_gemini_api(prompt_parts: str, response_schema: BaseModel = None) -> dict: # response_schema를 BaseModel 타입으로 힌트
-    """
-    Gemini API에 요청을 보내고 JSON 응답을 파싱합니다.
-    google.genai 라이브러리를 활용합니다. Pydantic 모델을 response_schema로 받을 수 있습니다.
-    """
+# API 키별 Gemini 클라이언트. 워커 프로세스 안의 모든 요청(일괄 생성 포함)이 연결을 공유합니다.
+_gemini_clients = {}
+
+
+def get_gemini_client() -> genai.Client:
     api_key = settings.GEMINI_API_KEY
 
     if not api_key:
         raise ValueError("GEMINI_API_KEY가 Django settings에 설정되지 않았습니다.")
 
+    if api_key not in _gemini_clients:
+        _gemini_clients[api_key] = genai.Client(api_key=api_key)
+    return _gemini_clients[api_key]
 
-    client: genai.Client = genai.Client(api_key=api_key)
+
+def _call_gemini_api(prompt_parts: str, response_schema: BaseModel = None) -> dict: # response_schema를 BaseModel 타입으로 힌트
+    """
+    Gemini API에 요청을 보내고 JSON 응답을 파싱합니다.
+    google.genai 라이브러리를 활용합니다. Pydantic 모델을 response_schema로 받을 수 있습니다.
+    """
+    client: genai.Client = get_gemini_client()
 
     generation_config_params = {}
     if response_schema:
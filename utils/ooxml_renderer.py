@@ -0,0 +1,469 @@
+# utils/ooxml_renderer.py
+
+# python-pptx 객체 모델(Presentation/패키지 그래프) 없이 PPTX ZIP을 직접 다루는 렌더 엔진.
+# 템플릿에서 변경되지 않는 항목(미디어, 레이아웃, 마스터 등)은 압축된 바이트 그대로 복사하고,
+# 슬라이드 플랜에 따라 바뀌는 슬라이드 XML, presentation.xml, 관계(.rels), [Content_Types].xml만 다시 씁니다.
+# 슬라이드 XML을 만들고 텍스트를 채우는 부분은 python-pptx의 oxml 요소와 utils.update_pptx의
+# 편집 로직을 그대로 사용하므로, python-pptx 엔진과 같은 슬라이드 내용이 만들어집니다.
+
+import hashlib
+import json
+import os
+import posixpath
+import threading
+import zipfile
+from collections import OrderedDict
+
+from lxml import etree
+from pptx.opc.constants import CONTENT_TYPE as CT, RELATIONSHIP_TYPE as RT
+from pptx.opc.oxml import CT_Relationships
+from pptx.oxml import parse_xml
+from pptx.oxml.slide import CT_Slide
+from pptx.shapes.shapetree import SlideShapes
+from pptx.slide import SlideLayout, SlideMaster
+
+from utils.process_pool import can_use_process_pool, map_in_process_pool
+from utils.zip_stream import ZipStreamWriter, prepare_entries
+
+CONTENT_TYPES_PARTNAME = "[Content_Types].xml"
+PRESENTATION_PARTNAME = "ppt/presentation.xml"
+PRESENTATION_RELS_PARTNAME = "ppt/_rels/presentation.xml.rels"
+
+# 렌더링된 찬양 섹션(제목/가사 슬라이드 XML) 캐시.
+# 키는 (원본 슬라이드 XML 해시, 레이아웃 XML 해시, 페이지별 수정 내용 해시)로 내용 기반이므로
+# 템플릿이 바뀌면 자연히 다른 키가 되고, 같은 찬양이 다른 순서/주에 나와도 재사용됩니다.
+SECTION_CACHE_ROLES = {"song_title", "lyrics", "ending_song_title"}
+SECTION_CACHE_MAX_ENTRIES = 256
+SECTION_CACHE_STATS = {"hits": 0, "misses": 0}
+_section_cache = OrderedDict()
+_section_cache_lock = threading.Lock()
+
+# 병렬 렌더링 작업 프로세스마다 한 번 여는 템플릿 ZIP과 파싱된 레이아웃
+_worker_template_zip = None
+_worker_layouts = {}
+
+
+class _XmlPart:
+    """
+    python-pptx 도형이 상속 값(Placeholder 크기, 마스터 텍스트 스타일, 테마 글꼴)을 찾을 때 참조하는
+    파트 속성(slide_layout, slide_master, part_related_by)만 제공합니다.
+    """
+
+    def __init__(self, slide_layout=None, slide_master=None, blob=None, related_parts=None):
+        self.slide_layout = slide_layout
+        self.slide_master = slide_master
+        self.blob = blob
+        self._related_parts = related_parts or {}
+
+    def part_related_by(self, reltype: str):
+        return self._related_parts[reltype]
+
+
+class _XmlSlide:
+    """
+    utils.update_pptx의 텍스트 편집 함수가 요구하는 최소한의 슬라이드 인터페이스(`shapes`)를
+    파싱된 슬라이드 XML 위에 제공합니다. `slide_layout`이 있으면 Placeholder가 레이아웃/마스터의 값을 상속합니다.
+    """
+
+    def __init__(self, slide_element, slide_layout=None):
+        self.element = slide_element
+        self.part = _XmlPart(slide_layout=slide_layout)
+        self.shapes = SlideShapes(slide_element.cSld.spTree, self)
+
+
+def _rels_partname(partname: str) -> str:
+    """'ppt/slides/slide1.xml' -> 'ppt/slides/_rels/slide1.xml.rels'"""
+    directory, filename = posixpath.split(partname)
+    return posixpath.join(directory, "_rels", f"{filename}.rels")
+
+
+def _resolve_target(source_partname: str, target: str) -> str:
+    """관계의 상대 경로 Target을 ZIP 항목 이름으로 변환합니다."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(source_partname), target))
+
+
+def _relative_target(source_partname: str, target_partname: str) -> str:
+    return posixpath.relpath(target_partname, posixpath.dirname(source_partname))
+
+
+def _read_relationships(template_zip: zipfile.ZipFile, partname: str) -> dict:
+    """파트의 관계 파일을 읽어 {rId: (reltype, 대상 항목 이름)}을 반환합니다."""
+    rels_partname = _rels_partname(partname)
+    if rels_partname not in template_zip.NameToInfo:
+        return {}
+    rels_element = etree.fromstring(template_zip.read(rels_partname))
+    relationships = {}
+    for rel in rels_element:
+        if rel.get("TargetMode") == "External":
+            continue
+        relationships[rel.get("Id")] = (rel.get("Type"), _resolve_target(partname, rel.get("Target")))
+    return relationships
+
+
+def _serialize(element) -> bytes:
+    # python-pptx의 serialize_part_xml과 같은 형식
+    return etree.tostring(element, encoding="UTF-8", standalone=True)
+
+
+def read_template_slides(template_zip: zipfile.ZipFile) -> list:
+    """
+    템플릿의 슬라이드를 표시 순서대로 [{"partname", "sld_id", "layout_partname"}, ...]로 반환합니다.
+    """
+    presentation = parse_xml(template_zip.read(PRESENTATION_PARTNAME))
+    presentation_rels = _read_relationships(template_zip, PRESENTATION_PARTNAME)
+    sld_id_lst = presentation.sldIdLst
+    slides = []
+    for sld_id in (sld_id_lst if sld_id_lst is not None else []):
+        slide_partname = presentation_rels[sld_id.rId][1]
+        layout_partname = None
+        for reltype, target in _read_relationships(template_zip, slide_partname).values():
+            if reltype == RT.SLIDE_LAYOUT:
+                layout_partname = target
+                break
+        slides.append({"partname": slide_partname, "sld_id": sld_id, "layout_partname": layout_partname})
+    return slides
+
+
+def get_template_slide_count(template_path) -> int:
+    """presentation.xml만 읽어 템플릿의 슬라이드 수를 반환합니다."""
+    with zipfile.ZipFile(template_path) as template_zip:
+        presentation = parse_xml(template_zip.read(PRESENTATION_PARTNAME))
+        sld_id_lst = presentation.sldIdLst
+        return 0 if sld_id_lst is None else len(sld_id_lst)
+
+
+def _related_partname(package_zip: zipfile.ZipFile, partname: str, reltype: str):
+    for rel_reltype, target in _read_relationships(package_zip, partname).values():
+        if rel_reltype == reltype:
+            return target
+    return None
+
+
+def _load_layout(package_zip: zipfile.ZipFile, layouts: dict, layout_partname: str) -> SlideLayout:
+    """
+    레이아웃을 마스터/테마와 연결된 SlideLayout으로 읽어 `layouts`({항목 이름: 객체})에 캐시합니다.
+    마스터도 같은 dict에 항목 이름으로 캐시하므로 레이아웃이 여러 개여도 마스터는 한 번만 파싱합니다.
+    """
+    if layout_partname not in layouts:
+        master_partname = _related_partname(package_zip, layout_partname, RT.SLIDE_MASTER)
+        slide_master = None
+        if master_partname is not None:
+            if master_partname not in layouts:
+                theme_partname = _related_partname(package_zip, master_partname, RT.THEME)
+                related_parts = {}
+                if theme_partname is not None:
+                    related_parts[RT.THEME] = _XmlPart(blob=package_zip.read(theme_partname))
+                layouts[master_partname] = SlideMaster(
+                    parse_xml(package_zip.read(master_partname)), _XmlPart(related_parts=related_parts)
+                )
+            slide_master = layouts[master_partname]
+        layouts[layout_partname] = SlideLayout(
+            parse_xml(package_zip.read(layout_partname)), _XmlPart(slide_master=slide_master)
+        )
+    return layouts[layout_partname]
+
+
+def new_slide_element(layout_element):
+    """
+    python-pptx의 Slides.add_slide와 같은 방식으로 레이아웃의 Placeholder를 복제한 새 슬라이드 XML을 만듭니다.
+    """
+    slide_element = CT_Slide.new()
+    SlideShapes(slide_element.cSld.spTree, None).clone_layout_placeholders(SlideLayout(layout_element, None))
+    return slide_element
+
+
+def render_slide_xml(slide_element, edits: list, slide_label=None, slide_layout=None, tokens: dict = None) -> bytes:
+    """
+    슬라이드 XML 요소에 {{토큰}} 치환(`tokens`)과 텍스트 수정 목록을 적용하고 직렬화된 바이트를 반환합니다.
+    `slide_layout`(_load_layout)이 있으면 글꼴 크기 맞춤에 레이아웃/마스터에서 상속한 크기와 글꼴을 사용합니다.
+    """
+    # update_pptx가 이 모듈을 지연 임포트하므로 순환 방지
+    from utils.update_pptx import _edit_slide_text, _replace_slide_tokens
+
+    slide = _XmlSlide(slide_element, slide_layout)
+    if tokens:
+        _replace_slide_tokens(slide, tokens)
+    for edit in edits:
+        _edit_slide_text(slide, slide_label=slide_label, **edit)
+    return _serialize(slide_element)
+
+
+def reset_section_cache_stats():
+    SECTION_CACHE_STATS["hits"] = 0
+    SECTION_CACHE_STATS["misses"] = 0
+
+
+def clear_section_cache():
+    with _section_cache_lock:
+        _section_cache.clear()
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _section_cache_key(source_digest: str, layout_digest: str, pages: list) -> tuple:
+    edits_digest = _sha256(json.dumps(pages, ensure_ascii=False, sort_keys=True).encode("utf-8"))
+    return source_digest, layout_digest, edits_digest
+
+
+def _group_plan_sections(plan: list) -> list:
+    """플랜을 같은 원본 슬라이드에서 연속으로 펼쳐진 항목 묶음 [(시작 위치, [항목, ...]), ...]으로 나눕니다."""
+    groups = []
+    for position, entry in enumerate(plan):
+        if groups and groups[-1][1][-1]["source_index"] == entry["source_index"] and entry["section"] is not None:
+            groups[-1][1].append(entry)
+        else:
+            groups.append((position, [entry]))
+    return groups
+
+
+def _render_section(template_zip: zipfile.ZipFile, layouts: dict, position: int, entries: list,
+                    source_partname: str, layout_partname: str, is_first_use: bool) -> list:
+    """
+    묶음의 페이지별 슬라이드 XML 목록을 만듭니다.
+    첫 페이지는 원본 슬라이드(첫 등장 시) 기반이고, 나머지는 레이아웃으로 만든 새 슬라이드입니다.
+    """
+    slide_layout = _load_layout(template_zip, layouts, layout_partname)
+    xml_pages = []
+    for offset, entry in enumerate(entries):
+        if offset == 0 and is_first_use:
+            slide_element = parse_xml(template_zip.read(source_partname))
+        else:
+            slide_element = new_slide_element(slide_layout._element)
+        xml_pages.append(render_slide_xml(slide_element, entry["edits"], position + offset, slide_layout, entry.get("tokens")))
+    return xml_pages
+
+
+def _init_section_worker(template_path):
+    global _worker_template_zip
+    _worker_template_zip = zipfile.ZipFile(template_path)
+    _worker_layouts.clear()
+
+
+def _render_section_in_worker(job: tuple) -> list:
+    return _render_section(_worker_template_zip, _worker_layouts, *job)
+
+
+def _can_render_in_parallel(template_path, workers: int, job_count: int) -> bool:
+    if not can_use_process_pool(workers, job_count):
+        return False
+    if not isinstance(template_path, (str, os.PathLike)):
+        print("Parallel rendering requires a template file path. Falling back to serial rendering.")
+        return False
+    return True
+
+
+def render_slide_plan_ooxml(template_path, plan: list, output, workers: int = 1, zip_level: int = None,
+                            zip_workers: int = 1):
+    """
+    템플릿 ZIP과 슬라이드 플랜으로 PPTX를 만들어 `output`(경로 또는 쓰기 가능한 바이너리 스트림)에 씁니다.
+    플랜 형식은 utils.slide_plan.build_slide_plan을 따릅니다.
+    `workers`가 2 이상이면 섹션(같은 원본 슬라이드에서 펼쳐진 묶음)별 렌더링을 작업 프로세스에 나누어 맡기고,
+    결과는 플랜 순서대로 합치므로 출력은 직렬 렌더링과 바이트 단위로 같습니다.
+    새로 쓰는 항목은 `zip_level`(None이면 6)로 압축하며 `zip_workers`개 스레드로 동시에 압축합니다.
+    """
+    with zipfile.ZipFile(template_path) as template_zip:
+        template_slides = read_template_slides(template_zip)
+
+        # 1. 섹션별로 원본 복사/캐시 재사용/새로 렌더링할 작업을 결정
+        part_digests = {} # 항목 이름 -> 원본 XML 해시
+        used_source_indices = set()
+        sections = [] # [[원본 슬라이드 정보, 첫 등장 여부, 페이지별 XML 목록(렌더링 전이면 None), 캐시 키]]
+        render_jobs = [] # [(섹션 번호, (position, entries, source_partname, layout_partname, is_first_use))]
+
+        def part_digest(partname):
+            if partname not in part_digests:
+                part_digests[partname] = _sha256(template_zip.read(partname))
+            return part_digests[partname]
+
+        def layout_digest(layout_partname):
+            # 글꼴 크기 맞춤은 레이아웃/마스터/테마에서 상속한 크기와 글꼴을 사용하므로 모두 키에 포함합니다.
+            if ("layout", layout_partname) not in part_digests:
+                master_partname = _related_partname(template_zip, layout_partname, RT.SLIDE_MASTER)
+                theme_partname = master_partname and _related_partname(template_zip, master_partname, RT.THEME)
+                part_digests[("layout", layout_partname)] = _sha256("".join(
+                    part_digest(partname) for partname in (layout_partname, master_partname, theme_partname) if partname
+                ).encode("ascii"))
+            return part_digests[("layout", layout_partname)]
+
+        for position, entries in _group_plan_sections(plan):
+            source_index = entries[0]["source_index"]
+            source = template_slides[source_index]
+            is_first_use = source_index not in used_source_indices
+            used_source_indices.add(source_index)
+            xml_pages = None
+            cache_key = None
+
+            if is_first_use and len(entries) == 1 and not entries[0]["edits"] and not entries[0].get("tokens"):
+                xml_pages = [None] # 수정 없는 원본 슬라이드는 바이트 그대로 복사
+            elif entries[0]["role"] in SECTION_CACHE_ROLES:
+                cache_key = _section_cache_key(
+                    part_digest(source["partname"]) if is_first_use else None,
+                    layout_digest(source["layout_partname"]),
+                    [[entry["edits"], entry.get("tokens")] for entry in entries],
+                )
+                with _section_cache_lock:
+                    xml_pages = _section_cache.get(cache_key)
+                    if xml_pages is not None:
+                        _section_cache.move_to_end(cache_key)
+                SECTION_CACHE_STATS["hits" if xml_pages is not None else "misses"] += 1
+
+            if xml_pages is None:
+                render_jobs.append((len(sections), (position, entries, source["partname"], source["layout_partname"], is_first_use)))
+            sections.append([source, is_first_use, xml_pages, cache_key])
+
+        # 2. 섹션 렌더링 (직렬 또는 작업 프로세스 병렬)
+        if _can_render_in_parallel(template_path, workers, len(render_jobs)):
+            rendered = map_in_process_pool(
+                _render_section_in_worker, [job for _, job in render_jobs], workers,
+                initializer=_init_section_worker, initargs=(template_path,),
+            )
+        else:
+            layouts = {}
+            rendered = [_render_section(template_zip, layouts, *job) for _, job in render_jobs]
+
+        for (section_number, _), xml_pages in zip(render_jobs, rendered):
+            sections[section_number][2] = xml_pages
+            cache_key = sections[section_number][3]
+            if cache_key is not None:
+                with _section_cache_lock:
+                    _section_cache[cache_key] = xml_pages
+                    while len(_section_cache) > SECTION_CACHE_MAX_ENTRIES:
+                        _section_cache.popitem(last=False)
+
+        # 3. 플랜 순서대로 병합: 새 슬라이드의 파트 이름은 여기서만 결정하므로 렌더링 방식과 무관하게 같습니다.
+        existing_names = set(template_zip.NameToInfo)
+        next_slide_number = 1
+        rendered_slides = {} # partname -> 슬라이드 XML 바이트
+        new_slides = [] # [(partname, layout_partname)]
+        ordered_slides = [] # [(partname, 원본 sldId 요소 또는 None)]
+        for source, is_first_use, xml_pages, _ in sections:
+            for offset, xml in enumerate(xml_pages):
+                if offset == 0 and is_first_use:
+                    if xml is not None:
+                        rendered_slides[source["partname"]] = xml
+                    ordered_slides.append((source["partname"], source["sld_id"]))
+                    continue
+                while f"ppt/slides/slide{next_slide_number}.xml" in existing_names:
+                    next_slide_number += 1
+                partname = f"ppt/slides/slide{next_slide_number}.xml"
+                existing_names.add(partname)
+                rendered_slides[partname] = xml
+                new_slides.append((partname, source["layout_partname"]))
+                ordered_slides.append((partname, None))
+
+        # 플랜에 포함되지 않은 원본 슬라이드는 맨 뒤에 원래 순서대로 남겨둡니다. (apply_slide_plan과 동일)
+        ordered_slides.extend(
+            (source["partname"], source["sld_id"])
+            for index, source in enumerate(template_slides) if index not in used_source_indices
+        )
+
+        # 4. presentation.xml / presentation.xml.rels / [Content_Types].xml 갱신
+        presentation = parse_xml(template_zip.read(PRESENTATION_PARTNAME))
+        presentation_rels = parse_xml(template_zip.read(PRESENTATION_RELS_PARTNAME))
+        content_types = parse_xml(template_zip.read(CONTENT_TYPES_PARTNAME))
+
+        used_rIds = {rel.get("Id") for rel in presentation_rels}
+        sld_id_lst = presentation.get_or_add_sldIdLst()
+        next_sld_id = sld_id_lst._next_id
+        next_rId_number = 1
+        new_rIds = {}
+        for partname, _ in new_slides:
+            while f"rId{next_rId_number}" in used_rIds:
+                next_rId_number += 1
+            rId = f"rId{next_rId_number}"
+            used_rIds.add(rId)
+            new_rIds[partname] = rId
+            presentation_rels.add_rel(rId, RT.SLIDE, _relative_target(PRESENTATION_PARTNAME, partname))
+            content_types.add_override("/" + partname, CT.PML_SLIDE)
+
+        ordered_sld_ids = []
+        for partname, sld_id in ordered_slides:
+            if sld_id is None:
+                sld_id = sld_id_lst._new_sldId()
+                sld_id.id = next_sld_id
+                sld_id.rId = new_rIds[partname]
+                next_sld_id += 1
+            ordered_sld_ids.append(sld_id)
+        sld_id_lst[:] = ordered_sld_ids
+
+        replaced_entries = {
+            CONTENT_TYPES_PARTNAME: _serialize(content_types),
+            PRESENTATION_PARTNAME: _serialize(presentation),
+            PRESENTATION_RELS_PARTNAME: _serialize(presentation_rels),
+        }
+        replaced_entries.update(rendered_slides)
+
+        added_entries = []
+        for partname, layout_partname in new_slides:
+            slide_rels = CT_Relationships.new()
+            slide_rels.add_rel("rId1", RT.SLIDE_LAYOUT, _relative_target(partname, layout_partname))
+            added_entries.append((partname, replaced_entries.pop(partname)))
+            added_entries.append((_rels_partname(partname), slide_rels.xml_file_bytes))
+
+        # 5. ZIP 스트리밍 출력: 바뀐 항목만 새로 쓰고 나머지는 압축된 바이트 그대로 복사
+        level = 6 if zip_level is None else zip_level
+        replaced_names = [name for name in template_zip.NameToInfo if name in replaced_entries]
+        prepared = prepare_entries(
+            [(name, replaced_entries[name]) for name in replaced_names] + added_entries, level, zip_workers
+        )
+        prepared_replaced = dict(zip(replaced_names, prepared))
+        prepared_added = prepared[len(replaced_names):]
+
+        _write_package(template_zip, prepared_replaced, prepared_added, output)
+
+
+def _write_package(source_zip: zipfile.ZipFile, prepared_replaced: dict, prepared_added: list, output):
+    """원본 ZIP 순서대로 바뀐 항목은 새로 압축한 내용을, 나머지는 압축된 바이트 그대로 쓰고 추가 항목을 덧붙입니다."""
+    output_file = open(output, "wb") if isinstance(output, (str, os.PathLike)) else output
+    try:
+        with ZipStreamWriter(output_file) as writer:
+            for zip_info in source_zip.infolist():
+                if zip_info.filename in prepared_replaced:
+                    writer.write_prepared(prepared_replaced[zip_info.filename])
+                else:
+                    writer.copy_entry(source_zip, zip_info)
+            for prepared_entry in prepared_added:
+                writer.write_prepared(prepared_entry)
+    finally:
+        if output_file is not output:
+            output_file.close()
+
+
+def patch_deck_ooxml(template_path, previous_deck, plan: list, positions: list, output, zip_level: int = None,
+                     zip_workers: int = 1):
+    """
+    이전에 생성한 덱(`previous_deck`, 경로 또는 파일 객체)에서 `positions`(0부터)의 슬라이드만 새 플랜으로 다시 렌더링하고,
+    나머지 항목은 압축된 바이트 그대로 복사해 `output`에 씁니다.
+    이전 덱은 슬라이드 구성이 같은 플랜(utils.slide_plan.diff_slide_plans 참고)으로 어느 엔진에서든 만들어졌어야 합니다.
+    다시 렌더링하는 슬라이드는 전체 렌더링과 같은 기준(원본 슬라이드의 첫 등장이면 템플릿 원본, 아니면 레이아웃)에서 만듭니다.
+    """
+    with zipfile.ZipFile(template_path) as template_zip, zipfile.ZipFile(previous_deck) as deck_zip:
+        template_slides = read_template_slides(template_zip)
+        deck_slides = read_template_slides(deck_zip)
+
+        first_positions = {}
+        for position, entry in enumerate(plan):
+            first_positions.setdefault(entry["source_index"], position)
+
+        layouts = {}
+        replaced_entries = {}
+        for position in positions:
+            entry = plan[position]
+            deck_slide = deck_slides[position]
+            slide_layout = _load_layout(deck_zip, layouts, deck_slide["layout_partname"])
+            if first_positions[entry["source_index"]] == position:
+                slide_element = parse_xml(template_zip.read(template_slides[entry["source_index"]]["partname"]))
+            else:
+                slide_element = new_slide_element(slide_layout._element)
+            replaced_entries[deck_slide["partname"]] = render_slide_xml(
+                slide_element, entry["edits"], position, slide_layout, entry.get("tokens")
+            )
+
+        level = 6 if zip_level is None else zip_level
+        replaced_names = [name for name in deck_zip.NameToInfo if name in replaced_entries]
+        prepared = prepare_entries([(name, replaced_entries[name]) for name in replaced_names], level, zip_workers)
+        _write_package(deck_zip, dict(zip(replaced_names, prepared)), [], output)
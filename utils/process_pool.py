@@ -0,0 +1,47 @@
+# utils/process_pool.py
+
+# 섹션별 렌더링을 작업 프로세스에 나누어 맡기는 공용 도우미.
+# OOXML 렌더러(utils/ooxml_renderer.py)와 PDF 유인물(utils/handout_pdf.py)이 함께 사용합니다.
+# Celery prefork 작업 프로세스는 데몬 프로세스라 표준 multiprocessing(ProcessPoolExecutor)으로는 자식 프로세스를
+# 만들 수 없으므로, 그때는 Celery가 사용하는 multiprocessing 포크인 billiard의 Pool을 사용합니다.
+
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import billiard # Celery 의존성. 데몬 프로세스에서도 자식 프로세스를 만들 수 있습니다.
+except ImportError:
+    billiard = None
+
+
+def can_use_process_pool(workers: int, job_count: int, label: str = "rendering") -> bool:
+    """
+    `workers`가 2 이상이고 작업이 2개 이상이며 현재 프로세스가 자식 프로세스를 만들 수 있으면 True를 반환합니다.
+    병렬로 처리할 수 없으면 이유를 출력하고 False를 반환하므로, 호출하는 쪽은 직렬 처리로 넘어가면 됩니다.
+    """
+    if workers <= 1 or job_count < 2:
+        return False
+    if multiprocessing.current_process().daemon and billiard is None:
+        print(f"Parallel {label} in a daemonic process requires billiard. Falling back to serial rendering.")
+        return False
+    return True
+
+
+def map_in_process_pool(func, jobs: list, workers: int, initializer=None, initargs: tuple = ()) -> list:
+    """
+    `jobs`를 최대 `workers`개 작업 프로세스에서 `func`로 처리해 입력 순서대로 결과 목록을 반환합니다.
+    데몬 프로세스(Celery prefork 작업 프로세스)에서는 billiard Pool을, 그 밖에는 ProcessPoolExecutor를 사용합니다.
+    """
+    processes = min(workers, len(jobs))
+    if multiprocessing.current_process().daemon:
+        pool = billiard.Pool(processes=processes, initializer=initializer, initargs=initargs)
+        try:
+            # pool.map은 결과를 첫 작업 프로세스의 것으로만 집계해 나머지 프로세스가 종료 전 30초를 기다리므로
+            # 작업마다 apply_async로 넘깁니다.
+            results = [pool.apply_async(func, (job,)) for job in jobs]
+            return [result.get() for result in results]
+        finally:
+            pool.close()
+            pool.join()
+    with ProcessPoolExecutor(max_workers=processes, initializer=initializer, initargs=initargs) as executor:
+        return list(executor.map(func, jobs))
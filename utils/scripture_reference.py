@@ -0,0 +1,132 @@
+# utils/scripture_reference.py
+
+# 설교 본문 범위 입력("요 3:16; 롬 8:1-5, 28; 시 23")을 구절 범위 목록으로 파싱합니다.
+# 폼 검증(WorshipInfoForm.clean_sermon_scripture)과 PPT 생성 작업(load_bible_contents)이 같은 파서를 씁니다.
+#
+# 지원하는 형식 (쉼표/세미콜론으로 여러 개를 이어 쓸 수 있음):
+#   요한복음 3:16          한 절
+#   요 3:16-18             같은 장 안의 범위
+#   출애굽기 3:4 - 4:12    장을 넘는 범위
+#   시 23 / 시 23-24       장 전체 / 여러 장 전체
+#   롬 8:1-5, 28           쉼표 뒤의 숫자는 앞 범위와 같은 장의 절 (앞이 장 전체였으면 장)
+#   요 3:16; 17:3          책 이름을 생략하면 앞의 책
+#   창 50:20 - 출 1:7      책을 넘는 범위 (사이의 책은 전체)
+#   요한 복음 3:16, Jn 3:16  책 이름은 정식 이름/약어/영어 이름 (utils/bible_books.py)
+#
+# 범위는 {"book", "begin_ch", "begin_verse", "end_ch", "end_verse"}이며,
+# end_verse가 None이면 장 끝까지, end_ch가 None이면 책의 마지막 장까지입니다.
+
+import re
+
+from utils.bible_books import BOOK_NAME_TABLE, BOOK_ORDER, match_book_prefix, suggest_books
+
+# 범위를 나누는 기호 (하이픈, 엔대시, 엠대시, 물결)
+RANGE_SEPARATOR_PATTERN = re.compile(r"\s*[-–—~]\s*")
+# 장:절 또는 숫자 하나
+LOCATION_PATTERN = re.compile(r"^(\d+)(?:\s*:\s*(\d+))?$")
+# 항목 앞의 책 이름으로 보이는 부분 (오류 메시지용, 숫자가 나오기 전까지)
+BOOK_NAME_PART_PATTERN = re.compile(r"^\D*")
+
+REFERENCE_FORMAT_HELP = "'책이름 장:절 - 장:절' 형식을 쉼표(,)나 세미콜론(;)으로 이어 쓰세요. (예: 요 3:16; 롬 8:1-5, 28; 시 23)"
+
+
+class ScriptureReferenceError(ValueError):
+    """성경 본문 범위 입력을 해석할 수 없을 때 발생합니다."""
+
+
+def _split_book_prefix(item: str):
+    """
+    항목 앞의 책 이름을 가장 긴 이름 기준으로 떼어 (정식 책 이름 또는 None, 나머지)를 반환합니다.
+    책 이름 없이 숫자로 시작하면 앞의 책을 이어 쓰는 항목입니다.
+    """
+    book, name_end = match_book_prefix(item)
+    rest = item[name_end:].lstrip(" .") # "1 Cor. 13"의 마침표
+    if book is not None and rest[:1].isdigit():
+        return book, rest
+    if item[:1].isdigit():
+        return None, item
+    name = BOOK_NAME_PART_PATTERN.match(item).group().strip()
+    suggestions = suggest_books(name)
+    hint = f" 혹시 {', '.join(suggestions)} 중 하나인가요?" if suggestions else ""
+    raise ScriptureReferenceError(f"'{name}'은(는) 알 수 없는 성경책 이름입니다.{hint}")
+
+
+def _parse_location(text: str, item: str):
+    match = LOCATION_PATTERN.match(text.strip())
+    if not match:
+        raise ScriptureReferenceError(f"'{item}'을(를) 해석할 수 없습니다. {REFERENCE_FORMAT_HELP}")
+    return int(match.group(1)), int(match.group(2)) if match.group(2) else None
+
+
+def _cross_book_ranges(book: str, begin_ch: int, begin_verse: int, end_book: str, end_ch: int, end_verse, item: str) -> list:
+    """책을 넘는 범위를 책마다의 범위로 나눕니다. (사이의 책은 전체)"""
+    if BOOK_ORDER[end_book] < BOOK_ORDER[book]:
+        raise ScriptureReferenceError(f"'{item}': 끝 성경책이 시작 성경책보다 앞에 있습니다.")
+    books = list(BOOK_NAME_TABLE)[BOOK_ORDER[book]:BOOK_ORDER[end_book] + 1]
+    ranges = [{"book": book, "begin_ch": begin_ch, "begin_verse": begin_verse, "end_ch": None, "end_verse": None}]
+    ranges.extend(
+        {"book": middle, "begin_ch": 1, "begin_verse": 1, "end_ch": None, "end_verse": None}
+        for middle in books[1:-1]
+    )
+    ranges.append({"book": end_book, "begin_ch": 1, "begin_verse": 1, "end_ch": end_ch, "end_verse": end_verse})
+    return ranges
+
+
+def parse_scripture_reference(text: str) -> list:
+    """
+    성경 본문 범위 입력을 입력 순서대로 범위 목록으로 파싱합니다.
+    형식이 틀리거나 모르는 책 이름, 거꾸로 된 범위가 있으면 ScriptureReferenceError를 발생시킵니다.
+    """
+    ranges = []
+    book = None
+    for part in (text or "").split(";"):
+        chapter = None # 쉼표 뒤 숫자를 절로 해석할 때의 장 (앞 항목이 장 전체였으면 None)
+        for item in part.split(","):
+            item = item.strip()
+            if not item:
+                continue
+            item_book, rest = _split_book_prefix(item)
+            if item_book is not None:
+                book, chapter = item_book, None
+            if book is None:
+                raise ScriptureReferenceError(f"'{item}' 앞에 성경책 이름이 없습니다. {REFERENCE_FORMAT_HELP}")
+
+            sides = RANGE_SEPARATOR_PATTERN.split(rest.strip(), maxsplit=1)
+            begin_ch, begin_verse = _parse_location(sides[0], item)
+            if begin_verse is None and chapter is not None: # "8:1-5, 28"의 28
+                begin_ch, begin_verse = chapter, begin_ch
+            whole_chapters = begin_verse is None
+            if whole_chapters:
+                begin_verse = 1
+
+            end_book = book
+            if len(sides) == 1:
+                end_ch, end_verse = begin_ch, (None if whole_chapters else begin_verse)
+            else:
+                right_book, right = _split_book_prefix(sides[1])
+                end_ch, end_verse = _parse_location(right, item)
+                if right_book is not None and right_book != book:
+                    end_book = right_book
+                elif end_verse is None and not whole_chapters: # "3:16-18"의 18
+                    end_ch, end_verse = begin_ch, end_ch
+
+            if begin_ch < 1 or begin_verse < 1 or end_ch < 1 or end_verse == 0:
+                raise ScriptureReferenceError(f"'{item}': 장과 절은 1 이상이어야 합니다.")
+            if end_book != book:
+                ranges.extend(_cross_book_ranges(book, begin_ch, begin_verse, end_book, end_ch, end_verse, item))
+                book = end_book
+            else:
+                if begin_ch > end_ch:
+                    raise ScriptureReferenceError(f"'{item}': 시작 장이 끝 장보다 큽니다.")
+                if begin_ch == end_ch and end_verse is not None and begin_verse > end_verse:
+                    raise ScriptureReferenceError(f"'{item}': 시작 절이 끝 절보다 큽니다.")
+                ranges.append({
+                    "book": book, "begin_ch": begin_ch, "begin_verse": begin_verse,
+                    "end_ch": end_ch, "end_verse": end_verse,
+                })
+            chapter = None if whole_chapters else end_ch
+
+    if not ranges:
+        raise ScriptureReferenceError(f"성경 본문 범위를 입력해주세요. {REFERENCE_FORMAT_HELP}")
+    return ranges
+
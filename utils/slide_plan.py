@@ -0,0 +1,290 @@
+# utils/slide_plan.py
+
+# 슬라이드 플랜 컴파일러.
+# 예배 정보와 찬양/광고/성경 데이터를 "최종 슬라이드 순서대로 정렬된 목록"으로 변환합니다.
+# 플랜은 순수한 dict/list 데이터이므로 PPT를 렌더링하지 않고도 검사하고 테스트할 수 있으며,
+# utils.update_pptx.apply_slide_plan이 이 플랜을 한 번의 순회로 덱에 적용합니다.
+#
+# 플랜 항목 형식:
+# {
+#     "source_index": 6,          # 복제/수정할 원본 템플릿 슬라이드 인덱스
+#     "role": "lyrics",           # 슬라이드 역할 (static, cover, song_title, lyrics, ...)
+#     "section": "song:0",        # 같은 원본 슬라이드에서 펼쳐진 페이지 묶음 식별자 (static은 None)
+#     "edits": [                  # edit_text_field에 그대로 전달되는 텍스트 수정 목록
+#         {"new_text": "...", "is_title": False, "ph_index": None, "shape_name": None, "align_center": True},
+#     ],
+#     "tokens": {"PRAYER_MINISTER": "..."},  # 원본 슬라이드의 {{토큰}} 치환 값 (토큰이 있는 슬라이드의 첫 페이지에만 있음)
+# }
+
+from utils.template_tokens import build_token_context
+
+# 기본 템플릿의 슬라이드 역할별 인덱스 (원본 템플릿 기준, 슬라이드 추가 전 인덱스)
+SLIDE_INDEX_COVER = 0
+SLIDE_INDEX_START_SONG = 5
+SLIDE_INDEX_LYRICS_TEMPLATE = 6
+SLIDE_INDEX_PRAYER = 14
+SLIDE_INDEX_OFFERING = 15
+SLIDE_INDEX_ADS_MANAGER = 18
+SLIDE_INDEX_ADS_CONTENTS_TEMPLATE = 20
+SLIDE_INDEX_BIBLE_RANGE = 21
+SLIDE_INDEX_BIBLE_CONTENTS_TEMPLATE = 22
+SLIDE_INDEX_SERMON_TITLE = 23
+SLIDE_INDEX_ENDING_SONG_TITLE_TEMPLATE = 27
+SLIDE_INDEX_ENDING_SONG_LYRICS_TEMPLATE = 28
+SLIDE_INDEX_BENEDICTION_MINISTER = 37
+
+# 광고/성경 내용 슬라이드의 본문 Placeholder 인덱스 (가정)
+ADS_CONTENTS_PH_INDEX = 1
+BIBLE_CONTENTS_PH_INDEX = 10
+
+# 템플릿 매니페스트(utils.template_manifest)의 역할 이름 -> 기본 템플릿의 슬라이드 인덱스
+# 매니페스트가 없는 템플릿은 이 기본값을 그대로 사용합니다.
+DEFAULT_ROLE_SLIDE_INDICES = {
+    "cover": SLIDE_INDEX_COVER,
+    "start_song": SLIDE_INDEX_START_SONG,
+    "lyrics_template": SLIDE_INDEX_LYRICS_TEMPLATE,
+    "prayer": SLIDE_INDEX_PRAYER,
+    "offering": SLIDE_INDEX_OFFERING,
+    "ads_manager": SLIDE_INDEX_ADS_MANAGER,
+    "ads_contents": SLIDE_INDEX_ADS_CONTENTS_TEMPLATE,
+    "bible_range": SLIDE_INDEX_BIBLE_RANGE,
+    "bible_contents": SLIDE_INDEX_BIBLE_CONTENTS_TEMPLATE,
+    "sermon_title": SLIDE_INDEX_SERMON_TITLE,
+    "ending_song_title": SLIDE_INDEX_ENDING_SONG_TITLE_TEMPLATE,
+    "ending_song_lyrics": SLIDE_INDEX_ENDING_SONG_LYRICS_TEMPLATE,
+    "benediction": SLIDE_INDEX_BENEDICTION_MINISTER,
+}
+
+# 본문 Placeholder가 필요한 역할 -> 기본 Placeholder 인덱스
+DEFAULT_ROLE_PH_INDICES = {
+    "ads_contents": ADS_CONTENTS_PH_INDEX,
+    "bible_contents": BIBLE_CONTENTS_PH_INDEX,
+}
+
+
+def resolve_role(manifest: dict, role: str) -> tuple:
+    """
+    역할의 (슬라이드 인덱스, 본문 Placeholder 인덱스)를 반환합니다.
+    매니페스트가 있으면 업로드 시 검증된 값을, 없으면 기본 템플릿 값을 사용합니다.
+    """
+    if manifest:
+        role_info = manifest["roles"][role]
+        return role_info["slide_index"], role_info.get("ph_index")
+    return DEFAULT_ROLE_SLIDE_INDICES[role], DEFAULT_ROLE_PH_INDICES.get(role)
+
+
+class SlidePlanError(ValueError):
+    """예배 데이터가 템플릿의 슬라이드 자리에 들어가지 않을 때 발생합니다. (찬양이 너무 많은 경우 등)"""
+
+
+def song_slot_capacity(manifest: dict, template_slide_count: int) -> int:
+    """
+    템플릿에 넣을 수 있는 일반 찬양 수를 반환합니다.
+    찬양 제목/가사 슬라이드는 start_song/lyrics_template부터 2장 간격으로 배치되므로,
+    다른 역할의 슬라이드나 템플릿 끝에 닿기 전까지가 찬양 자리입니다.
+    """
+    if manifest:
+        template_slide_count = manifest["slide_count"]
+        occupied = set()
+        for role, role_info in manifest["roles"].items():
+            if role not in ("start_song", "lyrics_template"):
+                # {{토큰}}으로 채우는 역할은 토큰이 있는 슬라이드 목록을 가집니다.
+                occupied.update(role_info.get("slide_indices") or [role_info["slide_index"]])
+    else:
+        occupied = {
+            slide_index for role, slide_index in DEFAULT_ROLE_SLIDE_INDICES.items()
+            if role not in ("start_song", "lyrics_template")
+        }
+    start_song_index, _ = resolve_role(manifest, "start_song")
+    lyrics_template_index, _ = resolve_role(manifest, "lyrics_template")
+    capacity = 0
+    while True:
+        song_indices = (start_song_index + capacity * 2, lyrics_template_index + capacity * 2)
+        if any(index in occupied or index >= template_slide_count for index in song_indices):
+            return capacity
+        capacity += 1
+
+
+def _text_edit(new_text: str, is_title: bool = False, ph_index: int = None,
+               shape_name: str = None, align_center: bool = True) -> dict:
+    """edit_text_field 키워드 인자와 동일한 형태의 텍스트 수정 정보를 만듭니다."""
+    return {
+        "new_text": new_text,
+        "is_title": is_title,
+        "ph_index": ph_index,
+        "shape_name": shape_name,
+        "align_center": align_center,
+    }
+
+
+def _assign_slot(slots: dict, source_index: int, role: str, pages: list, section: str = None):
+    """
+    원본 슬라이드 하나에 역할과 페이지별 수정 목록을 배정합니다.
+    이미 배정된 슬라이드라면 첫 페이지의 수정 목록에 이어 붙입니다.
+    여러 페이지로 펼쳐지는 슬라이드끼리 겹치면 페이지를 버리지 않도록 SlidePlanError를 발생시킵니다.
+    """
+    if not pages:
+        return
+    if source_index in slots:
+        existing = slots[source_index]
+        if len(pages) > 1 or len(existing["pages"]) > 1:
+            raise SlidePlanError(
+                f"슬라이드 {source_index + 1}에 '{existing['role']}'와 '{role}'가 함께 배정되어 "
+                f"여러 페이지를 펼칠 수 없습니다."
+            )
+        existing["pages"][0].extend(pages[0])
+        return
+    slots[source_index] = {"role": role, "section": section or f"{role}:{source_index}", "pages": pages}
+
+
+def build_slide_plan(
+    template_slide_count: int,
+    sunday_text: str,
+    worship_info,
+    songs_data: list,
+    ending_song_data: dict = None,
+    ads_list: list = None,
+    bible_contents: list = None,
+    manifest: dict = None,
+) -> list:
+    """
+    예배 정보를 최종 슬라이드 순서의 플랜으로 변환합니다.
+
+    `worship_info`는 WorshipInfo 인스턴스(또는 같은 속성을 가진 객체)이고,
+    `songs_data`/`ending_song_data`는 {"title": ..., "splitted_lyrics": [...]} 형태입니다.
+    여러 페이지로 펼쳐지는 슬라이드(가사, 광고, 성경)는 원본 슬라이드 위치에서 연속된 항목이 됩니다.
+    `manifest`(PptTemplate.manifest)가 주어지면 역할별 슬라이드/Placeholder 위치를 매니페스트에서 가져옵니다.
+    찬양이 템플릿의 찬양 자리(song_slot_capacity)보다 많으면 SlidePlanError를 발생시킵니다.
+    """
+    slots = {}
+    if manifest:
+        template_slide_count = manifest["slide_count"]
+
+    song_capacity = song_slot_capacity(manifest, template_slide_count)
+    if len(songs_data) > song_capacity:
+        raise SlidePlanError(f"찬양이 {len(songs_data)}곡이지만 템플릿에는 {song_capacity}곡 자리만 있습니다.")
+
+    # 1. 표지 및 예배 기본 정보 (제목 Placeholder)
+    fixed_fields = [
+        ("cover", sunday_text),
+        ("prayer", worship_info.prayer_minister),
+        ("offering", worship_info.offering_minister),
+        ("ads_manager", worship_info.ads_manager),
+        ("bible_range", worship_info.sermon_scripture),
+        ("sermon_title", worship_info.sermon_title),
+        ("benediction", worship_info.benediction_minister),
+    ]
+    for role, text in fixed_fields:
+        if manifest and manifest["roles"][role].get("token"):
+            continue # 템플릿의 {{토큰}}으로 채움 (아래 6단계)
+        source_index, _ = resolve_role(manifest, role)
+        _assign_slot(slots, source_index, role, [[_text_edit(text, is_title=True)]])
+
+    # 2. 일반 찬양: 제목 슬라이드와 가사 슬라이드가 번갈아 배치됩니다.
+    start_song_index, _ = resolve_role(manifest, "start_song")
+    lyrics_template_index, _ = resolve_role(manifest, "lyrics_template")
+    for index, song_data in enumerate(songs_data):
+        section = f"song:{index}"
+        _assign_slot(
+            slots, start_song_index + index * 2, "song_title",
+            [[_text_edit(song_data["title"], is_title=True)]], section=section,
+        )
+        _assign_slot(
+            slots, lyrics_template_index + index * 2, "lyrics",
+            [[_text_edit(page)] for page in song_data["splitted_lyrics"]], section=section,
+        )
+
+    # 3. 광고 (제목 + 본문)
+    ads_index, ads_ph_index = resolve_role(manifest, "ads_contents")
+    _assign_slot(slots, ads_index, "ads", [
+        [
+            _text_edit(ad_data.get("title", ""), is_title=True, align_center=False),
+            _text_edit(ad_data.get("contents", ""), ph_index=ads_ph_index, align_center=False),
+        ]
+        for ad_data in (ads_list or [])
+    ])
+
+    # 4. 성경봉독 (구절 제목 + 본문)
+    bible_index, bible_ph_index = resolve_role(manifest, "bible_contents")
+    _assign_slot(slots, bible_index, "bible", [
+        [
+            _text_edit(bible_data.get("title", ""), is_title=True, align_center=False),
+            _text_edit(bible_data.get("contents", ""), ph_index=bible_ph_index, align_center=False),
+        ]
+        for bible_data in (bible_contents or [])
+    ])
+
+    # 5. 결단 찬양
+    if ending_song_data:
+        _assign_slot(
+            slots, resolve_role(manifest, "ending_song_title")[0], "ending_song_title",
+            [[_text_edit(ending_song_data["title"], is_title=True)]], section="ending_song",
+        )
+        _assign_slot(
+            slots, resolve_role(manifest, "ending_song_lyrics")[0], "lyrics",
+            [[_text_edit(page)] for page in ending_song_data["splitted_lyrics"]], section="ending_song",
+        )
+
+    for source_index in sorted(slots):
+        if source_index >= template_slide_count:
+            print(f"Warning: Slide index {source_index} out of bounds for template with {template_slide_count} slides. Skipped.")
+
+    # 6. 원본 템플릿 순서대로 펼쳐서 최종 플랜 생성
+    # 템플릿의 {{토큰}}은 슬라이드별로 그 슬라이드에 있는 토큰 값만 첫 페이지(원본 슬라이드)에 싣습니다.
+    token_context = build_token_context(worship_info, sunday_text)
+    slide_tokens = {}
+    for token, token_slide_indices in ((manifest or {}).get("tokens") or {}).items():
+        if token in token_context:
+            for source_index in token_slide_indices:
+                slide_tokens.setdefault(source_index, {})[token] = token_context[token]
+
+    plan = []
+    for source_index in range(template_slide_count):
+        slot = slots.get(source_index)
+        if slot is None:
+            plan.append({"source_index": source_index, "role": "static", "section": None, "edits": []})
+        else:
+            for page_edits in slot["pages"]:
+                plan.append({
+                    "source_index": source_index,
+                    "role": slot["role"],
+                    "section": slot["section"],
+                    "edits": page_edits,
+                })
+        if source_index in slide_tokens:
+            plan[-len(slot["pages"]) if slot else -1]["tokens"] = slide_tokens[source_index]
+    return plan
+
+
+def diff_slide_plans(previous_plan: list, plan: list):
+    """
+    이전 플랜과 새 플랜을 비교해 텍스트가 바뀐 슬라이드 위치(0부터) 목록을 반환합니다.
+    슬라이드 구성(장 수, 원본 슬라이드, 역할)이 달라져 바뀐 슬라이드만 고칠 수 없으면 None을 반환합니다.
+    """
+    if not previous_plan or len(previous_plan) != len(plan):
+        return None
+    for previous_entry, entry in zip(previous_plan, plan):
+        if previous_entry["source_index"] != entry["source_index"] or previous_entry["role"] != entry["role"]:
+            return None
+    return [
+        position for position, (previous_entry, entry) in enumerate(zip(previous_plan, plan))
+        if previous_entry["edits"] != entry["edits"] or previous_entry.get("tokens") != entry.get("tokens")
+    ]
+
+
+def _entry_texts(entry: dict) -> list:
+    return [edit["new_text"] for edit in entry["edits"]] + list((entry.get("tokens") or {}).values())
+
+
+def build_change_report(previous_plan: list, plan: list, positions: list) -> list:
+    """바뀐 슬라이드별로 번호(1부터), 역할, 수정 전/후 텍스트를 정리한 운영자용 보고를 만듭니다."""
+    return [
+        {
+            "slide_number": position + 1,
+            "role": plan[position]["role"],
+            "section": plan[position]["section"],
+            "before": _entry_texts(previous_plan[position]),
+            "after": _entry_texts(plan[position]),
+        }
+        for position in positions
+    ]
@@ -0,0 +1,169 @@
+# utils/slide_thumbnail.py
+
+# 생성된 덱의 슬라이드 미리보기(PNG 썸네일).
+# 전체 .pptx를 내려받지 않고 휴대폰에서도 빠르게 확인할 수 있도록, 슬라이드의 배경(단색/테마 색/배경 이미지)과
+# 텍스트 상자만 작은 PNG로 그립니다. 도형, 그림, 효과는 그리지 않습니다.
+# 썸네일은 슬라이드/레이아웃/마스터/테마 XML과 크기로 만든 내용 해시를 키로 하므로,
+# 호출하는 쪽에서 이미 저장된 키를 알려주면 바뀌지 않은 슬라이드는 다시 그리지 않습니다.
+
+import hashlib
+import io
+
+from pptx import Presentation
+from pptx.enum.shapes import PP_PLACEHOLDER
+from pptx.enum.text import PP_ALIGN
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+
+from utils.text_fit import inherited_text_style, load_font, wrap_line, LINE_HEIGHT_RATIO
+
+# 그리는 방식이 바뀌면 올려서 기존 썸네일 캐시를 무효화합니다.
+THUMBNAIL_VERSION = 1
+DEFAULT_THUMBNAIL_WIDTH_PX = 320
+DEFAULT_BACKGROUND_COLOR = "FFFFFF"
+TITLE_PLACEHOLDER_TYPES = {PP_PLACEHOLDER.TITLE, PP_PLACEHOLDER.CENTER_TITLE}
+
+
+def thumbnail_key(slide, width_px: int = DEFAULT_THUMBNAIL_WIDTH_PX) -> str:
+    """썸네일 내용을 결정하는 XML(슬라이드, 레이아웃, 마스터, 테마)과 크기에 대한 SHA-256 해시"""
+    layout = slide.slide_layout
+    master = layout.slide_master
+    digest = hashlib.sha256(f"{THUMBNAIL_VERSION}:{width_px}".encode("ascii"))
+    for part in (slide.part, layout.part, master.part, master.part.part_related_by(RT.THEME)):
+        digest.update(hashlib.sha256(part.blob).digest())
+    return digest.hexdigest()
+
+
+def _scheme_color(master, scheme_name: str):
+    """테마 색 이름(bg1, tx1, accent1 등)을 마스터의 색 매핑과 테마 색 구성표로 RGB 16진수로 바꿉니다."""
+    from lxml import etree
+
+    color_map = master._element.find(qn("p:clrMap"))
+    if color_map is not None and color_map.get(scheme_name):
+        scheme_name = color_map.get(scheme_name)
+    theme = etree.fromstring(master.part.part_related_by(RT.THEME).blob)
+    scheme_color = theme.find(f".//{qn('a:clrScheme')}/{qn('a:' + scheme_name)}")
+    if scheme_color is None or len(scheme_color) == 0:
+        return None
+    color = scheme_color[0]
+    return color.get("val") if color.tag == qn("a:srgbClr") else color.get("lastClr")
+
+
+def _resolve_color(color_parent, master):
+    for color in color_parent:
+        if color.tag == qn("a:srgbClr"):
+            return color.get("val")
+        if color.tag == qn("a:schemeClr"):
+            return _scheme_color(master, color.get("val"))
+    return None
+
+
+def _slide_background(slide) -> tuple:
+    """슬라이드 -> 레이아웃 -> 마스터 순서로 배경을 찾아 ("image", 이미지 바이트) 또는 ("color", "RRGGBB")를 반환합니다."""
+    layout = slide.slide_layout
+    master = layout.slide_master
+    for owner in (slide, layout, master):
+        background = owner._element.find(f"{qn('p:cSld')}/{qn('p:bg')}")
+        if background is None:
+            continue
+        background_properties = background.find(qn("p:bgPr"))
+        if background_properties is not None:
+            blip = background_properties.find(f"{qn('a:blipFill')}/{qn('a:blip')}")
+            if blip is not None and blip.get(qn("r:embed")):
+                return "image", owner.part.related_part(blip.get(qn("r:embed"))).blob
+            color_parent = background_properties.find(qn("a:solidFill"))
+        else:
+            color_parent = background.find(qn("p:bgRef")) # 테마 배경 스타일 참조: 지정된 색만 사용
+        color = _resolve_color(color_parent, master) if color_parent is not None else None
+        if color:
+            return "color", color
+    return "color", DEFAULT_BACKGROUND_COLOR
+
+
+def _draw_background(image, slide):
+    from PIL import Image
+
+    kind, value = _slide_background(slide)
+    if kind == "color":
+        image.paste("#" + value, (0, 0, image.width, image.height))
+        return
+    try:
+        background = Image.open(io.BytesIO(value)).convert("RGB")
+    except Exception:
+        return # Pillow가 읽지 못하는 형식(EMF 등)은 흰 배경으로 둡니다.
+    # 슬라이드를 꽉 채우도록 늘립니다. (PowerPoint 배경 이미지 기본 동작)
+    image.paste(background.resize(image.size))
+
+
+def _text_color(image) -> str:
+    """배경 밝기에 따라 읽기 쉬운 글자색(검정/흰색)을 고릅니다."""
+    from PIL import ImageStat
+
+    red, green, blue = ImageStat.Stat(image).mean[:3]
+    return "#000000" if (0.299 * red + 0.587 * green + 0.114 * blue) > 128 else "#FFFFFF"
+
+
+def _draw_text_shapes(draw, slide, scale: float, color: str, fallback_typeface: str = None):
+    for shape in slide.shapes:
+        if not shape.has_text_frame or not shape.text_frame.text.strip():
+            continue
+        left, top, width, height = shape.left, shape.top, shape.width, shape.height
+        if None in (left, top, width, height):
+            continue
+
+        text_frame = shape.text_frame
+        is_title = shape.is_placeholder and shape.placeholder_format.type in TITLE_PLACEHOLDER_TYPES
+        inherited_size_pt, latin, ea = inherited_text_style(shape, is_title)
+        x = (left + text_frame.margin_left) * scale
+        y = (top + text_frame.margin_top) * scale
+        max_width = (width - text_frame.margin_left - text_frame.margin_right) * scale
+
+        for paragraph in text_frame.paragraphs:
+            size = next((run.font.size for run in paragraph.runs if run.font.size), None)
+            size_px = max(1, round((size if size else inherited_size_pt * 12700) * scale))
+            # 템플릿 글꼴이 없거나 이 문단을 그릴 수 없으면 대체 글꼴로, 그것도 없으면 MissingFontError
+            font = load_font(ea or latin, size_px, required_text=paragraph.text, fallback_typeface=fallback_typeface)
+            for line in wrap_line(draw, paragraph.text.replace("\v", " "), font, max_width):
+                line_x = x
+                if paragraph.alignment == PP_ALIGN.CENTER:
+                    line_x = x + (max_width - draw.textlength(line, font=font)) / 2
+                elif paragraph.alignment == PP_ALIGN.RIGHT:
+                    line_x = x + max_width - draw.textlength(line, font=font)
+                draw.text((line_x, y), line, fill=color, font=font)
+                y += size_px * LINE_HEIGHT_RATIO
+
+
+def render_slide_thumbnail(slide, slide_width: int, slide_height: int,
+                           width_px: int = DEFAULT_THUMBNAIL_WIDTH_PX, fallback_typeface: str = None) -> bytes:
+    """
+    슬라이드의 배경과 텍스트를 `width_px` 너비(비율 유지)의 PNG 바이트로 그립니다.
+    템플릿 글꼴과 `fallback_typeface` 모두 텍스트(한글 등)를 그릴 수 없으면 MissingFontError를 발생시킵니다.
+    """
+    from PIL import Image, ImageDraw
+
+    scale = width_px / slide_width
+    image = Image.new("RGB", (width_px, max(1, round(slide_height * scale))), "#" + DEFAULT_BACKGROUND_COLOR)
+    _draw_background(image, slide)
+    _draw_text_shapes(ImageDraw.Draw(image), slide, scale, _text_color(image), fallback_typeface)
+
+    buffer = io.BytesIO()
+    image.save(buffer, "PNG", optimize=True)
+    return buffer.getvalue()
+
+
+def render_deck_thumbnails(deck_file, is_cached=None, width_px: int = DEFAULT_THUMBNAIL_WIDTH_PX,
+                           fallback_typeface: str = None) -> list:
+    """
+    덱(경로 또는 파일 객체)의 슬라이드별 [(썸네일 키, PNG 바이트), ...]를 슬라이드 순서대로 반환합니다.
+    `is_cached(key)`가 True인 슬라이드는 그리지 않고 PNG 자리에 None을 돌려줍니다.
+    템플릿 글꼴이 서버에 없으면 `fallback_typeface`로 그리며, 그것도 없으면 MissingFontError를 발생시킵니다.
+    """
+    prs = Presentation(deck_file)
+    thumbnails = []
+    for slide in prs.slides:
+        key = thumbnail_key(slide, width_px)
+        if is_cached is not None and is_cached(key):
+            thumbnails.append((key, None))
+        else:
+            thumbnails.append((key, render_slide_thumbnail(slide, prs.slide_width, prs.slide_height, width_px, fallback_typeface)))
+    return thumbnails
@@ -0,0 +1,127 @@
+# utils/template_manifest.py
+
+# PPT 템플릿 매니페스트.
+# 템플릿 업로드 시 한 번만 슬라이드 구조를 읽어, 역할(표지, 기도자, 성경 본문 등)별로
+# 슬라이드 위치/ID, 레이아웃, Placeholder 인덱스, 도형 이름을 기록합니다.
+# PPT 생성 시에는 이 매니페스트에서 위치를 바로 찾으므로 템플릿을 다시 훑지 않으며,
+# 구조가 맞지 않는 템플릿은 생성 도중이 아니라 업로드 단계에서 거부됩니다.
+#
+# 매니페스트 형식:
+# {
+#     "version": 1,
+#     "slide_count": 38,
+#     "roles": {
+#         "bible_contents": {
+#             "slide_index": 22, "slide_id": 279, "layout": "제목 및 내용",
+#             "has_title": True, "ph_index": 10,
+#             "placeholders": [0, 10], "shape_names": ["제목 1", "내용 개체 틀 2"],
+#         },
+#         "prayer": {"token": "PRAYER_MINISTER", "slide_indices": [3]},  # 토큰으로 채우는 고정 필드
+#         ...
+#     },
+#     "tokens": {"PRAYER_MINISTER": [3], ...},  # 토큰 이름 -> 토큰이 있는 슬라이드 인덱스 (utils/template_tokens.py)
+# }
+
+from pptx import Presentation
+
+from utils.slide_plan import DEFAULT_ROLE_SLIDE_INDICES, DEFAULT_ROLE_PH_INDICES
+from utils.template_tokens import FIXED_FIELD_TOKENS, TEMPLATE_TOKENS, find_tokens
+
+MANIFEST_VERSION = 2
+
+# 제목 Placeholder가 없어도 되는 역할 (가사는 첫 번째 텍스트 도형에 들어갑니다)
+ROLES_WITHOUT_TITLE = {"lyrics_template", "ending_song_lyrics"}
+
+
+class TemplateManifestError(ValueError):
+    """템플릿 구조가 PPT 생성에 필요한 역할과 맞지 않을 때 발생합니다. `errors`에 문제 목록이 있습니다."""
+
+    def __init__(self, errors: list):
+        super().__init__("\n".join(errors))
+        self.errors = errors
+
+
+def _resolve_body_ph_index(placeholders: dict, expected_ph_index: int):
+    """
+    본문 Placeholder 인덱스를 결정합니다.
+    기본 인덱스가 있으면 그대로 쓰고, 없으면 제목이 아닌 텍스트 Placeholder가 하나뿐일 때 그것을 사용합니다.
+    """
+    if expected_ph_index in placeholders:
+        return expected_ph_index
+    body_candidates = [
+        idx for idx, placeholder in placeholders.items()
+        if idx != 0 and placeholder.has_text_frame
+    ]
+    if len(body_candidates) == 1:
+        return body_candidates[0]
+    return None
+
+
+def extract_template_manifest(template_file) -> dict:
+    """
+    템플릿 파일(경로 또는 파일 객체)에서 매니페스트를 만듭니다.
+    필요한 역할의 슬라이드/Placeholder가 없으면 TemplateManifestError를 발생시킵니다.
+    """
+    prs = Presentation(template_file)
+    slides = list(prs.slides)
+    errors = []
+    roles = {}
+
+    tokens = {}
+    for slide_index, slide in enumerate(slides):
+        for token in sorted(find_tokens(slide.part.blob)):
+            tokens.setdefault(token, []).append(slide_index)
+    for token, slide_indices in tokens.items():
+        if token not in TEMPLATE_TOKENS:
+            errors.append(
+                f"{slide_indices[0] + 1}번 슬라이드의 {{{{{token}}}}}은(는) 알 수 없는 토큰입니다. "
+                f"(사용 가능: {', '.join(sorted(TEMPLATE_TOKENS))})"
+            )
+
+    for role, slide_index in DEFAULT_ROLE_SLIDE_INDICES.items():
+        if FIXED_FIELD_TOKENS.get(role) in tokens:
+            # 토큰으로 채우는 고정 필드는 슬라이드 위치와 무관합니다.
+            roles[role] = {"token": FIXED_FIELD_TOKENS[role], "slide_indices": tokens[FIXED_FIELD_TOKENS[role]]}
+            continue
+        if slide_index >= len(slides):
+            errors.append(f"'{role}' 역할의 {slide_index + 1}번 슬라이드가 없습니다. (템플릿 슬라이드 수: {len(slides)})")
+            continue
+
+        slide = slides[slide_index]
+        placeholders = {placeholder.placeholder_format.idx: placeholder for placeholder in slide.placeholders}
+        has_title = slide.shapes.title is not None
+        role_info = {
+            "slide_index": slide_index,
+            "slide_id": slide.slide_id,
+            "layout": slide.slide_layout.name,
+            "has_title": has_title,
+            "ph_index": None,
+            "placeholders": sorted(placeholders),
+            "shape_names": [shape.name for shape in slide.shapes],
+        }
+
+        if role in ROLES_WITHOUT_TITLE:
+            if not any(shape.has_text_frame for shape in slide.shapes):
+                errors.append(f"'{role}' 역할의 {slide_index + 1}번 슬라이드에 텍스트 상자가 없습니다.")
+        elif not has_title:
+            errors.append(f"'{role}' 역할의 {slide_index + 1}번 슬라이드에 제목 Placeholder가 없습니다.")
+
+        if role in DEFAULT_ROLE_PH_INDICES:
+            role_info["ph_index"] = _resolve_body_ph_index(placeholders, DEFAULT_ROLE_PH_INDICES[role])
+            if role_info["ph_index"] is None:
+                errors.append(
+                    f"'{role}' 역할의 {slide_index + 1}번 슬라이드에서 본문 Placeholder(idx {DEFAULT_ROLE_PH_INDICES[role]})를 찾을 수 없습니다. "
+                    f"(존재하는 Placeholder: {sorted(placeholders)})"
+                )
+
+        roles[role] = role_info
+
+    if errors:
+        raise TemplateManifestError(errors)
+
+    return {"version": MANIFEST_VERSION, "slide_count": len(slides), "roles": roles, "tokens": tokens}
+
+
+def is_manifest_current(manifest: dict) -> bool:
+    """저장된 매니페스트가 현재 형식으로 만들어졌는지 확인합니다."""
+    return bool(manifest) and manifest.get("version") == MANIFEST_VERSION
@@ -0,0 +1,236 @@
+# utils/template_slimming.py
+
+# 템플릿 업로드 시 한 번 실행하는 경량화 단계.
+# 생성되는 모든 PPT가 템플릿의 미디어/레이아웃을 그대로 싣고 다니므로, 업로드 시점에
+# 1) 내용이 같은 미디어 파트를 하나로 합치고,
+# 2) 어떤 슬라이드도 사용하지 않는 레이아웃과 마스터를 제거하고,
+# 3) (선택) 슬라이드에 표시되는 크기보다 지나치게 큰 이미지를 줄여
+# 이후의 모든 로드/복제/저장이 더 작은 패키지로 이루어지도록 합니다. 원본 파일은 그대로 보관합니다.
+
+import hashlib
+import io
+import math
+
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.oxml.ns import qn
+from pptx.parts.image import ImagePart
+from pptx.parts.media import MediaPart
+from pptx.shapes.picture import Picture
+
+# 슬라이드 전체 너비에 대응하는 기본 픽셀 수 (FHD 프로젝터 기준)
+DEFAULT_MAX_IMAGE_WIDTH_PX = 1920
+# 줄였을 때 이 비율 이상 작아지는 경우에만 이미지를 다시 인코딩합니다.
+DOWNSCALE_MIN_RATIO = 0.9
+DOWNSCALABLE_FORMATS = {"PNG", "JPEG"}
+
+
+def _deduplicate_media(package) -> int:
+    """내용이 같은 이미지/미디어 파트를 가리키는 관계를 첫 번째 파트로 모읍니다. 합쳐진 파트 수를 반환합니다."""
+    canonical_parts = {}
+    duplicates = {}
+    for part in package.iter_parts():
+        if not isinstance(part, (ImagePart, MediaPart)):
+            continue
+        digest = (part.content_type, hashlib.sha1(part.blob).hexdigest())
+        canonical = canonical_parts.setdefault(digest, part)
+        if canonical is not part:
+            duplicates[part] = canonical
+
+    if duplicates:
+        for rel in list(package.iter_rels()):
+            if not rel.is_external and rel.target_part in duplicates:
+                rel._target = duplicates[rel.target_part]
+                # target_part/target_partname/target_ref는 lazyproperty로 캐시되므로 함께 비웁니다.
+                for cached_name in ("target_part", "target_partname", "target_ref"):
+                    rel.__dict__.pop(cached_name, None)
+    return len(duplicates)
+
+
+def _remove_unused_layouts_and_masters(prs) -> tuple:
+    """어떤 슬라이드도 사용하지 않는 레이아웃과, 사용하는 레이아웃이 하나도 없는 마스터를 제거합니다."""
+    used_layout_parts = {slide.slide_layout.part for slide in prs.slides}
+    removed_layouts = 0
+    for master in prs.slide_masters:
+        for layout in list(master.slide_layouts):
+            if layout.part not in used_layout_parts:
+                master.slide_layouts.remove(layout)
+                removed_layouts += 1
+
+    removed_masters = 0
+    sld_master_id_lst = prs.slide_masters._sldMasterIdLst
+    for sld_master_id in list(sld_master_id_lst.sldMasterId_lst):
+        if len(sld_master_id_lst.sldMasterId_lst) <= 1:
+            break # 마스터는 최소 하나가 있어야 합니다.
+        master_part = prs.part.related_part(sld_master_id.rId)
+        if len(master_part.slide_master.slide_layouts) == 0:
+            sld_master_id_lst.remove(sld_master_id)
+            prs.part.drop_rel(sld_master_id.rId)
+            removed_masters += 1
+    return removed_layouts, removed_masters
+
+
+def _iter_shapes(shapes, scale: tuple = (1.0, 1.0)):
+    """그룹 안까지 모든 도형을 (도형, 그룹 배율)로 순회합니다. 그룹 안 도형의 크기는 그룹의 자식 좌표계 기준입니다."""
+    for shape in shapes:
+        yield shape, scale
+        if shape.shape_type != MSO_SHAPE_TYPE.GROUP:
+            continue
+        child_extent = shape._element.grpSpPr.find(f"{qn('a:xfrm')}/{qn('a:chExt')}")
+        group_scale = scale
+        if child_extent is not None and shape.width and shape.height:
+            child_width, child_height = int(child_extent.get("cx", 0)), int(child_extent.get("cy", 0))
+            if child_width and child_height:
+                group_scale = (scale[0] * shape.width / child_width, scale[1] * shape.height / child_height)
+        yield from _iter_shapes(shape.shapes, group_scale)
+
+
+def _blip_fill_extent(blip_fill, width: float, height: float):
+    """
+    늘이기(stretch) 채우기가 `width` x `height`(EMU) 영역을 채울 때 필요한 이미지 전체의 크기.
+    잘라낸(srcRect) 이미지는 보이는 부분이 영역을 채우므로 그만큼 더 커야 합니다. 바둑판식(tile) 채우기는 None입니다.
+    """
+    if blip_fill.find(qn("a:stretch")) is None:
+        return None
+    visible_width = visible_height = 1.0
+    src_rect = blip_fill.find(qn("a:srcRect"))
+    if src_rect is not None: # 1/1000 퍼센트 단위
+        visible_width = 1 - (int(src_rect.get("l", 0)) + int(src_rect.get("r", 0))) / 100000
+        visible_height = 1 - (int(src_rect.get("t", 0)) + int(src_rect.get("b", 0))) / 100000
+    return width / max(visible_width, 0.01), height / max(visible_height, 0.01)
+
+
+def _container_blip_extents(container, slide_width: int, slide_height: int) -> dict:
+    """
+    슬라이드/레이아웃/마스터 안의 이미지 참조(a:blip)별 표시 크기(EMU). {a:blip 요소: (너비, 높이) 또는 None}
+    그림 도형, 그림으로 채운 도형, 배경 그림을 다루며, 크기를 알 수 없는 참조는 None입니다.
+    """
+    extents = {}
+    background_fill = container._element.find(f"{qn('p:cSld')}/{qn('p:bg')}/{qn('p:bgPr')}/{qn('a:blipFill')}")
+    if background_fill is not None:
+        for blip in background_fill.iter(qn("a:blip")):
+            extents[blip] = _blip_fill_extent(background_fill, slide_width, slide_height)
+    for shape, (scale_x, scale_y) in _iter_shapes(container.shapes):
+        if isinstance(shape, Picture): # 그림 Placeholder(PlaceholderPicture) 포함
+            blip_fill = shape._element.blipFill
+        else:
+            blip_fill = shape._element.find(f"{qn('p:spPr')}/{qn('a:blipFill')}") # 그림으로 채운 도형
+        if blip_fill is None:
+            continue
+        for blip in blip_fill.iter(qn("a:blip")):
+            if shape.width is None or shape.height is None: # 상속된 위치도 없는 Placeholder
+                extents[blip] = None
+            else:
+                extents[blip] = _blip_fill_extent(blip_fill, shape.width * scale_x, shape.height * scale_y)
+    return extents
+
+
+def _required_image_sizes(prs, package, max_image_width_px: int) -> dict:
+    """
+    이미지 파트별로 화면에 표시되는 최대 크기(픽셀)를 계산합니다. {ImagePart: (너비, 높이) 또는 None}
+    이미지를 참조하는 모든 파트를 확인하며, 한 곳이라도 표시 크기를 알 수 없으면(노트, 차트, 테마 배경 스타일,
+    바둑판식 채우기 등) None입니다.
+    """
+    px_per_emu = max_image_width_px / prs.slide_width
+    containers = list(prs.slides) + [layout for master in prs.slide_masters for layout in master.slide_layouts] \
+        + list(prs.slide_masters)
+    blip_extents_by_part = {
+        container.part: _container_blip_extents(container, prs.slide_width, prs.slide_height)
+        for container in containers
+    }
+
+    required = {}
+    for part in package.iter_parts():
+        blip_extents = blip_extents_by_part.get(part, {})
+        for rel in part.rels.values():
+            if rel.is_external or not isinstance(rel.target_part, ImagePart):
+                continue
+            image_part = rel.target_part
+            if not hasattr(part, "_element"):
+                required[image_part] = None
+                continue
+            references = [
+                element for element in part._element.iter()
+                if rel.rId in (element.get(qn("r:embed")), element.get(qn("r:link")), element.get(qn("r:id")))
+            ]
+            for element in references:
+                extent = blip_extents.get(element)
+                if extent is None or required.get(image_part, (0, 0)) is None:
+                    required[image_part] = None
+                    continue
+                previous = required.get(image_part, (0, 0))
+                required[image_part] = (
+                    max(previous[0], extent[0] * px_per_emu),
+                    max(previous[1], extent[1] * px_per_emu),
+                )
+    return required
+
+
+def _downscale_images(prs, package, max_image_width_px: int) -> int:
+    """표시 크기보다 큰 PNG/JPEG 이미지를 줄입니다. 어디에 얼마나 크게 표시되는지 알 수 없는 이미지는 그대로 둡니다."""
+    from PIL import Image # 이미지 축소를 사용할 때만 필요
+
+    required = _required_image_sizes(prs, package, max_image_width_px)
+    downscaled = 0
+    for part in package.iter_parts():
+        if not isinstance(part, ImagePart) or required.get(part) is None:
+            continue
+        try:
+            image = Image.open(io.BytesIO(part.blob))
+        except Exception:
+            continue # EMF/WMF 등 Pillow가 읽지 못하는 형식
+        if image.format not in DOWNSCALABLE_FORMATS:
+            continue
+
+        required_width, required_height = required[part]
+        ratio = max(required_width / image.width, required_height / image.height)
+        if ratio >= DOWNSCALE_MIN_RATIO:
+            continue
+
+        image_format = image.format
+        new_size = (max(1, math.ceil(image.width * ratio)), max(1, math.ceil(image.height * ratio)))
+        resized = image.resize(new_size, Image.LANCZOS)
+        buffer = io.BytesIO()
+        if image_format == "JPEG":
+            resized.convert("RGB").save(buffer, "JPEG", quality=90, optimize=True)
+        else:
+            resized.save(buffer, "PNG", optimize=True)
+        if buffer.tell() < len(part.blob):
+            part._blob = buffer.getvalue()
+            downscaled += 1
+    return downscaled
+
+
+def slim_template(template_file, downscale_images: bool = False,
+                  max_image_width_px: int = DEFAULT_MAX_IMAGE_WIDTH_PX) -> tuple:
+    """
+    템플릿 파일(경로 또는 파일 객체)을 경량화하여 (PPTX 바이트, 결과 보고 dict)를 반환합니다.
+    슬라이드 순서, 도형, Placeholder는 바꾸지 않으므로 템플릿 매니페스트는 그대로 유효합니다.
+    """
+    if hasattr(template_file, "read"):
+        original = template_file.read()
+    else:
+        with open(template_file, "rb") as f:
+            original = f.read()
+
+    prs = Presentation(io.BytesIO(original))
+    package = prs.part.package
+
+    removed_layouts, removed_masters = _remove_unused_layouts_and_masters(prs)
+    deduplicated_media = _deduplicate_media(package)
+    downscaled_images = _downscale_images(prs, package, max_image_width_px) if downscale_images else 0
+
+    output = io.BytesIO()
+    prs.save(output)
+    optimized = output.getvalue()
+
+    report = {
+        "original_bytes": len(original),
+        "optimized_bytes": len(optimized),
+        "removed_layouts": removed_layouts,
+        "removed_masters": removed_masters,
+        "deduplicated_media": deduplicated_media,
+        "downscaled_images": downscaled_images,
+    }
+    print(f"Template slimmed: {report}")
+    return optimized, report
@@ -0,0 +1,79 @@
+# utils/template_tokens.py
+
+# 템플릿 치환 토큰.
+# 템플릿 텍스트 런에 {{PRAYER_MINISTER}} 같은 토큰을 넣어 두면 PPT 생성 시 예배 정보 값으로 바뀝니다.
+# 고정 필드(표지 날짜, 기도자, 봉헌자 등)를 역할별 슬라이드 위치로 찾아 하나씩 채우는 대신,
+# 슬라이드 XML을 한 번 훑으며 모든 토큰을 한꺼번에 치환하므로 템플릿에서 슬라이드를 옮겨도 코드를 고칠 필요가 없습니다.
+# 토큰은 한 텍스트 런 안에 이어서 써야 합니다. (PowerPoint에서 글자 서식이 중간에 바뀌면 런이 나뉘어 치환되지 않습니다)
+# 치환한 값이 길어 도형을 넘치면 utils.update_pptx가 해당 도형의 글꼴 크기를 줄입니다.
+
+import re
+
+# 고정 필드 역할(utils.slide_plan) -> 토큰 이름. 템플릿에 토큰이 있으면 해당 역할의 슬라이드 위치는 사용하지 않습니다.
+FIXED_FIELD_TOKENS = {
+    "cover": "COVER_DATE",
+    "prayer": "PRAYER_MINISTER",
+    "offering": "OFFERING_MINISTER",
+    "ads_manager": "ADS_MANAGER",
+    "bible_range": "SERMON_SCRIPTURE",
+    "sermon_title": "SERMON_TITLE",
+    "benediction": "BENEDICTION_MINISTER",
+}
+# 고정 필드 외에 템플릿 어디서나 쓸 수 있는 토큰
+EXTRA_TOKENS = ("SPEAKER",)
+TEMPLATE_TOKENS = frozenset(FIXED_FIELD_TOKENS.values()) | frozenset(EXTRA_TOKENS)
+
+TOKEN_PATTERN = re.compile(r"\{\{([A-Z][A-Z0-9_]*)\}\}")
+# 슬라이드 XML의 텍스트 런 내용(<a:t>...</a:t>)만 치환 대상입니다.
+TEXT_ELEMENT_PATTERN = re.compile(rb"(<a:t(?:\s[^>]*)?>)([^<]*)(</a:t>)")
+TOKEN_NAME_PATTERN = re.compile(rb"\{\{([A-Z][A-Z0-9_]*)\}\}")
+
+
+def build_token_context(worship_info, sunday_text: str) -> dict:
+    """예배 정보(WorshipInfo 또는 같은 속성을 가진 객체)와 주일 표기로 {토큰 이름: 값} 컨텍스트를 만듭니다."""
+    return {
+        "COVER_DATE": sunday_text,
+        "PRAYER_MINISTER": worship_info.prayer_minister,
+        "OFFERING_MINISTER": worship_info.offering_minister,
+        "ADS_MANAGER": worship_info.ads_manager,
+        "SERMON_SCRIPTURE": worship_info.sermon_scripture,
+        "SERMON_TITLE": worship_info.sermon_title,
+        "BENEDICTION_MINISTER": worship_info.benediction_minister,
+        "SPEAKER": getattr(worship_info, "speaker", ""),
+    }
+
+
+def _token_text(value) -> str:
+    """토큰 값을 슬라이드 텍스트로 바꿉니다. 입력하지 않은 필드(None)는 빈 문자열입니다."""
+    return "" if value is None else str(value)
+
+
+def find_tokens(slide_xml: bytes) -> set:
+    """슬라이드 XML의 텍스트 런에 들어 있는 토큰 이름 집합"""
+    return {
+        name.decode("ascii")
+        for match in TEXT_ELEMENT_PATTERN.finditer(slide_xml)
+        for name in TOKEN_NAME_PATTERN.findall(match.group(2))
+    }
+
+
+def replace_tokens_in_element(slide_element, context: dict) -> int:
+    """
+    슬라이드 요소의 텍스트 런(a:t)을 한 번 순회하며 토큰을 바꾸고 치환 횟수를 반환합니다.
+    컨텍스트에 없는 토큰은 그대로 두고 값이 None인 토큰은 지웁니다.
+    """
+    from pptx.oxml.ns import qn
+
+    count = 0
+
+    def replace_token(match):
+        nonlocal count
+        if match.group(1) not in context:
+            return match.group(0)
+        count += 1
+        return _token_text(context[match.group(1)])
+
+    for text_element in slide_element.iter(qn("a:t")):
+        if text_element.text and "{{" in text_element.text:
+            text_element.text = TOKEN_PATTERN.sub(replace_token, text_element.text)
+    return count
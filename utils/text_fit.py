@@ -0,0 +1,418 @@
+# utils/text_fit.py
+
+# 글꼴 너비 기반 텍스트 맞춤.
+# PowerPoint의 자동 맞춤(SHAPE_TO_FIT_TEXT)에 배치를 맡기면 긴 성경 본문/광고가 넘치고, 파일을 열 때마다 모든 슬라이드가
+# 다시 배치됩니다. 대신 생성 시점에 템플릿 글꼴(Placeholder/마스터/테마에서 상속된 글꼴과 크기)로 글자 너비를 재서
+# 줄바꿈을 계산하고, 도형 안에 들어가는 가장 큰 글꼴 크기를 정해 텍스트에 직접 지정합니다.
+#
+# 글자 너비는 글꼴별로 1em 대비 비율로 캐시하며(GLYPH_WIDTH_CACHE), JSON 파일로 저장해 다음 실행에서도 재사용합니다.
+# 서버에서 글꼴 파일(configure_text_fit의 font_dirs)을 찾지 못하면 문자 폭 분류(전각/반각)에 따른 근사치를 사용합니다.
+
+import json
+import os
+import re
+import tempfile
+import threading
+import unicodedata
+
+from lxml import etree
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
+from pptx.util import Pt
+
+# 글꼴을 이 크기보다 작게 줄이지는 않습니다. (이보다 작아야 들어가면 넘치는 것을 감수)
+MIN_FONT_SIZE_PT = 12
+# 줄 간격 1.0일 때 PowerPoint의 줄 높이 (글꼴 크기 대비)
+LINE_HEIGHT_RATIO = 1.2
+# 글꼴 크기 탐색 단위 (pt)
+FONT_SIZE_STEP_PT = 0.5
+# 상속된 크기를 찾지 못했을 때의 기본 글꼴 크기 (PowerPoint 기본 마스터 기준)
+DEFAULT_TITLE_SIZE_PT = 44
+DEFAULT_BODY_SIZE_PT = 18
+# 글꼴 파일이 없을 때 근사 너비를 저장하는 캐시 키
+APPROXIMATE_FONT_KEY = "~approximate"
+FONT_FILE_EXTENSIONS = (".ttf", ".otf", ".ttc")
+# 이미지로 그리는 글꼴(유인물/미리보기)이 한글을 그릴 수 있는지 확인할 때 쓰는 글자
+HANGUL_SAMPLE_TEXT = "가"
+# 어느 글꼴에도 글리프가 없는 글자 (16번 평면 사용자 정의 영역). 그리면 글꼴의 notdef 상자가 나옵니다.
+NOTDEF_PROBE_CHAR = "\U0010FFFD"
+
+# {글꼴 키: {문자: 1em 대비 너비}}
+GLYPH_WIDTH_CACHE = {}
+TEXT_FIT_STATS = {"frames": 0, "shrunk": 0, "measured_glyphs": 0}
+
+_font_dirs = []
+_font_file_index = None # {글꼴 이름: 파일 경로}
+_loaded_fonts = {} # {글꼴 이름: (글꼴 키, ImageFont 또는 None)}
+_theme_fonts_cache = {} # {테마 XML 바이트: {"+mj-lt": "...", ...}}
+_cache_lock = threading.Lock()
+_cache_dirty = False
+
+PARAGRAPH_SPLIT_PATTERN = re.compile(r"[\n\v]")
+
+
+class MissingFontError(LookupError):
+    """이미지로 텍스트를 그릴 글꼴 파일이 없거나, 글꼴이 필요한 글자(한글 등)를 그릴 수 없을 때 발생합니다."""
+
+
+def configure_text_fit(font_dirs: list):
+    """글꼴 파일을 찾을 디렉토리 목록을 지정합니다. (글꼴 이름 색인은 처음 필요할 때 만듭니다)"""
+    global _font_file_index
+    _font_dirs[:] = [font_dir for font_dir in font_dirs if font_dir]
+    _font_file_index = None
+    _loaded_fonts.clear()
+
+
+def reset_text_fit_stats():
+    for key in TEXT_FIT_STATS:
+        TEXT_FIT_STATS[key] = 0
+
+
+def load_glyph_width_cache(path: str):
+    """저장된 글자 너비 캐시를 읽어 현재 캐시에 합칩니다. 파일이 없거나 깨졌으면 무시합니다."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    except (OSError, ValueError):
+        return
+    with _cache_lock:
+        for font_key, widths in stored.items():
+            GLYPH_WIDTH_CACHE.setdefault(font_key, {}).update(widths)
+
+
+def save_glyph_width_cache(path: str):
+    """새로 잰 글자가 있으면 다른 작업 프로세스가 저장한 내용과 합쳐 원자적으로 저장합니다."""
+    global _cache_dirty
+    if not _cache_dirty:
+        return
+    load_glyph_width_cache(path)
+    with _cache_lock:
+        snapshot = {font_key: dict(widths) for font_key, widths in GLYPH_WIDTH_CACHE.items()}
+        _cache_dirty = False
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, suffix=".tmp")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(snapshot, f, ensure_ascii=False)
+    os.replace(temp_path, path)
+
+
+def _build_font_file_index() -> dict:
+    from PIL import ImageFont
+
+    index = {}
+    for font_dir in _font_dirs:
+        for root, _, file_names in os.walk(font_dir):
+            for file_name in sorted(file_names):
+                if not file_name.lower().endswith(FONT_FILE_EXTENSIONS):
+                    continue
+                path = os.path.join(root, file_name)
+                try:
+                    family, _ = ImageFont.truetype(path, 10).getname()
+                except OSError:
+                    continue
+                index.setdefault(family, path)
+                index.setdefault(os.path.splitext(file_name)[0], path) # 파일 이름으로도 찾을 수 있게
+    return index
+
+
+def _get_font(typeface: str) -> tuple:
+    """글꼴 이름으로 (캐시 키, Pillow 글꼴)을 반환합니다. 글꼴 파일이 없으면 (근사 키, None)입니다."""
+    global _font_file_index
+    if typeface not in _loaded_fonts:
+        if _font_file_index is None:
+            _font_file_index = _build_font_file_index() if _font_dirs else {}
+        path = _font_file_index.get(typeface) if typeface else None
+        if path is None:
+            _loaded_fonts[typeface] = (APPROXIMATE_FONT_KEY, None)
+        else:
+            from PIL import ImageFont
+            _loaded_fonts[typeface] = (typeface, ImageFont.truetype(path, 1000)) # 1000px = 1em
+    return _loaded_fonts[typeface]
+
+
+def get_font_dirs() -> list:
+    """configure_text_fit으로 지정된 글꼴 디렉토리 목록 (작업 프로세스에 같은 설정을 넘길 때 사용)"""
+    return list(_font_dirs)
+
+
+def _glyph_bitmap(font, char: str) -> tuple:
+    from PIL import Image, ImageDraw
+
+    left, top, right, bottom = font.getbbox(char)
+    image = Image.new("L", (max(1, right - left), max(1, bottom - top)), 0)
+    ImageDraw.Draw(image).text((-left, -top), char, fill=255, font=font)
+    return image.size, image.tobytes()
+
+
+def can_draw_text(font, text: str) -> bool:
+    """
+    글꼴이 `text`의 모든 글자를 실제 글리프로 그릴 수 있으면 True를 반환합니다.
+    글리프가 없는 글자는 글꼴의 notdef(빈 상자)로 그려지므로, 어느 글꼴에도 없는 글자의 모양과 비교합니다.
+    """
+    notdef = _glyph_bitmap(font, NOTDEF_PROBE_CHAR)
+    return all(
+        _glyph_bitmap(font, char) != notdef
+        for char in set(text) if not char.isspace() and unicodedata.category(char)[0] != "C"
+    )
+
+
+def load_font(typeface: str, size_px: int, required_text: str = HANGUL_SAMPLE_TEXT, fallback_typeface: str = None):
+    """
+    글꼴 이름의 Pillow 글꼴을 `size_px` 크기로 반환합니다.
+    글꼴 파일이 없거나 `required_text`(기본: 한글)를 그릴 수 없으면 `fallback_typeface`를 시도하고,
+    그래도 없으면 MissingFontError를 발생시킵니다. (한글이 빈 상자로 그려진 이미지를 만들지 않도록)
+    """
+    for candidate in (typeface, fallback_typeface):
+        if not candidate:
+            continue
+        _, font = _get_font(candidate)
+        if font is None:
+            continue
+        font = font.font_variant(size=size_px)
+        if not required_text or can_draw_text(font, required_text):
+            return font
+    raise MissingFontError(
+        f"'{typeface}' 글꼴을 찾을 수 없거나 필요한 글자를 그릴 수 없습니다. "
+        f"(대체 글꼴: {fallback_typeface}, 글꼴 디렉토리: {_font_dirs})"
+    )
+
+
+def wrap_line(draw, text: str, font, max_width: float) -> list:
+    """단어 단위로 줄을 바꾸고, 한 줄보다 긴 단어는 글자 단위로 나눕니다."""
+    lines = []
+    current = ""
+    for word in text.split(" "):
+        candidate = f"{current} {word}" if current else word
+        if draw.textlength(candidate, font=font) <= max_width:
+            current = candidate
+            continue
+        if current:
+            lines.append(current)
+            current = ""
+        for char in word:
+            if current and draw.textlength(current + char, font=font) > max_width:
+                lines.append(current)
+                current = ""
+            current += char
+    lines.append(current)
+    return lines
+
+
+def _approximate_width(char: str) -> float:
+    if char.isspace():
+        return 0.25
+    if unicodedata.east_asian_width(char) in ("W", "F"):
+        return 1.0 # 한글/한자 등 전각 문자
+    return 0.55
+
+
+def _is_wide(char: str) -> bool:
+    return unicodedata.east_asian_width(char) in ("W", "F")
+
+
+def glyph_width(char: str, latin_typeface: str = None, ea_typeface: str = None) -> float:
+    """문자 하나의 1em 대비 너비. 전각 문자는 동아시아 글꼴, 나머지는 라틴 글꼴로 잽니다."""
+    global _cache_dirty
+    font_key, font = _get_font(ea_typeface if _is_wide(char) else latin_typeface)
+    widths = GLYPH_WIDTH_CACHE.get(font_key)
+    if widths is not None and char in widths:
+        return widths[char]
+
+    width = font.getlength(char) / 1000 if font is not None else _approximate_width(char)
+    with _cache_lock:
+        GLYPH_WIDTH_CACHE.setdefault(font_key, {})[char] = width
+        _cache_dirty = True
+    TEXT_FIT_STATS["measured_glyphs"] += 1
+    return width
+
+
+def _measure_paragraphs(text: str, latin_typeface: str, ea_typeface: str) -> tuple:
+    """문단별 [(단어 너비, 단어의 글자별 너비 목록), ...]과 공백 너비를 1em 단위로 계산합니다."""
+    space_width = glyph_width(" ", latin_typeface, ea_typeface)
+    paragraphs = []
+    for paragraph in PARAGRAPH_SPLIT_PATTERN.split(text):
+        words = []
+        for word in paragraph.split(" "):
+            char_widths = [glyph_width(char, latin_typeface, ea_typeface) for char in word]
+            words.append((sum(char_widths), char_widths))
+        paragraphs.append(words)
+    return paragraphs, space_width
+
+
+def _count_lines(paragraphs: list, space_width: float, line_width: float) -> int:
+    """단어 단위로 줄을 바꾸고(한 줄보다 긴 단어는 글자 단위로 나눔) 전체 줄 수를 반환합니다."""
+    line_count = 0
+    for words in paragraphs:
+        line_count += 1
+        used = 0.0
+        for word_width, char_widths in words:
+            needed = word_width if used == 0 else space_width + word_width
+            if used + needed <= line_width:
+                used += needed
+                continue
+            if used > 0:
+                line_count += 1
+                used = 0.0
+            if word_width <= line_width:
+                used = word_width
+                continue
+            for char_width in char_widths:
+                if used + char_width > line_width and used > 0:
+                    line_count += 1
+                    used = 0.0
+                used += char_width
+    return line_count
+
+
+def fit_font_size(text: str, width_emu: int, height_emu: int, max_size_pt: float,
+                  latin_typeface: str = None, ea_typeface: str = None,
+                  min_size_pt: float = MIN_FONT_SIZE_PT) -> tuple:
+    """
+    `width_emu` x `height_emu` 영역에 줄바꿈한 텍스트가 들어가는 가장 큰 글꼴 크기(pt)와 그때의 줄 수를 반환합니다.
+    `max_size_pt`보다 키우지 않으며, `min_size_pt`에서도 넘치면 `min_size_pt`를 반환합니다.
+    """
+    paragraphs, space_width = _measure_paragraphs(text, latin_typeface, ea_typeface)
+    width_pt = width_emu / 12700
+    height_pt = height_emu / 12700
+
+    def line_count_at(size_pt):
+        return _count_lines(paragraphs, space_width, width_pt / size_pt)
+
+    def fits(size_pt):
+        return line_count_at(size_pt) * size_pt * LINE_HEIGHT_RATIO <= height_pt
+
+    min_size_pt = min(min_size_pt, max_size_pt)
+    if fits(max_size_pt):
+        return max_size_pt, line_count_at(max_size_pt)
+
+    # 글자 너비는 크기에 비례하므로 줄 수는 크기가 작을수록 줄어듭니다. 단위 크기 기준으로 이분 탐색합니다.
+    low, high = 0, int((max_size_pt - min_size_pt) / FONT_SIZE_STEP_PT) # low: 들어가는 것이 확실한 단계 (최소 크기)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if fits(min_size_pt + middle * FONT_SIZE_STEP_PT):
+            low = middle
+        else:
+            high = middle - 1
+    size_pt = min_size_pt + low * FONT_SIZE_STEP_PT
+    return size_pt, line_count_at(size_pt)
+
+
+def _inheritance_chain(shape) -> list:
+    """도형 자신과 상속받는 레이아웃/마스터 Placeholder 목록 (찾을 수 있는 데까지)"""
+    chain = [shape]
+    while True:
+        try:
+            base = chain[-1]._base_placeholder
+        except (AttributeError, KeyError, NotImplementedError):
+            break
+        if base is None:
+            break
+        chain.append(base)
+    return chain
+
+
+def _slide_master(shape):
+    try:
+        return shape.part.slide_layout.slide_master
+    except AttributeError:
+        return None
+
+
+def _theme_fonts(slide_master) -> dict:
+    """마스터 테마의 글꼴 참조('+mj-lt', '+mn-ea' 등) -> 글꼴 이름"""
+    try:
+        theme_blob = slide_master.part.part_related_by(RT.THEME).blob
+    except (AttributeError, KeyError):
+        return {}
+    cache_key = theme_blob # bytes는 해시값을 저장해 두므로 매번 다시 계산하지 않습니다.
+    if cache_key not in _theme_fonts_cache:
+        theme = etree.fromstring(theme_blob)
+        fonts = {}
+        for prefix, tag in (("+mj", "a:majorFont"), ("+mn", "a:minorFont")):
+            font_element = theme.find(f".//{qn(tag)}")
+            if font_element is None:
+                continue
+            latin = font_element.find(qn("a:latin"))
+            ea = font_element.find(qn("a:ea"))
+            hangul = font_element.find(f"{qn('a:font')}[@script='Hang']")
+            fonts[f"{prefix}-lt"] = latin.get("typeface") if latin is not None else None
+            ea_typeface = ea.get("typeface") if ea is not None else None
+            if not ea_typeface and hangul is not None:
+                ea_typeface = hangul.get("typeface")
+            fonts[f"{prefix}-ea"] = ea_typeface or fonts[f"{prefix}-lt"]
+        _theme_fonts_cache[cache_key] = fonts
+    return _theme_fonts_cache[cache_key]
+
+
+def _level1_run_properties(element, style_path: str):
+    """lstStyle/txStyles 등의 첫 번째 수준 기본 글자 속성(a:defRPr)을 찾습니다."""
+    if element is None:
+        return None
+    return element.find(f"{style_path}/{qn('a:lvl1pPr')}/{qn('a:defRPr')}")
+
+
+def inherited_text_style(shape, is_title: bool) -> tuple:
+    """도형에 적용되는 (글꼴 크기 pt, 라틴 글꼴, 동아시아 글꼴)을 Placeholder 상속과 마스터 텍스트 스타일에서 찾습니다."""
+    run_properties = [
+        _level1_run_properties(candidate._element, f"{qn('p:txBody')}/{qn('a:lstStyle')}")
+        for candidate in _inheritance_chain(shape)
+    ]
+    slide_master = _slide_master(shape)
+    if slide_master is not None:
+        if is_title:
+            style_name = "p:titleStyle"
+        elif shape.is_placeholder:
+            style_name = "p:bodyStyle"
+        else:
+            style_name = "p:otherStyle"
+        run_properties.append(
+            _level1_run_properties(slide_master._element, f"{qn('p:txStyles')}/{qn(style_name)}")
+        )
+
+    size_pt = latin = ea = None
+    for properties in run_properties:
+        if properties is None:
+            continue
+        if size_pt is None and properties.get("sz"):
+            size_pt = int(properties.get("sz")) / 100
+        if latin is None and properties.find(qn("a:latin")) is not None:
+            latin = properties.find(qn("a:latin")).get("typeface")
+        if ea is None and properties.find(qn("a:ea")) is not None:
+            ea = properties.find(qn("a:ea")).get("typeface")
+
+    theme_fonts = _theme_fonts(slide_master) if slide_master is not None else {}
+    default_prefix = "+mj" if is_title else "+mn"
+    latin = theme_fonts.get(latin or f"{default_prefix}-lt", latin)
+    ea = theme_fonts.get(ea or f"{default_prefix}-ea", ea) or latin
+    if size_pt is None:
+        size_pt = DEFAULT_TITLE_SIZE_PT if is_title else DEFAULT_BODY_SIZE_PT
+    return size_pt, latin, ea
+
+
+def fit_text_to_shape(shape, text: str, is_title: bool = False, max_size_pt: float = None):
+    """
+    도형의 텍스트 영역(크기 - 여백)에 `text`가 들어가는 글꼴 크기(Length)를 반환합니다.
+    `max_size_pt`가 없으면 Placeholder/마스터에서 상속한 크기에서 시작합니다.
+    도형 크기를 알 수 없으면(상속 정보 없음) None을 반환하므로 호출하는 쪽에서 PowerPoint 자동 맞춤을 유지합니다.
+    """
+    try:
+        width, height = shape.width, shape.height
+    except AttributeError:
+        return None
+    if not width or not height:
+        return None
+
+    text_frame = shape.text_frame
+    width -= text_frame.margin_left + text_frame.margin_right
+    height -= text_frame.margin_top + text_frame.margin_bottom
+    if width <= 0 or height <= 0:
+        return None
+
+    inherited_size_pt, latin, ea = inherited_text_style(shape, is_title)
+    max_size_pt = max_size_pt or inherited_size_pt
+    size_pt, _ = fit_font_size(text, width, height, max_size_pt, latin, ea)
+    TEXT_FIT_STATS["frames"] += 1
+    if size_pt < max_size_pt:
+        TEXT_FIT_STATS["shrunk"] += 1
+    return Pt(size_pt)
@@ -1,11 +1,25 @@
 # utils/update_pptx.py
 
+import copy
+import os
+import threading
+from collections import OrderedDict
+
 from pptx import Presentation
 # PresentationType 대신 Presentation을 직접 사용하거나, 타입을 더 명시적으로 지정
-from pptx.util import Inches
+from pptx.util import Inches, Pt
 # from pptx.enum.shapes import MSO_SHAPE, MSO_AUTO_SIZE # MSO_AUTO_SIZE 임포트
 from pptx.enum.text import MSO_AUTO_SIZE, PP_ALIGN # PP_ALIGN 임포트
 
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.opc.packuri import PackURI
+from pptx.opc.serialized import PackageWriter
+from pptx.parts.slide import SlidePart
+
+from utils.template_tokens import replace_tokens_in_element
+from utils.text_fit import fit_text_to_shape, inherited_text_style
+from utils.zip_stream import ZipStreamWriter, prepare_entries
+
 # Type hint
 from pptx.presentation import Presentation as PresentationType
 from pptx.slide import Slide as SlideType
@@ -23,6 +37,43 @@ def load_template(template_path: str) -> Presentation:
         raise
 
 
+# 워커 프로세스마다 유지되는 파싱된 템플릿 캐시.
+# 키는 (템플릿 id, 템플릿 수정일시)이며, 값은 한 번도 수정되지 않은 원본 Presentation입니다.
+# 작업마다 원본을 deepcopy한 사본을 넘겨주므로 ZIP을 다시 열고 XML을 다시 파싱하지 않습니다.
+# 캐시는 워커 프로세스 안에만 있어 웹(관리자) 프로세스에서 비울 수 없습니다. 대신 정확성은 키로 보장합니다:
+# 템플릿을 다시 올리거나 수정하면 updated_at이 바뀌어 다음 작업이 새로 로드하고, 같은 id의 이전 버전은 그때 제거됩니다.
+# 비활성화/삭제된 템플릿은 더 이상 요청되지 않으므로 최대 TEMPLATE_CACHE_MAX_ENTRIES개 안에서 LRU 순서로 밀려납니다.
+TEMPLATE_CACHE_MAX_ENTRIES = 4
+_template_cache = OrderedDict()
+_template_cache_lock = threading.Lock()
+
+
+def load_template_cached(template_path: str, template_id: int, updated_at) -> PresentationType:
+    """
+    파싱된 템플릿을 워커 캐시에서 가져와 작업 전용 사본을 반환합니다.
+    캐시에 없거나 템플릿이 수정(updated_at 변경)되었다면 파일에서 새로 로드합니다.
+    반환된 사본은 자유롭게 수정해도 캐시된 원본에 영향을 주지 않습니다.
+    """
+    cache_key = (template_id, updated_at)
+    with _template_cache_lock:
+        pristine_prs = _template_cache.get(cache_key)
+        if pristine_prs is not None:
+            _template_cache.move_to_end(cache_key)
+            print(f"Template cache hit: template_id={template_id}")
+
+    if pristine_prs is None:
+        pristine_prs = load_template(template_path)
+        with _template_cache_lock:
+            # 같은 템플릿의 이전 버전은 더 이상 사용되지 않으므로 함께 제거합니다.
+            for stale_key in [key for key in _template_cache if key[0] == template_id]:
+                del _template_cache[stale_key]
+            _template_cache[cache_key] = pristine_prs
+            while len(_template_cache) > TEMPLATE_CACHE_MAX_ENTRIES:
+                _template_cache.popitem(last=False)
+
+    return copy.deepcopy(pristine_prs)
+
+
 def edit_text_field(
     prs: PresentationType,
     slide_index: int,
@@ -39,49 +90,117 @@ def edit_text_field(
     `ph_index`가 주어지면 해당 인덱스의 Placeholder를 찾습니다.
     텍스트 프레임을 찾지 못하면 경고를 출력합니다.
     """
-    if slide_index >= len(prs.slides):
+    slides = prs.slides # 접근할 때마다 슬라이드 파트 이름을 다시 매기므로 한 번만 가져옵니다.
+    if slide_index >= len(slides):
         print(f"Warning: Slide index {slide_index} out of bounds for editing.")
         return prs
 
-    slide = prs.slides[slide_index]
+    _edit_slide_text(
+        slides[slide_index],
+        new_text,
+        is_title=is_title,
+        shape_name=shape_name,
+        ph_index=ph_index,
+        align_center=align_center,
+        slide_label=slide_index,
+    )
+    return prs
+
+
+# 슬라이드별 도형 조회 인덱스 사용 통계 (hits: 기존 인덱스 재사용, misses: 도형 목록을 순회해 새로 생성)
+SHAPE_INDEX_STATS = {"hits": 0, "misses": 0}
+
+
+def get_shape_index(slide: SlideType) -> dict:
+    """
+    슬라이드의 도형 조회 인덱스를 반환합니다.
+    처음 요청될 때 도형 목록을 한 번만 순회해 제목, Placeholder(idx별), 도형 이름별 텍스트 도형을 정리하고,
+    슬라이드 객체에 붙여 두어 이후 편집에서는 순회 없이 재사용합니다.
+    (슬라이드 객체는 슬라이드 파트마다 하나로 유지되므로 복제된 슬라이드도 각자의 인덱스를 가집니다.)
+    텍스트 편집은 도형 구성을 바꾸지 않으므로, 도형을 추가/삭제한 뒤에는 사용하지 않아야 합니다.
+    """
+    shape_index = getattr(slide, "_shape_index", None)
+    if shape_index is not None:
+        SHAPE_INDEX_STATS["hits"] += 1
+        return shape_index
+
+    SHAPE_INDEX_STATS["misses"] += 1
+    shape_index = {"title": None, "placeholders": {}, "names": {}, "first_text_shape": None}
+    for shape in slide.shapes:
+        if shape.is_placeholder and shape.placeholder_format.idx == 0 and shape_index["title"] is None:
+            shape_index["title"] = shape # slide.shapes.title과 동일하게 idx 0인 첫 Placeholder
+        if not shape.has_text_frame:
+            continue
+        if shape_index["first_text_shape"] is None:
+            shape_index["first_text_shape"] = shape
+        shape_index["names"].setdefault(shape.name, shape)
+        if shape.is_placeholder:
+            shape_index["placeholders"].setdefault(shape.placeholder_format.idx, shape)
+    slide._shape_index = shape_index
+    return shape_index
+
+
+def reset_shape_index_stats():
+    """도형 조회 인덱스 사용 통계를 초기화합니다."""
+    SHAPE_INDEX_STATS["hits"] = 0
+    SHAPE_INDEX_STATS["misses"] = 0
+
+
+def _edit_slide_text(
+    slide: SlideType,
+    new_text: str,
+    is_title: bool = False,
+    shape_name: str = None,
+    ph_index: int = None,
+    align_center: bool = True,
+    slide_label=None
+) -> bool:
+    """
+    슬라이드 객체의 텍스트 필드를 수정합니다. (edit_text_field의 실제 구현)
+    `slide_label`은 경고 메시지에 표시할 슬라이드 식별자입니다.
+    텍스트를 넣었으면 True를 반환합니다.
+    """
     found_text_frame = False
-    text_frame = None
+    target_shape = None
+    shape_index = get_shape_index(slide)
 
     if is_title:
-        if slide.shapes.title:
-            text_frame = slide.shapes.title.text_frame
+        if shape_index["title"] is not None:
+            target_shape = shape_index["title"]
         else:
-            print(f"Warning: No title placeholder found on slide {slide_index} for title editing.")
+            print(f"Warning: No title placeholder found on slide {slide_label} for title editing.")
     elif shape_name:
-        for shape in slide.shapes:
-            if shape.name == shape_name and shape.has_text_frame:
-                text_frame = shape.text_frame
-                break
-        if not text_frame:
-            print(f"Warning: No shape named '{shape_name}' with text frame found on slide {slide_index}.")
+        if shape_name in shape_index["names"]:
+            target_shape = shape_index["names"][shape_name]
+        else:
+            print(f"Warning: No shape named '{shape_name}' with text frame found on slide {slide_label}.")
     elif ph_index is not None:
-        for shape in slide.shapes.placeholders:
-            if shape.has_text_frame and shape.placeholder_format.idx == ph_index:
-                text_frame = shape.text_frame
-                break
-        if not text_frame:
-            print(f"Warning: No placeholder with index {ph_index} and text frame found on slide {slide_index}.")
+        if ph_index in shape_index["placeholders"]:
+            target_shape = shape_index["placeholders"][ph_index]
+        else:
+            print(f"Warning: No placeholder with index {ph_index} and text frame found on slide {slide_label}.")
     else: # Fallback: is_title도 아니고, shape_name, ph_index도 없으면, 첫 번째 텍스트 프레임 찾기
-        for shape in slide.shapes:
-            if shape.has_text_frame:
-                text_frame = shape.text_frame
-                break
-        if not text_frame:
-            print(f"Warning: No generic text frame found on slide {slide_index} for editing.")
+        if shape_index["first_text_shape"] is not None:
+            target_shape = shape_index["first_text_shape"]
+        else:
+            print(f"Warning: No generic text frame found on slide {slide_label} for editing.")
     
-    if text_frame:
+    if target_shape is not None:
+        text_frame = target_shape.text_frame
         text_frame.clear() # 기존 텍스트 모두 삭제
         p = text_frame.paragraphs[0] # 첫 번째 문단 가져오기
         run = p.add_run()
         run.text = new_text
 
-        # 자동 크기 조정 (텍스트가 넘치면 셰이프 크기 조정)
-        text_frame.auto_size = MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT
+        # 템플릿 글꼴로 줄바꿈을 계산해 도형 안에 들어가는 글꼴 크기를 직접 지정합니다. (utils/text_fit.py)
+        # 도형 크기를 알 수 없으면 기존처럼 PowerPoint의 자동 크기 조정에 맡깁니다.
+        fitted_size = fit_text_to_shape(target_shape, new_text, is_title=is_title)
+        if fitted_size is None:
+            text_frame.auto_size = MSO_AUTO_SIZE.SHAPE_TO_FIT_TEXT
+        else:
+            text_frame.auto_size = MSO_AUTO_SIZE.NONE
+            text_frame.word_wrap = True
+            run.font.size = fitted_size
         
         # 텍스트 정렬 설정
         if align_center:
@@ -92,37 +211,99 @@ def edit_text_field(
         found_text_frame = True
     
     if not found_text_frame:
-        print(f"Warning: Failed to find or edit any suitable text field on slide {slide_index}. No text was inserted.")
+        print(f"Warning: Failed to find or edit any suitable text field on slide {slide_label}. No text was inserted.")
 
-    return prs
+    return found_text_frame
 
 
-def _insert_slide_at_index(prs: PresentationType, slide_to_move: SlideType, target_index: int):
+def _shrink_replaced_text(shape, is_title: bool = False):
     """
-    새로 추가된 슬라이드(항상 맨 뒤에 있음)를 원하는 위치에 삽입합니다.
+    {{토큰}}을 치환한 텍스트 프레임이 도형을 넘치면 글꼴 크기를 줄입니다.
+    템플릿 크기(런에 지정된 가장 큰 크기 또는 상속 크기)로 들어가면 템플릿 서식을 그대로 둡니다.
     """
-    # 1. 이동할 슬라이드의 내부 XML 요소(sldIdLst 항목)를 찾습니다.
-    #    새로 추가된 슬라이드는 항상 _sldIdLst의 가장 마지막에 있습니다.
-    xml_slides = prs.slides._sldIdLst
-    
-    # 슬라이드 ID로 해당하는 xml_slide_element를 찾습니다.
-    target_xml_slide_element = None
-    for sld_id_elem in xml_slides:
-        if sld_id_elem.id == slide_to_move.slide_id:
-            target_xml_slide_element = sld_id_elem
-            break
-    
-    if target_xml_slide_element is None:
-        print(f"Error: Could not find slide {slide_to_move.slide_id} in internal list for reordering.")
+    text_frame = shape.text_frame
+    runs = [run for paragraph in text_frame.paragraphs for run in paragraph.runs]
+    explicit_sizes = [run.font.size for run in runs if run.font.size]
+    max_size_pt = max(explicit_sizes).pt if explicit_sizes else inherited_text_style(shape, is_title)[0]
+    fitted_size = fit_text_to_shape(shape, text_frame.text, is_title=is_title, max_size_pt=max_size_pt)
+    if fitted_size is None or fitted_size >= Pt(max_size_pt):
         return
+    text_frame.auto_size = MSO_AUTO_SIZE.NONE
+    text_frame.word_wrap = True
+    for run in runs:
+        run.font.size = fitted_size if run.font.size is None else min(run.font.size, fitted_size)
 
-    # 2. 현재 위치에서 해당 XML 요소를 제거합니다.
-    xml_slides.remove(target_xml_slide_element)
-    
-    # 3. 원하는 target_index 위치에 다시 삽입합니다.
-    #    prs.slides._sldIdLst는 슬라이드의 순서를 제어하는 내부 리스트입니다.
-    xml_slides.insert(target_index, target_xml_slide_element)
 
+def _replace_slide_tokens(slide: SlideType, tokens: dict) -> int:
+    """
+    슬라이드의 {{토큰}}을 플랜 값으로 치환하고, 치환한 텍스트가 넘치는 도형의 글꼴 크기를 맞춥니다. (두 렌더 엔진 공통)
+    치환 횟수를 반환합니다.
+    """
+    token_shapes = [shape for shape in slide.shapes if shape.has_text_frame and "{{" in shape.text_frame.text]
+    count = replace_tokens_in_element(slide.element, tokens)
+    for shape in token_shapes:
+        _shrink_replaced_text(shape, is_title=shape.is_placeholder and shape.placeholder_format.idx == 0)
+    return count
+
+
+def _create_slides(prs: PresentationType, slide_layout, count: int) -> list:
+    """
+    `slide_layout`을 상속하는 새 슬라이드 `count`장을 만들고 [(slide, sldId 요소), ...]를 반환합니다.
+    새 sldId 요소는 슬라이드 목록 맨 뒤에 추가되므로, 호출하는 쪽에서 원하는 위치로 한 번에 옮겨야 합니다.
+    슬라이드 ID와 파트 이름은 한 번만 계산하고 이어서 증가시키므로 장 수에 비례하는 시간만 듭니다.
+    """
+    if count <= 0:
+        return []
+
+    presentation_part = prs.part
+    sld_id_lst = presentation_part._element.get_or_add_sldIdLst()
+    # prs.slides 접근과 동일하게 슬라이드 파트 이름을 slide1..N 순서로 맞춰 새 파트 이름과 겹치지 않게 합니다.
+    presentation_part.rename_slide_parts([sld_id.rId for sld_id in sld_id_lst])
+
+    next_slide_id = sld_id_lst._next_id
+    next_partname_number = len(sld_id_lst) + 1
+    created = []
+    for _ in range(count):
+        slide_part = SlidePart.new(
+            PackURI(f"/ppt/slides/slide{next_partname_number}.xml"),
+            presentation_part.package,
+            slide_layout.part,
+        )
+        rId = presentation_part.relate_to(slide_part, RT.SLIDE)
+        slide = slide_part.slide
+        slide.shapes.clone_layout_placeholders(slide_layout)
+        sld_id = sld_id_lst._add_sldId(id=next_slide_id, rId=rId)
+        created.append((slide, sld_id))
+        next_slide_id += 1
+        next_partname_number += 1
+    return created
+
+
+def insert_slides_bulk(prs: PresentationType, template_slide_index: int, payloads: list) -> dict:
+    """
+    원본 슬라이드 하나와 N개의 텍스트 수정 목록(payload)으로 N장의 슬라이드를 한 번에 구성합니다.
+    첫 번째 payload는 원본 슬라이드에, 나머지는 같은 레이아웃으로 새로 만든 슬라이드에 적용되며,
+    새 슬라이드들은 원본 바로 뒤에 한 번의 연산으로 끼워 넣어집니다.
+    각 payload는 edit_text_field 키워드 인자 형태의 dict 목록입니다.
+    예: [{"new_text": "제목", "is_title": True}, {"new_text": "본문", "ph_index": 1}]
+    """
+    if not payloads:
+        return {"prs": prs, "added_slide_count": 0, "slides": []}
+
+    slides = prs.slides
+    template_slide = slides[template_slide_index]
+    created = _create_slides(prs, template_slide.slide_layout, len(payloads) - 1)
+
+    # 맨 뒤에 추가된 새 sldId들을 원본 슬라이드 바로 뒤로 한 번에 이동
+    insert_position = template_slide_index + 1
+    slides._sldIdLst[insert_position:insert_position] = [sld_id for _, sld_id in created]
+
+    target_slides = [template_slide] + [slide for slide, _ in created]
+    for offset, (slide, edits) in enumerate(zip(target_slides, payloads)):
+        for edit in edits:
+            _edit_slide_text(slide, slide_label=template_slide_index + offset, **edit)
+
+    return {"prs": prs, "added_slide_count": len(created), "slides": target_slides}
 
 
 def add_slides_with_text(
@@ -138,43 +319,12 @@ def add_slides_with_text(
     첫 번째 텍스트는 `template_slide_index`의 원본 슬라이드에 채워지고,
     나머지는 복제된 슬라이드에 채워집니다.
     """
-    added_slide_count = 0
-    if not texts_for_slides:
-        return {"prs": prs, "added_slide_count": 0}
-
-    original_slide_template = prs.slides[template_slide_index]
-    slide_layout = original_slide_template.slide_layout
-
-    # 1. 첫 번째 텍스트는 원본 슬라이드에 채웁니다.
-    edit_text_field(
-        prs=prs,
-        slide_index=template_slide_index,
-        is_title=is_title_field,
-        new_text=texts_for_slides[0],
-        ph_index=target_ph_index,
-        shape_name=target_shape_name
-    )
-
-    # 2. 나머지 텍스트들을 위한 슬라이드를 복제하고 텍스트를 채웁니다.
-    for i in range(1, len(texts_for_slides)):
-        # 새 슬라이드를 복제하고 콘텐츠 복사 (단순 복제)
-        new_slide = prs.slides.add_slide(slide_layout) # 새 슬라이드 추가
-
-        # 새 슬라이드의 위치를 맨 마지막에서 현재 페이지 바로 뒤로 이동
-        _insert_slide_at_index(prs, new_slide, template_slide_index + i)
-
-        # 새 슬라이드에 텍스트 채우기
-        edit_text_field(
-            prs=prs,
-            slide_index=prs.slides.index(new_slide), # 새 슬라이드의 실제 인덱스
-            is_title=is_title_field,
-            new_text=texts_for_slides[i],
-            ph_index=target_ph_index,
-            shape_name=target_shape_name
-        )
-        added_slide_count += 1
-    
-    return {"prs": prs, "added_slide_count": added_slide_count}
+    payloads = [
+        [{"new_text": text, "is_title": is_title_field, "ph_index": target_ph_index, "shape_name": target_shape_name}]
+        for text in texts_for_slides
+    ]
+    result = insert_slides_bulk(prs, template_slide_index, payloads)
+    return {"prs": prs, "added_slide_count": result["added_slide_count"]}
 
 
 # 기존 duplicate_and_add_slide -> add_slides_with_text로 통합/개선
@@ -187,110 +337,174 @@ def add_lyrics_slides(prs: PresentationType, duplicate_slide_index: int, slide_t
     return add_slides_with_text(prs, duplicate_slide_index, slide_texts, is_title_field=False)
 
 
-def add_ads_slides(prs: PresentationType, ads_list: list, template_slide_index: int) -> int:
+def add_ads_slides(prs: PresentationType, ads_list: list, template_slide_index: int, ph_index: int = 1) -> int:
     """
     광고 목록을 기반으로 슬라이드를 추가합니다.
     각 광고는 새 슬라이드에 제목과 내용이 들어갑니다.
     새로 추가되는 슬라이드는 template_slide_index 바로 뒤에 순차적으로 삽입됩니다.
+    `ph_index`는 내용 Placeholder 인덱스입니다 (템플릿 매니페스트의 ads_contents 값).
     """
-    if not ads_list:
-        return 0
-
-    added_count = 0
-    original_ad_template_slide = prs.slides[template_slide_index]
-    slide_layout = original_ad_template_slide.slide_layout
-
-    for i, ad_data in enumerate(ads_list):
-        if i == 0:
-            current_slide_index_for_editing = template_slide_index
-        else:
-            # 새 슬라이드를 추가 (항상 컬렉션 끝에 추가됨)
-            new_slide_obj = prs.slides.add_slide(slide_layout)
-            
-            # 원하는 삽입 위치 계산
-            # template_slide_index 바로 뒤에 순차적으로 삽입
-            target_insert_index = template_slide_index + i # i는 1부터 시작 (두 번째 슬라이드는 +1, 세 번째는 +2)
-            
-            # 새 슬라이드를 원하는 위치로 이동
-            _insert_slide_at_index(prs, new_slide_obj, target_insert_index)
-            
-            current_slide_index_for_editing = target_insert_index
-            added_count += 1
-
-        # 텍스트 필드 편집
-        edit_text_field(
-            prs=prs,
-            slide_index=current_slide_index_for_editing,
-            is_title=True,
-            new_text=ad_data.get("title", ""),
-            align_center=False
-        )
-        edit_text_field(
-            prs=prs,
-            slide_index=current_slide_index_for_editing,
-            is_title=False,
-            new_text=ad_data.get("contents", ""),
-            align_center= False,
-            ph_index=1 # 템플릿의 내용 Placeholder 인덱스 (가정)
-        )
-    return added_count
+    payloads = [
+        [
+            {"new_text": ad_data.get("title", ""), "is_title": True, "align_center": False},
+            {"new_text": ad_data.get("contents", ""), "ph_index": ph_index, "align_center": False},
+        ]
+        for ad_data in ads_list or []
+    ]
+    return insert_slides_bulk(prs, template_slide_index, payloads)["added_slide_count"]
 
 
-
-def add_bible_slides(prs: PresentationType, bible_contents_list: list, template_slide_index: int) -> int:
+def add_bible_slides(prs: PresentationType, bible_contents_list: list, template_slide_index: int, ph_index: int = 10) -> int:
     """
     성경 구절 내용을 기반으로 슬라이드를 추가합니다.
     각 구절은 새 슬라이드에 제목(구절)과 내용이 들어갑니다.
     새로 추가되는 슬라이드는 template_slide_index 바로 뒤에 순차적으로 삽입됩니다.
+    `ph_index`는 내용 Placeholder 인덱스입니다 (템플릿 매니페스트의 bible_contents 값).
     """
-    if not bible_contents_list:
-        return 0
+    payloads = [
+        [
+            {"new_text": bible_data.get("title", ""), "is_title": True, "align_center": False},
+            {"new_text": bible_data.get("contents", ""), "ph_index": ph_index, "align_center": False},
+        ]
+        for bible_data in bible_contents_list or []
+    ]
+    return insert_slides_bulk(prs, template_slide_index, payloads)["added_slide_count"]
 
-    added_count = 0
-    original_bible_template_slide = prs.slides[template_slide_index]
-    slide_layout = original_bible_template_slide.slide_layout
 
-    for i, bible_data in enumerate(bible_contents_list):
-        if i == 0:
-            current_slide_index_for_editing = template_slide_index
-        else:
-            # 새 슬라이드를 추가 (항상 컬렉션 끝에 추가됨)
-            new_slide_obj = prs.slides.add_slide(slide_layout)
-            
-            # 원하는 삽입 위치 계산
-            target_insert_index = template_slide_index + i
-            
-            # 새 슬라이드를 원하는 위치로 이동
-            _insert_slide_at_index(prs, new_slide_obj, target_insert_index)
-            
-            current_slide_index_for_editing = target_insert_index
-            added_count += 1
-
-        # 텍스트 필드 편집
-        edit_text_field(
-            prs=prs,
-            slide_index=current_slide_index_for_editing,
-            is_title=True,
-            align_center=False,
-            new_text=bible_data.get("title", ""),
-        )
-        edit_text_field(
-            prs=prs,
-            slide_index=current_slide_index_for_editing,
-            is_title=False,
-            new_text=bible_data.get("contents", ""),
-            align_center=False,
-            ph_index=10 # 템플릿의 내용 Placeholder 인덱스 (가정)
-        )
-    return added_count
+def apply_slide_plan(prs: PresentationType, plan: list) -> PresentationType:
+    """
+    utils.slide_plan.build_slide_plan이 만든 플랜을 덱에 한 번의 순회로 적용합니다.
+    원본 슬라이드가 처음 등장하면 원본을 그대로 수정하고, 두 번째부터는 같은 레이아웃으로
+    만든 새 슬라이드를 수정합니다. 슬라이드 순서는 마지막에 한 번만 재배치합니다.
+    """
+    slides = prs.slides # prs.slides는 접근할 때마다 슬라이드 파트 이름을 다시 매기므로 한 번만 가져옵니다.
+    sld_id_lst = slides._sldIdLst
+    template_slides = list(slides)
+    template_sld_ids = list(sld_id_lst)
+
+    # 원본 슬라이드별로 필요한 추가 슬라이드를 레이아웃 단위로 한 번에 생성
+    page_counts = {}
+    for entry in plan:
+        page_counts[entry["source_index"]] = page_counts.get(entry["source_index"], 0) + 1
+    pending_slides = {
+        source_index: [(template_slides[source_index], template_sld_ids[source_index])]
+        + _create_slides(prs, template_slides[source_index].slide_layout, count - 1)
+        for source_index, count in page_counts.items()
+    }
+
+    ordered_sld_ids = []
+    for position, entry in enumerate(plan):
+        slide, sld_id = pending_slides[entry["source_index"]].pop(0)
+        if entry.get("tokens"):
+            _replace_slide_tokens(slide, entry["tokens"]) # 원본 슬라이드의 {{토큰}} 치환
+        for edit in entry["edits"]:
+            _edit_slide_text(slide, slide_label=position, **edit)
+        ordered_sld_ids.append(sld_id)
+
+    # 플랜에 포함되지 않은 원본 슬라이드는 맨 뒤에 원래 순서대로 남겨둡니다.
+    ordered_sld_ids.extend(
+        sld_id for index, sld_id in enumerate(template_sld_ids) if index not in page_counts
+    )
+    sld_id_lst[:] = ordered_sld_ids
+    return prs
+
+
+# 렌더 엔진 이름 (settings.PPT_RENDER_ENGINE)
+RENDER_ENGINE_PPTX = "python-pptx"
+RENDER_ENGINE_OOXML = "ooxml"
 
 
-def save_presentation(prs: PresentationType, save_path: str):
+def render_slide_plan(
+    template_path: str,
+    plan: list,
+    output,
+    engine: str = RENDER_ENGINE_PPTX,
+    template_id: int = None,
+    updated_at=None,
+    workers: int = 1,
+    zip_level: int = None,
+    zip_workers: int = 1
+):
     """
-    프레젠테이션을 지정된 경로에 저장합니다.
+    템플릿과 슬라이드 플랜으로 PPTX를 만들어 `output`(경로 또는 바이너리 스트림)에 저장합니다.
+    `engine`이 "python-pptx"이면 Presentation 객체 모델로, "ooxml"이면 ZIP/XML을 직접 다루는
+    utils.ooxml_renderer로 렌더링합니다. 두 엔진은 같은 슬라이드 내용을 만듭니다.
+    `template_id`와 `updated_at`이 주어지면 python-pptx 엔진은 워커 템플릿 캐시를 사용합니다.
+    `workers`가 2 이상이면 ooxml 엔진은 섹션을 여러 프로세스에서 렌더링합니다 (python-pptx 엔진은 항상 직렬).
+    `zip_level`/`zip_workers`는 save_presentation의 압축 설정과 같습니다.
+    """
+    if engine == RENDER_ENGINE_OOXML:
+        from utils.ooxml_renderer import render_slide_plan_ooxml # ooxml_renderer가 이 모듈의 편집 함수를 사용하므로 지연 임포트
+        render_slide_plan_ooxml(template_path, plan, output, workers=workers, zip_level=zip_level, zip_workers=zip_workers)
+        print(f"Presentation rendered with {engine} engine.")
+        return
+    if engine != RENDER_ENGINE_PPTX:
+        raise ValueError(f"알 수 없는 렌더 엔진입니다: {engine}")
+
+    if template_id is not None:
+        prs = load_template_cached(template_path, template_id, updated_at)
+    else:
+        prs = load_template(template_path)
+    apply_slide_plan(prs, plan)
+    save_presentation(prs, output, zip_level=zip_level, zip_workers=zip_workers)
+
+
+class _CollectingPhysWriter:
+    """python-pptx PackageWriter가 쓰는 항목을 ZIP 대신 [(항목 이름, 바이트), ...]로 모읍니다."""
+
+    def __init__(self):
+        self.entries = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        pass
+
+    def write(self, pack_uri: PackURI, blob: bytes):
+        self.entries.append((pack_uri.membername, blob))
+
+
+class _CollectingPackageWriter(PackageWriter):
+    def collect(self) -> list:
+        phys_writer = _CollectingPhysWriter()
+        with phys_writer:
+            self._write_content_types_stream(phys_writer)
+            self._write_pkg_rels(phys_writer)
+            self._write_parts(phys_writer)
+        return phys_writer.entries
+
+
+def _save_with_zip_policy(prs: PresentationType, save_path, zip_level: int, zip_workers: int):
+    """
+    이미 압축된 미디어는 STORED로 그대로 두고 XML 파트만 `zip_level`로 deflate하여 저장합니다.
+    python-pptx 기본 저장은 모든 파트를 다시 deflate하므로 이미지가 많은 덱에서 시간이 낭비됩니다.
+    """
+    package = prs.part.package
+    entries = _CollectingPackageWriter(save_path, package._rels, tuple(package.iter_parts())).collect()
+    prepared = prepare_entries(entries, zip_level, zip_workers)
+
+    output_file = open(save_path, "wb") if isinstance(save_path, (str, os.PathLike)) else save_path
+    try:
+        with ZipStreamWriter(output_file) as writer:
+            for prepared_entry in prepared:
+                writer.write_prepared(prepared_entry)
+    finally:
+        if output_file is not save_path:
+            output_file.close()
+
+
+def save_presentation(prs: PresentationType, save_path: str, zip_level: int = None, zip_workers: int = 1):
+    """
+    프레젠테이션을 지정된 경로(또는 바이너리 스트림)에 저장합니다.
+    `zip_level`이 None이면 python-pptx 기본 저장을 사용하고, 0~9이면 미디어는 그대로 두고
+    XML 파트만 해당 수준으로 압축하며 `zip_workers`개 스레드로 동시에 압축합니다.
     """
     try:
-        prs.save(save_path)
+        if zip_level is None:
+            prs.save(save_path)
+        else:
+            _save_with_zip_policy(prs, save_path, zip_level, zip_workers)
         print(f"Presentation saved to: {save_path}")
     except Exception as e:
         print(f"Error saving presentation to {save_path}: {e}")
@@ -0,0 +1,186 @@
+# utils/zip_stream.py
+
+# PPTX(ZIP) 패키지를 스트리밍으로 쓰기 위한 최소한의 ZIP 작성기.
+# 표준 zipfile 모듈은 이미 압축된 데이터를 그대로 쓰는 방법을 제공하지 않으므로,
+# 원본 템플릿의 변경되지 않은 항목을 압축 해제/재압축 없이 바이트 그대로 복사하기 위해 사용합니다.
+# 출력 스트림에서 되돌아가 쓰지 않으므로(seek 불필요) 파일, 소켓, 버퍼 어디에나 쓸 수 있습니다.
+
+import posixpath
+import struct
+import zipfile
+import zlib
+from concurrent.futures import ThreadPoolExecutor
+
+# 생성된 항목의 수정 시각. 실행 시각과 무관하게 항상 같은 바이트를 만들기 위해 고정값을 사용합니다.
+DEFAULT_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+_LOCAL_HEADER_STRUCT = struct.Struct("<IHHHHHIIIHH")
+_CENTRAL_HEADER_STRUCT = struct.Struct("<IHHHHHHIIIHHHHHII")
+_END_OF_CENTRAL_DIR_STRUCT = struct.Struct("<IHHHHIIH")
+_LOCAL_HEADER_SIGNATURE = 0x04034B50
+_CENTRAL_HEADER_SIGNATURE = 0x02014B50
+_END_OF_CENTRAL_DIR_SIGNATURE = 0x06054B50
+_UTF8_FLAG = 0x0800
+_ZIP_VERSION = 20
+_ZIP_MAX_SIZE = 0xFFFFFFFF
+_ZIP_MAX_ENTRIES = 0xFFFF
+_COPY_CHUNK_SIZE = 1024 * 1024
+
+# 이미 압축된 형식이라 deflate해도 거의 줄지 않는 미디어 확장자. 이 항목들은 STORED로 그대로 저장합니다.
+# 포함 글꼴(.ttf/.odttf/.fntdata)과 TIFF는 압축되지 않은 경우가 많아 deflate합니다.
+ALREADY_COMPRESSED_EXTENSIONS = {
+    ".png", ".jpg", ".jpeg", ".gif", ".webp", ".jfif",
+    ".mp3", ".m4a", ".aac", ".wma", ".mp4", ".m4v", ".mov", ".wmv", ".avi", ".mpg", ".mpeg",
+    ".zip", ".docx", ".xlsx", ".pptx",
+}
+
+
+def _dos_date_time(date_time: tuple) -> tuple:
+    year, month, day, hour, minute, second = date_time
+    dos_date = (max(year, 1980) - 1980) << 9 | month << 5 | day
+    dos_time = hour << 11 | minute << 5 | second // 2
+    return dos_date, dos_time
+
+
+def deflate_raw(data: bytes, level: int = 6) -> bytes:
+    """ZIP 항목에 들어가는 raw deflate 스트림(zlib 헤더 없음)으로 압축합니다."""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return compressor.compress(data) + compressor.flush()
+
+
+def is_already_compressed(name: str) -> bool:
+    return posixpath.splitext(name)[1].lower() in ALREADY_COMPRESSED_EXTENSIONS
+
+
+def _prepare_entry(name: str, data: bytes, level: int) -> tuple:
+    crc = zlib.crc32(data)
+    if level == 0 or is_already_compressed(name):
+        return name, data, crc, len(data), zipfile.ZIP_STORED
+    return name, deflate_raw(data, level), crc, len(data), zipfile.ZIP_DEFLATED
+
+
+def prepare_entries(entries: list, level: int = 6, workers: int = 1) -> list:
+    """
+    [(이름, 데이터), ...]를 ZipStreamWriter.write_compressed에 넘길 수 있는
+    [(이름, 압축된 데이터, CRC, 원본 크기, 압축 방식), ...]로 만듭니다. 순서는 유지됩니다.
+    이미 압축된 미디어는 STORED로 두고, 나머지(XML 등)는 `level`로 deflate합니다.
+    zlib은 압축 중 GIL을 놓으므로 `workers`가 2 이상이면 스레드로 여러 항목을 동시에 압축합니다.
+    """
+    if workers <= 1 or len(entries) < 2:
+        return [_prepare_entry(name, data, level) for name, data in entries]
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(executor.map(lambda entry: _prepare_entry(entry[0], entry[1], level), entries))
+
+
+class ZipStreamWriter:
+    """
+    ZIP 항목을 순서대로 스트림에 기록하고, close() 시 중앙 디렉터리를 씁니다.
+    ZIP64는 지원하지 않습니다 (PPTX 한 파일이 4GB/65535개 항목을 넘는 경우는 없다고 가정).
+    """
+
+    def __init__(self, stream):
+        self._stream = stream
+        self._offset = 0
+        self._central_records = []
+        self._names = set()
+        self._closed = False
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+
+    def _write(self, data: bytes):
+        self._stream.write(data)
+        self._offset += len(data)
+
+    def _write_local_header(self, name: str, compress_type: int, crc: int, compress_size: int,
+                            file_size: int, date_time: tuple) -> tuple:
+        if name in self._names:
+            raise ValueError(f"ZIP 항목 이름이 중복되었습니다: {name}")
+        if max(compress_size, file_size, self._offset) > _ZIP_MAX_SIZE:
+            raise ValueError(f"ZIP64가 필요한 크기의 항목은 지원하지 않습니다: {name}")
+        self._names.add(name)
+
+        encoded_name = name.encode("utf-8")
+        flags = 0 if encoded_name.isascii() else _UTF8_FLAG
+        dos_date, dos_time = _dos_date_time(date_time)
+        header_offset = self._offset
+        self._write(_LOCAL_HEADER_STRUCT.pack(
+            _LOCAL_HEADER_SIGNATURE, _ZIP_VERSION, flags, compress_type, dos_time, dos_date,
+            crc, compress_size, file_size, len(encoded_name), 0,
+        ))
+        self._write(encoded_name)
+        self._central_records.append(
+            (encoded_name, flags, compress_type, dos_time, dos_date, crc, compress_size, file_size, header_offset)
+        )
+
+    def write_bytes(self, name: str, data: bytes, compress: bool = True, level: int = 6,
+                    date_time: tuple = DEFAULT_DATE_TIME):
+        """압축되지 않은 데이터를 받아 (선택적으로 deflate 압축하여) 항목 하나를 씁니다."""
+        crc = zlib.crc32(data)
+        payload = deflate_raw(data, level) if compress else data
+        compress_type = zipfile.ZIP_DEFLATED if compress else zipfile.ZIP_STORED
+        self.write_compressed(name, payload, crc, len(data), compress_type, date_time)
+
+    def write_compressed(self, name: str, payload: bytes, crc: int, file_size: int, compress_type: int,
+                         date_time: tuple = DEFAULT_DATE_TIME):
+        """이미 압축된(또는 STORED) 데이터를 그대로 항목 하나로 씁니다."""
+        self._write_local_header(name, compress_type, crc, len(payload), file_size, date_time)
+        self._write(payload)
+
+    def write_prepared(self, prepared_entry: tuple, date_time: tuple = DEFAULT_DATE_TIME):
+        """prepare_entries가 만든 항목 하나를 씁니다."""
+        name, payload, crc, file_size, compress_type = prepared_entry
+        self.write_compressed(name, payload, crc, file_size, compress_type, date_time)
+
+    def copy_entry(self, source_zip: zipfile.ZipFile, zip_info: zipfile.ZipInfo):
+        """
+        다른 ZIP 파일의 항목을 압축 해제 없이 압축된 바이트 그대로 복사합니다.
+        큰 미디어 파일도 메모리에 한 번에 올리지 않도록 조각 단위로 옮깁니다.
+        """
+        source_file = source_zip.fp
+        source_file.seek(zip_info.header_offset)
+        local_header = source_file.read(_LOCAL_HEADER_STRUCT.size)
+        fields = _LOCAL_HEADER_STRUCT.unpack(local_header)
+        if fields[0] != _LOCAL_HEADER_SIGNATURE:
+            raise zipfile.BadZipFile(f"잘못된 로컬 헤더입니다: {zip_info.filename}")
+        name_length, extra_length = fields[9], fields[10]
+        source_file.seek(name_length + extra_length, 1)
+
+        self._write_local_header(
+            zip_info.filename, zip_info.compress_type, zip_info.CRC,
+            zip_info.compress_size, zip_info.file_size, zip_info.date_time,
+        )
+        remaining = zip_info.compress_size
+        while remaining > 0:
+            chunk = source_file.read(min(_COPY_CHUNK_SIZE, remaining))
+            if not chunk:
+                raise zipfile.BadZipFile(f"항목 데이터가 잘렸습니다: {zip_info.filename}")
+            self._write(chunk)
+            remaining -= len(chunk)
+
+    def close(self):
+        """중앙 디렉터리와 끝 레코드를 씁니다. 이후에는 항목을 추가할 수 없습니다."""
+        if self._closed:
+            return
+        self._closed = True
+        if len(self._central_records) > _ZIP_MAX_ENTRIES:
+            raise ValueError("ZIP64가 필요한 개수의 항목은 지원하지 않습니다.")
+        central_dir_offset = self._offset
+        for (encoded_name, flags, compress_type, dos_time, dos_date,
+             crc, compress_size, file_size, header_offset) in self._central_records:
+            self._write(_CENTRAL_HEADER_STRUCT.pack(
+                _CENTRAL_HEADER_SIGNATURE, _ZIP_VERSION, _ZIP_VERSION, flags, compress_type, dos_time, dos_date,
+                crc, compress_size, file_size, len(encoded_name), 0, 0, 0, 0, 0, header_offset,
+            ))
+            self._write(encoded_name)
+        central_dir_size = self._offset - central_dir_offset
+        entry_count = len(self._central_records)
+        self._write(_END_OF_CENTRAL_DIR_STRUCT.pack(
+            _END_OF_CENTRAL_DIR_SIGNATURE, 0, 0, entry_count, entry_count,
+            central_dir_size, central_dir_offset, 0,
+        ))
+        self._stream.flush()
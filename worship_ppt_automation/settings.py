@@ -141,5 +141,35 @@ CELERY_RESULT_SERIALIZER = 'json'
 CELERY_TIMEZONE = 'Asia/Seoul'
 CELERY_TASK_TRACK_STARTED = True
 
+# PPT 렌더 엔진: "ooxml"(기본값, 템플릿 ZIP을 직접 스트리밍, utils/ooxml_renderer.py) 또는 "python-pptx"
+# 찬양 섹션 캐시와 섹션 병렬 렌더링은 ooxml 엔진에서만 사용됩니다.
+PPT_RENDER_ENGINE = env.str("PPT_RENDER_ENGINE", "ooxml")
+# ooxml 엔진과 PDF 유인물의 섹션 병렬 렌더링 프로세스 수 (1이면 직렬). Celery prefork 작업 프로세스 안에서는 billiard로 자식 프로세스를 만듭니다.
+PPT_RENDER_WORKERS = env.int("PPT_RENDER_WORKERS", min(4, os.cpu_count() or 1))
+# 생성된 PPT를 메모리에 보관하는 최대 크기. 넘으면 임시 파일로 넘어간 뒤 저장소에 저장됩니다.
+PPT_SPOOL_MAX_BYTES = env.int("PPT_SPOOL_MAX_BYTES", 32 * 1024 * 1024)
+# PPT 저장 시 XML 파트의 deflate 수준 (0~9, 미설정이면 python-pptx 기본 저장). 이미지 등 이미 압축된 미디어는 그대로 저장합니다.
+PPT_ZIP_LEVEL = env.int("PPT_ZIP_LEVEL", None)
+# 파트 압축에 사용하는 스레드 수
+PPT_ZIP_WORKERS = env.int("PPT_ZIP_WORKERS", 4)
+# 템플릿 업로드 시 슬라이드에 표시되는 크기보다 큰 이미지를 줄일지 여부와, 슬라이드 전체 너비에 해당하는 픽셀 수
+PPT_TEMPLATE_DOWNSCALE_IMAGES = env.bool("PPT_TEMPLATE_DOWNSCALE_IMAGES", False)
+PPT_TEMPLATE_MAX_IMAGE_WIDTH_PX = env.int("PPT_TEMPLATE_MAX_IMAGE_WIDTH_PX", 1920)
+# 텍스트 글꼴 크기 맞춤(utils/text_fit.py)에 사용할 글꼴 파일 디렉토리. 템플릿 글꼴이 없으면 근사 너비를 사용합니다.
+PPT_FONT_DIRS = env.list("PPT_FONT_DIRS", default=['/usr/share/fonts', os.path.join(BASE_DIR, 'core', 'data', 'fonts')])
+# 글자 너비 캐시 파일 (실행 간 공유)
+PPT_GLYPH_CACHE_PATH = env.str("PPT_GLYPH_CACHE_PATH", os.path.join(BASE_DIR, 'cache', 'glyph_widths.json'))
+# PPT 생성 후 슬라이드 미리보기 PNG를 만들지 여부와 너비(px)
+PPT_THUMBNAILS_ENABLED = env.bool("PPT_THUMBNAILS_ENABLED", True)
+PPT_THUMBNAIL_WIDTH_PX = env.int("PPT_THUMBNAIL_WIDTH_PX", 320)
+# 템플릿 글꼴이 서버에 없을 때 미리보기에 쓸 한글 글꼴 (PPT_FONT_DIRS에서 찾음, 없으면 미리보기를 건너뜀)
+PPT_THUMBNAIL_FONT = env.str("PPT_THUMBNAIL_FONT", "NanumGothic")
+# PPT와 함께 가사/성경 본문 PDF 유인물(utils/handout_pdf.py)을 만들지 여부와 사용할 글꼴 이름 (PPT_FONT_DIRS에서 찾음)
+# 한글을 그릴 수 있는 글꼴(예: core/data/fonts/NanumGothic.ttf)이 없으면 유인물은 경고와 함께 건너뜁니다.
+PPT_HANDOUT_ENABLED = env.bool("PPT_HANDOUT_ENABLED", True)
+PPT_HANDOUT_FONT = env.str("PPT_HANDOUT_FONT", "NanumGothic")
+# 로비 화면/방송 자막용 텍스트 슬라이드 HTML(utils/display_bundle.py)을 만들지 여부
+PPT_DISPLAY_BUNDLE_ENABLED = env.bool("PPT_DISPLAY_BUNDLE_ENABLED", True)
+
 # utils/llm.py에서 settings.GEMINI_API_KEY를 참조합니다.
 GEMINI_API_KEY = env.str("GEMINI_API_KEY") # 실제 키는 .env 파일에
\ No newline at end of file